@@ -26,6 +26,9 @@ command! DiarySwapGroupSorting call DiarySwapGroupSorting()
 
 command! DiaryGetCalendar call DiaryGetCalendar()
 command! DiaryUploadCalendar call DiaryUploadCalendar()
+command! DiaryUpdateCalendar call DiaryUpdateCalendar()
+
+command! DiaryCancel call DiaryCancel()
 
 " Setup binds, and fold bits.
 augroup nvim_diary_template_keybinds
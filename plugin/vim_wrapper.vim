@@ -81,3 +81,7 @@ endfunc
 function! DiarySwapGroupSorting()
     return s:diary_plugin.call('swap_group_sorting')
 endfunc
+
+function! DiaryCancel()
+    return s:diary_plugin.call('cancel_command')
+endfunc
@@ -78,3 +78,7 @@ def upload_all_issues() -> None:
 
 def swap_group_sorting() -> None:
     return _obj.swap_group_sorting()
+
+
+def cancel_command() -> None:
+    return _obj.cancel_command()
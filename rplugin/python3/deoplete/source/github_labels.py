@@ -27,7 +27,7 @@ class Source(Base):
 
         cache_path = path.join(self.config_folder, "cache")
 
-        pattern = path.join(cache_path, f"nvim_diary_template_repo_labels_cache_*.json")
+        pattern = path.join(cache_path, f"nvim_diary_template_repo_labels_cache*.json")
 
         try:
             label_file_cache = glob.glob(pattern)[0]
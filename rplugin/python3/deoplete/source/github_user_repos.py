@@ -31,7 +31,7 @@ class Source(Base):
 
         cache_path = path.join(self.config_folder, "cache")
 
-        pattern = path.join(cache_path, f"nvim_diary_template_user_repos_cache_*.json")
+        pattern = path.join(cache_path, f"nvim_diary_template_user_repos_cache*.json")
 
         repos = []
 
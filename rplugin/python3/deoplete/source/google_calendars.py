@@ -27,7 +27,7 @@ class Source(Base):
 
         cache_path = path.join(self.config_folder, "cache")
 
-        pattern = path.join(cache_path, f"nvim_diary_template_calendars_cache_*.json")
+        pattern = path.join(cache_path, f"nvim_diary_template_calendars_cache*.json")
 
         try:
             calendar_file_cache = glob.glob(pattern)[0]
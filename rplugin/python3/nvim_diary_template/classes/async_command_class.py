@@ -0,0 +1,180 @@
+"""async_command_class
+
+Run the slow, network bound part of a command on a worker thread, such that
+NeoVim isn't blocked while waiting on GitHub or Google.
+"""
+from threading import Event, Thread
+from typing import Any, Callable, Optional
+
+from pynvim import Nvim
+
+from ..helpers.neovim_helpers import buffered_info_message
+
+
+class AsyncCommand:
+    """AsyncCommand
+
+    A command that is running on a worker thread, along with the buffer it was
+    started in, and the changedtick of that buffer at the time, to check
+    against once the command is done.
+    """
+
+    def __init__(self, nvim: Nvim, name: str) -> None:
+        self.nvim: Nvim = nvim
+        self.name: str = name
+
+        self.buffer_number: int = nvim.current.buffer.number
+        self.changedtick: int = nvim.api.buf_get_changedtick(self.buffer_number)
+
+        self.cancel_event: Event = Event()
+        self.thread: Optional[Thread] = None
+
+    @property
+    def cancelled(self) -> bool:
+        """cancelled
+
+        Has the command been asked to stop?
+        """
+
+        return self.cancel_event.is_set()
+
+    def progress(self, message: str) -> None:
+        """progress
+
+        Show how the command is getting on in the message area. This can be
+        called from the worker thread.
+        """
+
+        buffered_info_message(self.nvim, f"{self.name}: {message}\n")
+
+
+class AsyncCommandRunner:
+    """AsyncCommandRunner
+
+    Runs one command at a time, in two parts. The work is done on a worker
+    thread, and given the command, such that it can report progress and stop
+    early if the command is cancelled. The result is then passed back to the
+    main thread to be applied to the buffer.
+
+    Before the result is applied, the buffer is checked. If the command was
+    started in a different buffer, nothing is applied, and the user is told
+    what to tidy up by hand, for commands that changed something online.
+    Otherwise, the apply
+    function is told if the buffer was changed while the work was running,
+    such that it can re-read the buffer and keep those changes.
+    """
+
+    def __init__(self, nvim: Nvim) -> None:
+        self.nvim: Nvim = nvim
+        self.command: Optional[AsyncCommand] = None
+
+    def run(
+        self,
+        name: str,
+        work: Callable[[AsyncCommand], Any],
+        apply: Callable[[Any, bool], None],
+        discard_on_cancel: bool = True,
+        unapplied_warning: str = "",
+    ) -> None:
+        """run
+
+        Start the work for the named command on a worker thread, and return
+        straight away. Commands that change something online should set
+        discard_on_cancel to False, such that whatever was done before the
+        cancel is still applied to the buffer. They can also give a warning,
+        to show if the result can't be applied since the buffer was swapped.
+        """
+
+        if self.command is not None:
+            self.nvim.err_write(
+                f"{self.command.name} is still running. "
+                "Use DiaryCancel to stop it.\n"
+            )
+            return
+
+        command: AsyncCommand = AsyncCommand(self.nvim, name)
+        self.command = command
+
+        def run_work() -> None:
+            try:
+                result: Any = work(command)
+            except Exception as error:  # pylint: disable=broad-except
+                self.nvim.async_call(self.fail, command, error)
+                return
+
+            self.nvim.async_call(
+                self.finish,
+                command,
+                apply,
+                result,
+                discard_on_cancel,
+                unapplied_warning,
+            )
+
+        command.progress("Started. Use DiaryCancel to stop it.")
+
+        command.thread = Thread(target=run_work, daemon=True)
+        command.thread.start()
+
+    def cancel(self) -> None:
+        """cancel
+
+        Ask the running command to stop. Any request that is already being
+        sent is finished, but nothing else is started.
+        """
+
+        if self.command is None:
+            self.nvim.out_write("No diary command is running.\n")
+            return
+
+        self.command.cancel_event.set()
+        self.command.progress("Cancelling...")
+
+    def finish(
+        self,
+        command: AsyncCommand,
+        apply: Callable[[Any, bool], None],
+        result: Any,
+        discard_on_cancel: bool,
+        unapplied_warning: str = "",
+    ) -> None:
+        """finish
+
+        Apply the result of a command, back on the main thread.
+        """
+
+        self.command = None
+
+        if command.cancelled and discard_on_cancel:
+            command.progress("Cancelled.")
+            return
+
+        if self.nvim.current.buffer.number != command.buffer_number:
+            message: str = (
+                f"{command.name}: The diary is no longer the current buffer, "
+                "so it wasn't updated."
+            )
+
+            if unapplied_warning != "":
+                message += f" {unapplied_warning}"
+
+            self.nvim.err_write(f"{message}\n")
+            return
+
+        buffer_changed: bool = (
+            self.nvim.api.buf_get_changedtick(command.buffer_number)
+            != command.changedtick
+        )
+
+        apply(result, buffer_changed)
+
+        command.progress("Cancelled." if command.cancelled else "Done.")
+
+    def fail(self, command: AsyncCommand, error: Exception) -> None:
+        """fail
+
+        Report a command that raised an error, back on the main thread.
+        """
+
+        self.command = None
+        self.nvim.err_write(f"{command.name}: Failed with {error!r}.\n")
@@ -0,0 +1,79 @@
+"""buffer_mirror_class
+
+A copy of a buffer that is attached to, kept up to date from the changes
+NeoVim sends, so that the buffer doesn't need to be fetched for each command.
+"""
+from typing import List, Optional
+
+from .diary_document_class import DiaryDocument
+
+
+class BufferMirror:
+    """BufferMirror
+
+    A copy of the lines of an attached buffer, and their index, along with the
+    changedtick of the buffer that they match.
+
+    Each line event from NeoVim is applied to the copy as it comes in. If an
+    event can't be trusted, the copy is marked as stale by clearing the
+    changedtick, and any more events are ignored until it is fetched again.
+    """
+
+    def __init__(self, lines: List[str], changedtick: int) -> None:
+        self.document: DiaryDocument = DiaryDocument(lines)
+        self.changedtick: Optional[int] = changedtick
+
+    def reset(self, lines: List[str], changedtick: int) -> None:
+        """reset
+
+        Replace the copy with freshly fetched lines, and their changedtick.
+        """
+
+        self.document = DiaryDocument(lines)
+        self.changedtick = changedtick
+
+    def is_current(self, changedtick: int) -> bool:
+        """is_current
+
+        Check if the copy matches the buffer at the given changedtick.
+        """
+
+        return self.changedtick is not None and self.changedtick == changedtick
+
+    def apply_lines_event(
+        self,
+        changedtick: Optional[int],
+        first_line: int,
+        last_line: int,
+        line_data: List[str],
+    ) -> None:
+        """apply_lines_event
+
+        Apply the change from an nvim_buf_lines_event to the copy.
+        """
+
+        if self.changedtick is None:
+            return
+
+        # Changes from before the copy was last fetched are already in it.
+        if changedtick is not None and changedtick <= self.changedtick:
+            return
+
+        # A change without a changedtick can't be matched up with a fetch, so
+        # the copy can't be trusted any more.
+        if changedtick is None:
+            self.changedtick = None
+            return
+
+        self.document = self.document.with_change(first_line, last_line, line_data)
+        self.changedtick = changedtick
+
+    def apply_changedtick_event(self, changedtick: int) -> None:
+        """apply_changedtick_event
+
+        Apply an nvim_buf_changedtick_event, where the changedtick went up
+        without any change to the lines.
+        """
+
+        if self.changedtick is not None and changedtick > self.changedtick:
+            self.changedtick = changedtick
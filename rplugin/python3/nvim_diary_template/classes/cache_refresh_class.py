@@ -0,0 +1,43 @@
+"""cache_refresh_class
+
+The state needed to refresh a cache in the background, and tell the plugin
+once it is done.
+"""
+from threading import local
+from typing import Any, Callable, Optional
+
+
+class CacheRefresh:
+    """CacheRefresh
+
+    The callback to run once a cache has been refreshed in the background,
+    along with a marker of what the last fetch got up to. The marker is kept
+    per thread, such that a background refresh only stores the marker for the
+    data it fetched itself.
+    """
+
+    def __init__(self) -> None:
+        self.callback: Optional[Callable[[], None]] = None
+        self.thread_state: local = local()
+
+    @property
+    def marker(self) -> Optional[Any]:
+        """marker
+
+        The marker set by the last fetch on this thread, if there is one.
+        """
+
+        return getattr(self.thread_state, "marker", None)
+
+    @marker.setter
+    def marker(self, marker: Optional[Any]) -> None:
+        self.thread_state.marker = marker
+
+    def notify(self) -> None:
+        """notify
+
+        Let the plugin know the cache has been refreshed.
+        """
+
+        if self.callback is not None:
+            self.callback()
@@ -3,17 +3,29 @@
 
 A simple Dataclass to store Calendar events.
 """
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 
+from .data_class_slots import add_slots
 
+
+@add_slots
 @dataclass
 class CalendarEvent:
     """CalendarEvent
 
     A simple Dataclass to store a Calendar event.
+
+    The event and calendar IDs are only known for events from Google, so are
+    not used when comparing events.
     """
 
     name: str
     start: str
     end: str
     calendar: str = ""
+    event_id: str = field(default="", compare=False)
+    calendar_id: str = field(default="", compare=False)
+
+    def __post_init__(self) -> None:
+        self.calendar = sys.intern(self.calendar)
@@ -4,10 +4,15 @@ from typing import Any
 
 import dataclasses
 
+from .github_issue_class import CommentBody
+
 
 class EnhancedJSONEncoder(json.JSONEncoder):
     def default(self, o: Any) -> Any:
         if dataclasses.is_dataclass(o):
             return dataclasses.asdict(o)
 
+        if isinstance(o, CommentBody):
+            return o.lines
+
         return super().default(o)
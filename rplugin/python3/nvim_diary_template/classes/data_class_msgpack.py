@@ -0,0 +1,166 @@
+# pylint: disable=all
+"""data_class_msgpack
+
+Pack the data classes into a compact binary format for the cache files.
+Each class is stored as a fixed tuple of its fields, and lists of them are
+only unpacked an item at a time, as they are used.
+"""
+from typing import Any, Iterator, List, Sequence, Union, cast, overload
+
+import msgpack
+
+from .calendar_event_class import CalendarEvent
+from .github_issue_class import CommentBody, GitHubIssue, GitHubIssueComment
+
+ISSUE_TYPE = 1
+EVENT_TYPE = 2
+LAZY_LIST_TYPE = 3
+
+
+class LazyList(Sequence[Any]):
+    """LazyList
+
+    A list of packed items, where each item is only unpacked when it is used.
+    A new object is unpacked every time, so changes to one are never seen by
+    other users of the list.
+    """
+
+    def __init__(self, packed_items: List[bytes]) -> None:
+        self.packed_items: List[bytes] = packed_items
+
+    @classmethod
+    def from_items(cls, items: List[Any]) -> "LazyList":
+        return cls([pack_item(item) for item in items])
+
+    def __len__(self) -> int:
+        return len(self.packed_items)
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Any]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [unpack_item(item) for item in self.packed_items[index]]
+
+        return unpack_item(self.packed_items[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        return (unpack_item(item) for item in self.packed_items)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyList):
+            return self.packed_items == other.packed_items
+
+        return bool(list(self) == other)
+
+    def __repr__(self) -> str:
+        return f"LazyList({list(self)!r})"
+
+
+def pack_data(data: Any) -> bytes:
+    """pack_data
+
+    Pack the given data, storing any lists of data classes as lazy lists.
+    """
+
+    return cast(
+        bytes,
+        msgpack.packb(make_lazy(data), default=encode_object, use_bin_type=True),
+    )
+
+
+def unpack_data(packed_data: bytes) -> Any:
+    """unpack_data
+
+    Unpack the given data. Raises a ValueError if it can't be unpacked.
+    """
+
+    try:
+        return unpack_item(packed_data)
+    except (msgpack.UnpackException, TypeError) as error:
+        raise ValueError("Packed data could not be unpacked.") from error
+
+
+def pack_item(item: Any) -> bytes:
+    return cast(bytes, msgpack.packb(item, default=encode_object, use_bin_type=True))
+
+
+def unpack_item(packed_item: bytes) -> Any:
+    return msgpack.unpackb(packed_item, ext_hook=decode_object, raw=False)
+
+
+def make_lazy(data: Any) -> Any:
+    """make_lazy
+
+    Swap any lists of data classes for lazy lists.
+    """
+
+    if isinstance(data, dict):
+        return {key: make_lazy(value) for key, value in data.items()}
+
+    if isinstance(data, list) and any(
+        isinstance(item, (GitHubIssue, CalendarEvent)) for item in data
+    ):
+        return LazyList.from_items(data)
+
+    return data
+
+
+def encode_object(o: Any) -> Any:
+    if isinstance(o, GitHubIssue):
+        comments: List[Any] = [
+            (
+                comment.number,
+                CommentBody.from_lines(comment.body).text,
+                comment.tags,
+                comment.updated_at,
+                comment.comment_id,
+            )
+            for comment in o.all_comments
+        ]
+        return msgpack.ExtType(
+            ISSUE_TYPE,
+            pack_item((o.number, o.title, o.complete, o.labels, comments)),
+        )
+
+    if isinstance(o, CalendarEvent):
+        return msgpack.ExtType(
+            EVENT_TYPE,
+            pack_item((o.name, o.start, o.end, o.calendar, o.event_id, o.calendar_id)),
+        )
+
+    if isinstance(o, LazyList):
+        return msgpack.ExtType(LAZY_LIST_TYPE, pack_item(o.packed_items))
+
+    raise TypeError(f"Can't pack object of type {type(o).__name__}.")
+
+
+def decode_object(code: int, data: bytes) -> Any:
+    if code == ISSUE_TYPE:
+        number, title, complete, labels, comments = unpack_item(data)
+        return GitHubIssue(
+            number=number,
+            title=title,
+            complete=complete,
+            labels=labels,
+            all_comments=[
+                GitHubIssueComment(
+                    number, CommentBody(text), tags, updated_at, comment_id
+                )
+                for number, text, tags, updated_at, comment_id in comments
+            ],
+            metadata=[],
+        )
+
+    if code == EVENT_TYPE:
+        return CalendarEvent(*unpack_item(data))
+
+    if code == LAZY_LIST_TYPE:
+        return LazyList(unpack_item(data))
+
+    return msgpack.ExtType(code, data)
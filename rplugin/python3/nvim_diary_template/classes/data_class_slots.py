@@ -0,0 +1,35 @@
+# pylint: disable=all
+"""data_class_slots
+
+Give a Dataclass __slots__, such that its instances don't need a __dict__.
+"""
+import dataclasses
+from typing import Any, Dict, Tuple, Type, TypeVar, cast
+
+ClassType = TypeVar("ClassType")
+
+
+def add_slots(cls: Type[ClassType]) -> Type[ClassType]:
+    """add_slots
+
+    Remake the given Dataclass with a slot for each of its fields.
+    The class attributes for any default values are removed, since they would
+    clash with the slots, but the generated __init__ keeps its own defaults.
+    """
+
+    # The class is only known to be a Dataclass at runtime.
+    field_names: Tuple[str, ...] = tuple(
+        field.name for field in dataclasses.fields(cast(Any, cls))
+    )
+
+    class_dict: Dict[str, Any] = dict(cls.__dict__)
+    class_dict["__slots__"] = field_names
+
+    for name in (*field_names, "__dict__", "__weakref__"):
+        class_dict.pop(name, None)
+
+    metaclass: Any = type(cls)
+    slotted_class: Type[ClassType] = metaclass(cls.__name__, cls.__bases__, class_dict)
+    slotted_class.__qualname__ = cls.__qualname__
+
+    return slotted_class
@@ -0,0 +1,200 @@
+"""diary_document_class
+
+An index of the headings in a diary buffer, to find the sections, issues and
+comments without searching through the buffer again.
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Pattern
+
+from ..utils.constants import HEADING_2, ISSUE_COMMENT, ISSUE_START, SUBGROUP_HEADING
+
+ISSUE_START_PATTERN: Pattern[str] = re.compile(ISSUE_START)
+ISSUE_COMMENT_PATTERN: Pattern[str] = re.compile(ISSUE_COMMENT)
+SUBGROUP_HEADING_PATTERN: Pattern[str] = re.compile(SUBGROUP_HEADING)
+
+
+class DiaryDocument:
+    """DiaryDocument
+
+    The lines of a diary buffer, along with the offset of every heading in it,
+    found in a single pass over the lines. Sections, issue starts, comment
+    headers and sub-group headings are then picked out of the headings, so
+    that helpers can look up the one before or after a given line.
+
+    Only the headings are found up front. Each kind of heading is picked out
+    the first time it is used, since most commands only need one or two.
+    A document is never changed once made, so that it can be shared. Changes
+    to the buffer instead make a new document, using with_change.
+
+    Offsets are zero based, like the indexes of the lines.
+    """
+
+    def __init__(self, lines: List[str], headings: Optional[List[int]] = None) -> None:
+        self.lines: List[str] = lines
+
+        # Any other line is part of the body of a section, issue or comment, so
+        # only lines starting with a '#' need to be looked at any further.
+        self.headings: List[int] = (
+            headings if headings is not None else find_heading_lines(lines)
+        )
+
+        self._sections: Optional[Dict[str, int]] = None
+        self._issue_starts: Optional[List[int]] = None
+        self._comment_headers: Optional[List[int]] = None
+        self._subgroup_headings: Optional[List[int]] = None
+
+    @property
+    def sections(self) -> Dict[str, int]:
+        """sections
+
+        Get the offset of each section heading, by the text of the heading.
+        """
+
+        # Only the first of each section is used, to match a search from the
+        # top of the buffer.
+        if self._sections is None:
+            self._sections = {}
+
+            for offset in self.headings:
+                if self.lines[offset][:3] == f"{HEADING_2} ":
+                    self._sections.setdefault(self.lines[offset], offset)
+
+        return self._sections
+
+    @property
+    def issue_starts(self) -> List[int]:
+        """issue_starts
+
+        Get the offsets of the lines that start an issue.
+        """
+
+        if self._issue_starts is None:
+            self._issue_starts = self.find_headings(ISSUE_START_PATTERN)
+
+        return self._issue_starts
+
+    @property
+    def comment_headers(self) -> List[int]:
+        """comment_headers
+
+        Get the offsets of the comment headers of every issue.
+        """
+
+        if self._comment_headers is None:
+            self._comment_headers = self.find_headings(ISSUE_COMMENT_PATTERN)
+
+        return self._comment_headers
+
+    @property
+    def subgroup_headings(self) -> List[int]:
+        """subgroup_headings
+
+        Get the offsets of the sub-group headings in the issues section.
+        """
+
+        if self._subgroup_headings is None:
+            self._subgroup_headings = self.find_headings(SUBGROUP_HEADING_PATTERN)
+
+        return self._subgroup_headings
+
+    def find_headings(self, heading_pattern: Pattern[str]) -> List[int]:
+        """find_headings
+
+        Get the offsets of the headings that match the given pattern.
+        """
+
+        lines: List[str] = self.lines
+
+        return [
+            offset for offset in self.headings if heading_pattern.match(lines[offset])
+        ]
+
+    def with_change(
+        self, first_line: int, last_line: int, new_lines: List[str]
+    ) -> "DiaryDocument":
+        """with_change
+
+        Make a new document, with the lines in [first_line, last_line) swapped
+        for the given lines. Only the new lines are looked at for headings,
+        with the headings after them moved along.
+        """
+
+        if last_line == -1:
+            last_line = len(self.lines)
+
+        lines: List[str] = self.lines[:first_line] + new_lines + self.lines[last_line:]
+
+        start_index: int = bisect_left(self.headings, first_line)
+        end_index: int = bisect_left(self.headings, last_line)
+        shift: int = len(new_lines) - (last_line - first_line)
+
+        headings: List[int] = self.headings[:start_index]
+        headings.extend(first_line + offset for offset in find_heading_lines(new_lines))
+        headings.extend(offset + shift for offset in self.headings[end_index:])
+
+        return DiaryDocument(lines, headings)
+
+    def section_line(self, section_heading: str) -> int:
+        """section_line
+
+        Get the line that the given section starts on, in the same way as
+        get_section_line. That is, the heading offset plus one, or one past the
+        end of the buffer if the section is missing.
+        """
+
+        return self.sections.get(section_heading, len(self.lines)) + 1
+
+    def next_heading_of_level(self, start: int, level: int) -> int:
+        """next_heading_of_level
+
+        Get the offset of the first heading at or after the start offset, of the
+        given level or lower. Returns -1 if there is no such heading.
+        """
+
+        heading_pattern: Pattern[str] = re.compile(rf"#{{1,{level}}} ")
+
+        for index in range(bisect_left(self.headings, start), len(self.headings)):
+            if heading_pattern.match(self.lines[self.headings[index]]):
+                return self.headings[index]
+
+        return -1
+
+    @staticmethod
+    def first_between(offsets: List[int], start: int, end: int) -> int:
+        """first_between
+
+        Get the first of the given sorted offsets in the range [start, end), or
+        -1 if there are none.
+        """
+
+        index: int = bisect_left(offsets, start)
+
+        if index < len(offsets) and offsets[index] < end:
+            return offsets[index]
+
+        return -1
+
+    @staticmethod
+    def last_between(offsets: List[int], start: int, end: int) -> int:
+        """last_between
+
+        Get the last of the given sorted offsets in the range [start, end), or
+        -1 if there are none.
+        """
+
+        index: int = bisect_left(offsets, end) - 1
+
+        if index >= 0 and offsets[index] >= start:
+            return offsets[index]
+
+        return -1
+
+
+def find_heading_lines(lines: List[str]) -> List[int]:
+    """find_heading_lines
+
+    Get the offsets of every line that is a markdown heading.
+    """
+
+    return [offset for offset, line in enumerate(lines) if line[:1] == "#"]
@@ -0,0 +1,107 @@
+"""github_handles_class
+
+Handles to a GitHub repo and its issues, kept between operations to save
+asking GitHub for them again.
+"""
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from github import Github
+
+
+class GitHubHandles:
+    """GitHubHandles
+
+    The handle for the current repo, and during an upload pass, the handles
+    for any issues that have been used. Since these are used from the upload
+    threads, they are guarded by a lock.
+
+    The number of requests that were saved by reusing a handle is counted
+    for each upload pass.
+    """
+
+    def __init__(self) -> None:
+        self.lock: Lock = Lock()
+        self.repo: Optional[Tuple[str, Any]] = None
+        self.issues: Optional[Dict[int, Any]] = None
+        self.upload_pass_depth: int = 0
+        self.saved_requests: int = 0
+
+    def get_repo(self, service: Github, repo_name: str) -> Any:
+        """get_repo
+
+        Get the handle for the given repo. This is only fetched from GitHub
+        again if the repo name changes.
+        """
+
+        with self.lock:
+            if self.repo is not None and self.repo[0] == repo_name:
+                self.saved_requests += 1
+                return self.repo[1]
+
+        repo: Any = service.get_repo(repo_name)
+
+        with self.lock:
+            self.repo = (repo_name, repo)
+
+        return repo
+
+    def get_issue(self, service: Github, repo_name: str, issue_number: int) -> Any:
+        """get_issue
+
+        Get the handle for the given issue. During an upload pass, the handle
+        is kept and reused for any later operations on the same issue.
+        """
+
+        with self.lock:
+            if self.issues is not None and issue_number in self.issues:
+                self.saved_requests += 1
+                return self.issues[issue_number]
+
+        issue: Any = self.get_repo(service, repo_name).get_issue(issue_number)
+
+        with self.lock:
+            if self.issues is not None:
+                self.issues[issue_number] = issue
+
+        return issue
+
+    def forget_issue(self, issue_number: int) -> None:
+        """forget_issue
+
+        Stop reusing the handle for the given issue, since it has changed on
+        GitHub in a way the handle doesn't reflect.
+        """
+
+        with self.lock:
+            if self.issues is not None:
+                self.issues.pop(issue_number, None)
+
+    def start_upload_pass(self) -> None:
+        """start_upload_pass
+
+        Start keeping the issue handles. Nested passes are treated as part of
+        the outermost pass.
+        """
+
+        if self.upload_pass_depth == 0:
+            self.issues = {}
+            self.saved_requests = 0
+
+        self.upload_pass_depth += 1
+
+    def end_upload_pass(self) -> Optional[int]:
+        """end_upload_pass
+
+        Finish an upload pass. If it was the outermost pass, the issue handles
+        are dropped, and the number of saved requests is returned.
+        """
+
+        self.upload_pass_depth -= 1
+
+        if self.upload_pass_depth != 0:
+            return None
+
+        self.issues = None
+
+        return self.saved_requests
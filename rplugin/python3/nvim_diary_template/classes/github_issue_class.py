@@ -3,23 +3,88 @@
 
 A simple Dataclass to store GitHub issues.
 """
-from dataclasses import dataclass
-from typing import List
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Sequence, Union, overload
 
+from .data_class_slots import add_slots
 
+
+class CommentBody(Sequence[str]):
+    """CommentBody
+
+    The lines of a comment, stored as a single string. The lines are only
+    split out when they are used, and compare equal to a list of the same
+    lines.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: Optional[str]) -> None:
+        # None is used for a comment with no lines, since that can't be told
+        # apart from a single empty line otherwise.
+        self.text: Optional[str] = text
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[str]) -> "CommentBody":
+        if isinstance(lines, CommentBody):
+            return cls(lines.text)
+
+        return cls("\n".join(lines) if lines else None)
+
+    @property
+    def lines(self) -> List[str]:
+        return [] if self.text is None else self.text.split("\n")
+
+    def __len__(self) -> int:
+        return 0 if self.text is None else self.text.count("\n") + 1
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        return self.lines[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.lines)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CommentBody):
+            return self.text == other.text
+
+        return bool(self.lines == other)
+
+    def __repr__(self) -> str:
+        return repr(self.lines)
+
+
+@add_slots
 @dataclass
 class GitHubIssueComment:
     """GitHubIssueComment
 
     A simple Dataclass to store a GitHub issues comment.
+
+    The comment ID is only known for comments from GitHub, so is not used when
+    comparing comments.
     """
 
     number: int
-    body: List[str]
+    body: Union[List[str], CommentBody]
     tags: List[str]
     updated_at: str
+    comment_id: int = field(default=0, compare=False)
 
+    def __post_init__(self) -> None:
+        self.tags = [sys.intern(tag) for tag in self.tags]
 
+
+@add_slots
 @dataclass
 class GitHubIssue:
     """GitHubIssue
@@ -33,3 +98,6 @@ class GitHubIssue:
     labels: List[str]
     all_comments: List[GitHubIssueComment]
     metadata: List[str]
+
+    def __post_init__(self) -> None:
+        self.labels = [sys.intern(label) for label in self.labels]
@@ -0,0 +1,78 @@
+"""memory_cache_class
+
+A small in-memory store, to sit in front of the cache files.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Optional, Tuple
+
+MemoryCacheKey = Tuple[str, str]
+
+
+class MemoryCache:
+    """MemoryCache
+
+    Keeps recently loaded cache data in memory, along with the time it was
+    cached. Once full, the least recently used data is dropped.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size: int = max_size
+        self._entries: "OrderedDict[MemoryCacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: MemoryCacheKey, max_age: timedelta) -> Optional[Any]:
+        """get
+
+        Get the data for the given key, if it was cached within the given age.
+        Returns None otherwise.
+        """
+
+        with self._lock:
+            entry: Optional[Tuple[float, Any]] = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            created, data = entry
+
+            if datetime.now() - datetime.fromtimestamp(created) > max_age:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: MemoryCacheKey, created: float, data: Any) -> None:
+        """set
+
+        Store the data for the given key, dropping the least recently used
+        data if there is no space for it.
+        """
+
+        with self._lock:
+            self._entries[key] = (created, data)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: MemoryCacheKey) -> None:
+        """invalidate
+
+        Drop the data for the given key, such that it is next read from disk.
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """clear
+
+        Drop all the stored data.
+        """
+
+        with self._lock:
+            self._entries.clear()
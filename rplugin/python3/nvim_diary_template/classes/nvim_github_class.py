@@ -6,26 +6,50 @@ back to the user.
 """
 
 import json
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import chain
 from os import path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from github import Github
+from dateutil import parser
+from github import Github, GithubException
 from pynvim import Nvim
 
+from ..classes.cache_refresh_class import CacheRefresh
+from ..classes.github_handles_class import GitHubHandles
 from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
 from ..classes.plugin_options import PluginOptions
-from ..helpers.file_helpers import cache_valid, check_cache
-from ..helpers.issue_helpers import (
-    check_markdown_style,
-    convert_utc_timezone,
-    get_github_objects,
-    get_latest_update,
-    split_comment,
+from ..helpers.file_helpers import (
+    cache_valid,
+    check_cache,
+    get_cache_validators,
+    load_cache,
+    set_cache,
+    set_cache_validators,
+)
+from ..helpers.github_helpers import (
+    fetch_issue_changes,
+    fetch_open_issues,
+    filter_comments,
+    filter_issues,
+    run_concurrently,
 )
-from ..helpers.neovim_helpers import buffered_info_message
+from ..helpers.issue_helpers import convert_utc_timezone, get_github_objects
+from ..helpers.neovim_helpers import buffered_error_message, buffered_info_message
 from ..utils.constants import (
+    GITHUB_PAGE_SIZE,
     ISSUE_CACHE_DURATION,
+    ISSUE_FULL_SYNC_DURATION,
     LABELS_CACHE_DURATION,
     REPO_CACHE_DURATION,
 )
@@ -41,10 +65,12 @@ class SimpleNvimGithub:
         self, nvim: Nvim, options: PluginOptions, service: Optional[Github] = None
     ) -> None:
         self.nvim: Nvim = nvim
-        self.config_path: str = options.config_path
-        self.repo_name: str = options.repo_name
         self.options: PluginOptions = options
 
+        # Handles to the repo and its issues are kept, to save asking GitHub
+        # for them for every operation.
+        self.handles: GitHubHandles = GitHubHandles()
+
         if service is not None:
             self.service: Github = service
         else:
@@ -62,6 +88,11 @@ class SimpleNvimGithub:
             LABELS_CACHE_DURATION,
             self.get_repo_labels,
             True,
+            revalidate_function=lambda: self.resource_not_modified(
+                "repo_labels",
+                f"/repos/{self.options.repo_name}/labels",
+                {"per_page": GITHUB_PAGE_SIZE},
+            ),
         )
 
         check_cache(
@@ -70,10 +101,26 @@ class SimpleNvimGithub:
             REPO_CACHE_DURATION,
             self.get_associated_repos,
             True,
+            revalidate_function=lambda: self.options.user_name != ""
+            and self.resource_not_modified(
+                "user_repos",
+                f"/users/{self.options.user_name}/repos",
+                {"type": "all", "per_page": GITHUB_PAGE_SIZE},
+            ),
         )
 
         self.issues: List[GitHubIssue] = []
         self.issues_set: Optional[datetime] = None
+        self.refresh: CacheRefresh = CacheRefresh()
+
+    @property
+    def config_path(self) -> str:
+        """config_path
+
+        Get the Users' config path.
+        """
+
+        return self.options.config_path
 
     @property
     def active_issues(self) -> List[GitHubIssue]:
@@ -90,17 +137,56 @@ class SimpleNvimGithub:
         ):
             return self.issues
 
+        # Expired issues can be used while they are refreshed in the
+        # background, as long as they are within the hard expiry.
+        hard_expiry: Optional[timedelta] = None
+        if self.options.issue_cache_hard_expiry > 0:
+            hard_expiry = timedelta(minutes=self.options.issue_cache_hard_expiry)
+
         active_issues: Union[List[Dict[str, Any]], List[GitHubIssue]] = check_cache(
             self.config_path,
             "open_issues",
             ISSUE_CACHE_DURATION,
-            self.get_all_open_issues,
+            self.sync_open_issues,
+            revalidate_function=self.issues_not_modified,
+            hard_expiry=hard_expiry,
+            refresh_callback=self.set_refreshed_issues,
         )
 
+        self.set_active_issues(active_issues)
+
+        return self.issues
+
+    def set_active_issues(
+        self, active_issues: Union[List[Dict[str, Any]], List[GitHubIssue]]
+    ) -> None:
+        """set_active_issues
+
+        Store the given issues as the current issues.
+        """
+
         self.issues = get_github_objects(active_issues)
         self.issues_set = datetime.now()
 
-        return self.issues
+        # Only move the sync marker on once the issues it covers are cached,
+        # such that a failed write means some changes are fetched twice,
+        # rather than some changes being missed.
+        if self.refresh.marker is not None:
+            set_cache(self.config_path, self.refresh.marker, "issue_sync")
+            self.refresh.marker = None
+
+    def set_refreshed_issues(
+        self, active_issues: Union[List[Dict[str, Any]], List[GitHubIssue]]
+    ) -> None:
+        """set_refreshed_issues
+
+        Store the issues from a background refresh, and let the plugin know
+        they have changed.
+        """
+
+        self.set_active_issues(active_issues)
+
+        self.refresh.notify()
 
     @property
     def active(self) -> bool:
@@ -110,6 +196,37 @@ class SimpleNvimGithub:
         """
         return not self.service_not_valid()
 
+    @property
+    def repo(self) -> Any:
+        """repo
+
+        Get the handle for the current repo. This is only fetched from GitHub
+        again if the repo name changes.
+        """
+
+        return self.handles.get_repo(self.service, self.options.repo_name)
+
+    @contextmanager
+    def upload_pass(self) -> Iterator[None]:
+        """upload_pass
+
+        Run a set of uploads as one pass, reusing the issue handles between
+        them. Once finished, the number of saved requests is reported.
+        Nested passes are treated as part of the outermost pass.
+        """
+
+        self.handles.start_upload_pass()
+
+        try:
+            yield
+        finally:
+            saved_requests: Optional[int] = self.handles.end_upload_pass()
+
+            if saved_requests:
+                buffered_info_message(
+                    self.nvim, f"Saved {saved_requests} requests to GitHub. "
+                )
+
     def setup_github_api(self) -> Optional[Github]:
         """setup_github_api
 
@@ -125,12 +242,13 @@ class SimpleNvimGithub:
 
             access_token: str = store["access_token"]
         except (IOError, ValueError):
-            self.nvim.err_write(
-                "Credentials invalid, try re-generating or checking the path.\n"
+            buffered_error_message(
+                self.nvim,
+                "Credentials invalid, try re-generating or checking the path.\n",
             )
             return None
 
-        service: Github = Github(access_token)
+        service: Github = Github(access_token, per_page=GITHUB_PAGE_SIZE)
 
         return service
 
@@ -142,11 +260,82 @@ class SimpleNvimGithub:
         if self.service is None:
             return True
 
-        if self.repo_name == "":
+        if self.options.repo_name == "":
             return True
 
         return False
 
+    def resource_not_modified(
+        self, data_name: str, url: str, parameters: Dict[str, Any]
+    ) -> bool:
+        """resource_not_modified
+
+        Check if a resource has changed since it was last fetched, using a
+        conditional request with the stored ETag and Last-Modified headers.
+        A response of 304 doesn't count against the rate limit.
+
+        If the resource has changed, the new validators are stored.
+        """
+
+        validators: Dict[str, str] = get_cache_validators(self.config_path, data_name)
+
+        headers: Dict[str, str] = {}
+
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            status, response_headers, _ = self.service.requester.requestJson(
+                "GET", url, parameters, headers
+            )
+        except (AttributeError, GithubException):
+            return False
+
+        if status == 304:
+            return True
+
+        if status == 200:
+            set_cache_validators(
+                self.config_path,
+                {
+                    "etag": response_headers.get("etag", ""),
+                    "last_modified": response_headers.get("last-modified", ""),
+                },
+                data_name,
+            )
+
+        return False
+
+    def issues_not_modified(self) -> bool:
+        """issues_not_modified
+
+        Check if any issue or comment in the repo has changed since the open
+        issues were last fetched. The most recently updated of each is
+        checked, since any change will alter those.
+        """
+
+        if self.service_not_valid():
+            return False
+
+        # Both are checked every time, to keep their validators up to date.
+        return all(
+            [
+                self.resource_not_modified(
+                    "open_issues",
+                    f"/repos/{self.options.repo_name}/issues",
+                    {"state": "all", "sort": "updated", "per_page": 1},
+                ),
+                self.resource_not_modified(
+                    "open_issue_comments",
+                    f"/repos/{self.options.repo_name}/issues/comments",
+                    {"sort": "updated", "direction": "desc", "per_page": 1},
+                ),
+            ]
+        )
+
     def get_repo_labels(self) -> List[str]:
         """get_repo_labels
 
@@ -154,10 +343,12 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return []
 
-        repo_labels: Any = self.service.get_repo(self.repo_name).get_labels()
+        repo_labels: Any = self.repo.get_labels()
 
         return [label.name for label in repo_labels]
 
@@ -168,7 +359,9 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return []
 
         if self.options.user_name == "":
@@ -185,164 +378,67 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
-            return []
-
-        issues: Any = self.service.get_repo(self.repo_name).get_issues(state="open")
-
-        issue_list: List[GitHubIssue] = []
-
-        for issue in issues:
-
-            initial_comment: GitHubIssueComment = GitHubIssueComment(
-                number=0,
-                body=split_comment(issue.body),
-                tags=[],
-                updated_at=convert_utc_timezone(
-                    issue.updated_at, self.options.timezone
-                ),
-            )
-
-            # Grab the comments for this issue too.
-            all_comments: List[GitHubIssueComment] = self.format_comments(
-                issue.get_comments()
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
             )
+            return []
 
-            issue_list.append(
-                GitHubIssue(
-                    number=issue.number,
-                    complete=False,
-                    title=issue.title,
-                    all_comments=[initial_comment, *all_comments],
-                    labels=[label.name for label in issue.labels],
-                    metadata=[],
-                )
-            )
+        issue_list, _ = fetch_open_issues(self.repo, self.options.timezone)
 
         return issue_list
 
-    def format_comments(self, comments: List[Any]) -> List[GitHubIssueComment]:
-        """format_comments
+    def sync_open_issues(self) -> List[GitHubIssue]:
+        """sync_open_issues
 
-        Format all the comments that are passed into GitHubIssueComment
-        objects.
+        Bring the cached open issues up to date.
+        Only the issues and comments that have changed since the last sync
+        are fetched, and are then merged into the cached issues. If there is
+        no previous sync to build on, all the open issues are fetched.
         """
 
-        comment_objs: List[GitHubIssueComment] = []
-
-        current_comment: int = 1
-
-        for comment in comments:
-            comment_objs.append(
-                GitHubIssueComment(
-                    number=current_comment,
-                    body=split_comment(comment.body),
-                    tags=[],
-                    updated_at=convert_utc_timezone(
-                        comment.updated_at, self.options.timezone
-                    ),
-                )
+        if self.service_not_valid():
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
             )
+            return []
 
-            current_comment += 1
-
-        return comment_objs
-
-    @staticmethod
-    def filter_comments(
-        issues: List[GitHubIssue], tag: str
-    ) -> Tuple[List[GitHubIssue], List[Dict[str, int]]]:
-        """filter_comments
-
-        Filter comments for uploading, by a specific tag.
-        """
-
-        comments_to_upload: List[GitHubIssue] = []
-        change_indexes: List[Dict[str, int]] = []
-
-        # For every issue, check the comments and check if the tags for that
-        # comment contain the target tag. If it does, setup an obj with some
-        # needed value as well as storing the index of the comment, so it can
-        # be updated later.
-        for issue_index, issue in enumerate(issues):
-            for comment_index, comment in enumerate(issue.all_comments):
-                if tag in comment.tags:
-                    comment_lines: List[str] = comment.body
-                    processed_comment_lines: List[str] = [
-                        check_markdown_style(line, "github") for line in comment_lines
-                    ]
-
-                    processed_comment: GitHubIssueComment = GitHubIssueComment(
-                        number=comment.number,
-                        body=["\r\n".join(processed_comment_lines)],
-                        tags=comment.tags,
-                        updated_at=comment.updated_at,
-                    )
-
-                    # Lets make an issue with 1 comment per issue, to simplify the code.
-                    comments_to_upload.append(
-                        GitHubIssue(
-                            number=issue.number,
-                            title=issue.title,
-                            complete=issue.complete,
-                            labels=issue.labels,
-                            metadata=issue.metadata,
-                            all_comments=[processed_comment],
-                        )
-                    )
-
-                    change_indexes.append(
-                        {"issue": issue_index, "comment": comment_index}
-                    )
-
-        return comments_to_upload, change_indexes
-
-    @staticmethod
-    def filter_issues(
-        issues: List[GitHubIssue], tag: str
-    ) -> Tuple[List[GitHubIssue], List[int]]:
-        """filter_issues
-
-        Filter issues for uploading, by a specific tag.
-        """
-
-        issues_to_upload: List[GitHubIssue] = []
-        change_indexes: List[int] = []
-
-        # For every issue, check the metadata to see if it contains the target
-        # tag. If it does, setup an obj with some needed value as well as
-        # storing the index of the issue, so it can be updated later.
-        for index, issue in enumerate(issues):
-            if tag in issue.metadata:
-                comment: GitHubIssueComment = issue.all_comments[0]
-                processed_body: List[str] = [
-                    check_markdown_style(line, "github") for line in comment.body
-                ]
-
-                # Here, we use the latest update time to ensure that the issues are in sync.
-                # Since the actual update time isn't needed for an issue update, this is why
-                # it is instead stored here.
-                body_comment: GitHubIssueComment = GitHubIssueComment(
-                    number=comment.number,
-                    body=["\r\n".join(processed_body)],
-                    tags=comment.tags,
-                    updated_at=get_latest_update(issue.all_comments),
-                )
+        cached_issues: Optional[List[Dict[str, Any]]] = load_cache(
+            self.config_path, "open_issues"
+        )
+        last_sync: Optional[Dict[str, str]] = load_cache(self.config_path, "issue_sync")
+
+        if (
+            not self.options.incremental_issue_sync
+            or cached_issues is None
+            or not last_sync
+            or not cache_valid(
+                parser.parse(last_sync["full_sync"]), ISSUE_FULL_SYNC_DURATION
+            )
+        ):
+            issue_list, latest_change = fetch_open_issues(
+                self.repo, self.options.timezone
+            )
+            full_sync: str = datetime.now().isoformat()
+        else:
+            since: datetime = parser.parse(last_sync["updated_at"])
+            issue_list, latest_change = fetch_issue_changes(
+                self.repo,
+                get_github_objects(cached_issues),
+                since,
+                self.options.timezone,
+            )
+            full_sync = last_sync["full_sync"]
 
-                issues_to_upload.append(
-                    GitHubIssue(
-                        number=issue.number,
-                        title=issue.title,
-                        complete=False,
-                        labels=issue.labels,
-                        all_comments=[body_comment],
-                        metadata=issue.metadata,
-                    )
-                )
+            if latest_change is None:
+                latest_change = since
 
-                change_indexes.append(index)
+        if latest_change is not None:
+            self.refresh.marker = {
+                "updated_at": latest_change.isoformat(),
+                "full_sync": full_sync,
+            }
 
-        return issues_to_upload, change_indexes
+        return issue_list
 
     def upload_comments(
         self, issues: List[GitHubIssue], tag: str
@@ -353,12 +449,17 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return [], []
 
-        comments_to_upload, change_indexes = self.filter_comments(issues, tag)
+        comments_to_upload, change_indexes = filter_comments(issues, tag)
         comments_to_ignore: List[Dict[str, int]] = []
-        change_count: int = 0
+
+        # Comments on the same issue are uploaded in order, so they stay in the
+        # same order as the buffer. Different issues can be uploaded at once.
+        comments_by_issue: Dict[int, List[Tuple[str, Dict[str, int]]]] = {}
 
         for issue, change_index in zip(comments_to_upload, change_indexes):
 
@@ -367,12 +468,35 @@ class SimpleNvimGithub:
                 comments_to_ignore.append(change_index)
                 continue
 
-            new_comment: Any = (
-                self.service.get_repo(self.repo_name)
-                .get_issue(issue.number)
-                .create_comment(issue.all_comments[0].body[0])
+            comments_by_issue.setdefault(issue.number, []).append(
+                (issue.all_comments[0].body[0], change_index)
             )
 
+        def upload_issue_comments(
+            issue_comments: Tuple[int, List[Tuple[str, Dict[str, int]]]],
+        ) -> List[Tuple[Any, Dict[str, int]]]:
+            issue_number, comments = issue_comments
+            github_issue: Any = self.handles.get_issue(
+                self.service, self.options.repo_name, issue_number
+            )
+            new_comments: List[Tuple[Any, Dict[str, int]]] = [
+                (github_issue.create_comment(body), change_index)
+                for body, change_index in comments
+            ]
+
+            # The issue has changed by adding the comments, so shouldn't be reused.
+            self.handles.forget_issue(issue_number)
+
+            return new_comments
+
+        uploaded_comments: List[List[Any]] = run_concurrently(
+            upload_issue_comments,
+            list(comments_by_issue.items()),
+            self.options.upload_concurrency,
+        )
+        change_count: int = 0
+
+        for new_comment, change_index in chain.from_iterable(uploaded_comments):
             current_issue: GitHubIssue = issues[change_index["issue"]]
             current_comment: GitHubIssueComment = current_issue.all_comments[
                 change_index["comment"]
@@ -380,6 +504,7 @@ class SimpleNvimGithub:
             current_comment.updated_at = convert_utc_timezone(
                 new_comment.updated_at, self.options.timezone
             )
+            current_comment.comment_id = new_comment.id
 
             change_count += 1
 
@@ -398,12 +523,14 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return [], []
 
-        issues_to_upload, change_indexes = self.filter_issues(issues, tag)
+        issues_to_upload, change_indexes = filter_issues(issues, tag)
         issues_to_ignore: List[int] = []
-        change_count: int = 0
+        uploads: List[Tuple[GitHubIssue, int]] = []
 
         for issue, index in zip(issues_to_upload, change_indexes):
             # We don't want to try and upload an empty issue/title.
@@ -411,20 +538,28 @@ class SimpleNvimGithub:
                 issues_to_ignore.append(index)
                 continue
 
-            new_issue: Any = self.service.get_repo(self.repo_name).create_issue(
+            uploads.append((issue, index))
+
+        def upload_issue(upload: Tuple[GitHubIssue, int]) -> Any:
+            issue, _ = upload
+
+            return self.repo.create_issue(
                 title=issue.title,
                 body=issue.all_comments[0].body[0],
                 labels=issue.labels,
             )
 
+        new_issues: List[Any] = run_concurrently(
+            upload_issue, uploads, self.options.upload_concurrency
+        )
+
+        for (_, index), new_issue in zip(uploads, new_issues):
             issues[index].number = new_issue.number
             issues[index].all_comments[0].updated_at = convert_utc_timezone(
                 new_issue.updated_at, self.options.timezone
             )
 
-            change_count += 1
-
-        buffered_info_message(self.nvim, f"Uploaded {change_count} issues to GitHub. ")
+        buffered_info_message(self.nvim, f"Uploaded {len(uploads)} issues to GitHub. ")
 
         return issues, issues_to_ignore
 
@@ -437,68 +572,74 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return [], []
 
-        comments_to_upload, change_indexes = self.filter_comments(issues, tag)
+        comments_to_upload, change_indexes = filter_comments(issues, tag)
         comments_to_ignore: List[Dict[str, int]] = []
         update_count: int = 0
 
-        for issue, change_index in zip(comments_to_upload, change_indexes):
+        # The comment IDs aren't stored in the buffer, so look them up from the
+        # open issues, such that the comments can be grabbed directly.
+        comment_ids: Dict[Tuple[int, int], int] = {}
+
+        if comments_to_upload:
+            comment_ids = {
+                (issue.number, comment.number): comment.comment_id
+                for issue in self.active_issues
+                for comment in issue.all_comments
+            }
+
+        def update_comment(issue: GitHubIssue) -> Optional[Any]:
             comment: GitHubIssueComment = issue.all_comments[0]
+            github_issue: Any = self.handles.get_issue(
+                self.service, self.options.repo_name, issue.number
+            )
 
             # Comment 0 is actually the issue body, not a comment.
             if comment.number == 0:
-                github_comment: Any = self.service.get_repo(self.repo_name).get_issue(
-                    issue.number
+                github_comment: Any = github_issue
+            else:
+                comment_id: int = comment.comment_id or comment_ids.get(
+                    (issue.number, comment.number), 0
                 )
 
-                github_edit_time: str = convert_utc_timezone(
-                    github_comment.updated_at, self.options.timezone
-                )
+                # Without an ID, the only option is to find it in all the comments.
+                if comment_id != 0:
+                    github_comment = github_issue.get_comment(comment_id)
+                else:
+                    github_comment = github_issue.get_comments()[comment.number - 1]
 
-                if github_edit_time != comment.updated_at:
-                    buffered_info_message(
-                        self.nvim,
-                        f"Mismatch with comment {issue.number}:{comment.number}.",
-                    )
-                    comments_to_ignore.append(change_index)
-                    continue
+            github_edit_time: str = convert_utc_timezone(
+                github_comment.updated_at, self.options.timezone
+            )
 
-                github_comment.edit(body=comment.body[0])
+            if github_edit_time != comment.updated_at:
+                return None
 
-                # Grab the comment again, to sort the update time.
-                github_comment = self.service.get_repo(self.repo_name).get_issue(
-                    issue.number
-                )
-            else:
+            # The edit updates the comment with the new update time, so it
+            # doesn't need to be grabbed again.
+            github_comment.edit(body=comment.body[0])
 
-                github_comment = (
-                    self.service.get_repo(self.repo_name)
-                    .get_issue(issue.number)
-                    .get_comments()[comment.number - 1]
-                )
+            return github_comment
 
-                github_edit_time = convert_utc_timezone(
-                    github_comment.updated_at, self.options.timezone
-                )
+        updated_comments: List[Optional[Any]] = run_concurrently(
+            update_comment, comments_to_upload, self.options.upload_concurrency
+        )
 
-                if github_edit_time != comment.updated_at:
-                    buffered_info_message(
-                        self.nvim,
-                        f"Mismatch with comment {issue.number}:{comment.number}. ",
-                    )
-                    comments_to_ignore.append(change_index)
-                    continue
-
-                github_comment.edit(comment.body[0])
-
-                # Grab the comment again, to sort the update time.
-                github_comment = (
-                    self.service.get_repo(self.repo_name)
-                    .get_issue(issue.number)
-                    .get_comments()[comment.number - 1]
+        for issue, change_index, github_comment in zip(
+            comments_to_upload, change_indexes, updated_comments
+        ):
+            if github_comment is None:
+                buffered_info_message(
+                    self.nvim,
+                    f"Mismatch with comment {issue.number}:"
+                    f"{issue.all_comments[0].number}. ",
                 )
+                comments_to_ignore.append(change_index)
+                continue
 
             current_issue: GitHubIssue = issues[change_index["issue"]]
             current_comment: GitHubIssueComment = current_issue.all_comments[
@@ -507,6 +648,10 @@ class SimpleNvimGithub:
             current_comment.updated_at = convert_utc_timezone(
                 github_comment.updated_at, self.options.timezone
             )
+
+            if current_comment.number != 0:
+                current_comment.comment_id = github_comment.id
+
             update_count += 1
 
         buffered_info_message(self.nvim, f"Updated {update_count} comments on GitHub. ")
@@ -522,17 +667,18 @@ class SimpleNvimGithub:
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return [], []
 
-        issues_to_upload, change_indexes = self.filter_issues(issues, tag)
+        issues_to_upload, change_indexes = filter_issues(issues, tag)
         issues_to_ignore: List[int] = []
         update_count: int = 0
 
-        for issue, change_index in zip(issues_to_upload, change_indexes):
-
-            github_issue: Any = self.service.get_repo(self.repo_name).get_issue(
-                issue.number
+        def update_issue(issue: GitHubIssue) -> Optional[Any]:
+            github_issue: Any = self.handles.get_issue(
+                self.service, self.options.repo_name, issue.number
             )
 
             github_edit_time = convert_utc_timezone(
@@ -540,20 +686,32 @@ class SimpleNvimGithub:
             )
 
             if github_edit_time != issue.all_comments[0].updated_at:
-                buffered_info_message(
-                    self.nvim, f"Mismatch with issue {issue.number}. "
-                )
-                issues_to_ignore.append(change_index)
-                continue
+                return None
 
+            # The edit updates the issue with the new update time, so it
+            # doesn't need to be grabbed again.
             github_issue.edit(
                 title=issue.title,
                 body=issue.all_comments[0].body[0],
                 labels=issue.labels,
             )
 
-            # Grab the issue again, to sort the update time.
-            github_issue = self.service.get_repo(self.repo_name).get_issue(issue.number)
+            return github_issue
+
+        updated_issues: List[Optional[Any]] = run_concurrently(
+            update_issue, issues_to_upload, self.options.upload_concurrency
+        )
+
+        for issue, change_index, github_issue in zip(
+            issues_to_upload, change_indexes, updated_issues
+        ):
+            if github_issue is None:
+                buffered_info_message(
+                    self.nvim, f"Mismatch with issue {issue.number}. "
+                )
+                issues_to_ignore.append(change_index)
+                continue
+
             current_issue: GitHubIssue = issues[change_index]
             issue_body_comment: GitHubIssueComment = current_issue.all_comments[0]
             issue_body_comment.updated_at = convert_utc_timezone(
@@ -570,25 +728,60 @@ class SimpleNvimGithub:
 
         Sort the complete status of the issues in the current buffer.
         We assume the buffer is always correct.
+
+        Unless turned off, only the issues whose completion differs from the
+        last known state are checked on GitHub.
         """
 
         if self.service_not_valid():
-            self.nvim.err_write("Github service not currently running...\n")
+            buffered_error_message(
+                self.nvim, "Github service not currently running...\n"
+            )
             return
 
-        change_counter: int = 0
+        issues_to_check: List[GitHubIssue] = issues
+
+        if self.options.diff_issue_completion:
+            open_issues: Set[int] = {issue.number for issue in self.active_issues}
+            issues_to_check = [
+                issue
+                for issue in issues
+                if issue.complete == (issue.number in open_issues)
+            ]
 
-        for issue in issues:
-            github_issue: Any = self.service.get_repo(self.repo_name).get_issue(
-                issue.number
+        def complete_issue(issue: GitHubIssue) -> bool:
+            github_issue: Any = self.handles.get_issue(
+                self.service, self.options.repo_name, issue.number
             )
 
             if issue.complete and github_issue.state == "open":
                 github_issue.edit(state="closed")
-                change_counter += 1
-            elif not issue.complete and github_issue.state == "closed":
+                return True
+
+            if not issue.complete and github_issue.state == "closed":
                 github_issue.edit(state="open")
-                change_counter += 1
+                return True
+
+            return False
+
+        changed_issues: List[bool] = run_concurrently(
+            complete_issue, issues_to_check, self.options.upload_concurrency
+        )
+        change_counter: int = sum(changed_issues)
+
+        # Closed issues should no longer be in the open issues, such that they
+        # aren't checked again. Reopened issues are left to the next sync.
+        closed_issues: Set[int] = {
+            issue.number
+            for issue, changed in zip(issues_to_check, changed_issues)
+            if changed and issue.complete
+        }
+
+        if closed_issues and self.issues_set is not None:
+            self.issues = [
+                issue for issue in self.issues if issue.number not in closed_issues
+            ]
+            set_cache(self.config_path, self.issues, "open_issues")
 
         buffered_info_message(
             self.nvim,
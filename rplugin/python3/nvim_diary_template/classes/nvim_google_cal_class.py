@@ -4,25 +4,39 @@ The google calendar class, with Neovim options to log information
 back to the user.
 """
 
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
+from itertools import chain
 from os import path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from googleapiclient import discovery, errors
 from httplib2 import Http, HttpLib2Error
 from oauth2client import file
 from pynvim import Nvim
 
+from ..classes.cache_refresh_class import CacheRefresh
 from ..classes.calendar_event_class import CalendarEvent
 from ..classes.plugin_options import PluginOptions
-from ..helpers.file_helpers import cache_valid, check_cache, set_cache
+from ..helpers.file_helpers import cache_valid, check_cache, load_cache, set_cache
 from ..helpers.google_calendar_helpers import (
+    apply_event_changes,
     convert_events,
     create_google_event,
+    format_google_event,
     format_google_events,
     get_calendar_objects,
+    get_event_list_parameters,
+    get_paged_items,
+    get_pages,
+    group_google_events_by_date,
+)
+from ..helpers.neovim_helpers import buffered_error_message, buffered_info_message
+from ..utils.constants import (
+    CALENDAR_CACHE_DURATION,
+    EVENT_CACHE_DURATION,
+    GOOGLE_BATCH_LIMIT,
+    ISO_FORMAT,
 )
-from ..utils.constants import CALENDAR_CACHE_DURATION, EVENT_CACHE_DURATION, ISO_FORMAT
 
 
 class SimpleNvimGoogleCal:
@@ -55,10 +69,9 @@ class SimpleNvimGoogleCal:
             self.get_all_calendars,
         )
 
-        self.filtered_calendars: Dict[str, str] = self.filter_calendars()
-
         self.events: List[CalendarEvent] = []
         self.events_set: Optional[datetime] = None
+        self.refresh: CacheRefresh = CacheRefresh()
 
     @property
     def config_path(self) -> str:
@@ -77,18 +90,33 @@ class SimpleNvimGoogleCal:
         If they are out of date, re-run the getting from cache.
         """
 
+        # Only today's events are cached, so anything cached before midnight
+        # is for a different day, and can't be used however recent it is.
+        todays_age: timedelta = datetime.now() - datetime.combine(
+            date.today(), time.min
+        )
+        data_age: timedelta = min(EVENT_CACHE_DURATION, todays_age)
+
         # If the current events are fine, just use them, rather than reparsing
         # the json file again.
-        if self.events_set is not None and cache_valid(
-            self.events_set, EVENT_CACHE_DURATION
-        ):
+        if self.events_set is not None and cache_valid(self.events_set, data_age):
             return self.events
 
+        # Expired events can be used while they are refreshed in the
+        # background, as long as they are within the hard expiry.
+        hard_expiry: Optional[timedelta] = None
+        if self.options.event_cache_hard_expiry > 0:
+            hard_expiry = min(
+                timedelta(minutes=self.options.event_cache_hard_expiry), todays_age
+            )
+
         active_events: Union[List[Dict[str, Any]], List[CalendarEvent]] = check_cache(
             self.config_path,
             "events",
-            EVENT_CACHE_DURATION,
+            data_age,
             lambda: self.get_events_for_date(date.today()),
+            hard_expiry=hard_expiry,
+            refresh_callback=self.set_refreshed_events,
         )
 
         self.events = get_calendar_objects(active_events)
@@ -96,6 +124,20 @@ class SimpleNvimGoogleCal:
 
         return self.events
 
+    def set_refreshed_events(
+        self, active_events: Union[List[Dict[str, Any]], List[CalendarEvent]]
+    ) -> None:
+        """set_refreshed_events
+
+        Store the events from a background refresh, and let the plugin know
+        they have changed.
+        """
+
+        self.events = get_calendar_objects(active_events)
+        self.events_set = datetime.now()
+
+        self.refresh.notify()
+
     @property
     def active(self) -> bool:
         """active
@@ -118,8 +160,9 @@ class SimpleNvimGoogleCal:
         credentials: Any = store.get()
 
         if not credentials or credentials.invalid:
-            self.nvim.err_write(
-                "Credentials invalid, try re-generating or checking the path.\n"
+            buffered_error_message(
+                self.nvim,
+                "Credentials invalid, try re-generating or checking the path.\n",
             )
             return None
 
@@ -135,7 +178,7 @@ class SimpleNvimGoogleCal:
         Check if the Google API service is ready.
         """
         if self.service is None:
-            self.nvim.err_write("Google service not ready...\n")
+            buffered_error_message(self.nvim, "Google service not ready...\n")
             return True
 
         return False
@@ -162,12 +205,14 @@ class SimpleNvimGoogleCal:
         if self.service_is_not_ready():
             return []
 
-        page_token = None
-        calendar_list = self.service.calendarList().list(pageToken=page_token).execute()
+        calendar_list: Iterator[Dict[str, Any]] = get_paged_items(
+            self.service.calendarList().list,
+            maxResults=self.options.calendar_page_size,
+        )
 
         all_calendars: Dict[str, str] = {}
 
-        for calendar_list_entry in calendar_list["items"]:
+        for calendar_list_entry in calendar_list:
             all_calendars[calendar_list_entry["summary"]] = calendar_list_entry["id"]
 
         return all_calendars
@@ -183,30 +228,29 @@ class SimpleNvimGoogleCal:
         if self.service_is_not_ready():
             return []
 
-        time_min: str = datetime.combine(current_date, time.min).isoformat() + "Z"
-        time_max: str = datetime.combine(current_date, time.max).isoformat() + "Z"
-
-        page_token = None
-        events_in_timeframe: List[Dict[str, Any]] = []
-
-        for _, calendar_id in self.filtered_calendars.items():
-            events = (
-                self.service.events()
-                .list(
-                    calendarId=calendar_id,
-                    pageToken=page_token,
-                    timeMin=time_min,
-                    timeMax=time_max,
-                    singleEvents=True,
-                )
-                .execute()
+        if self.options.incremental_event_sync and current_date == date.today():
+            return self.sync_events(current_date)
+
+        # Other days are likely to be in the prefetched events.
+        if current_date != date.today():
+            window_events: Optional[List[CalendarEvent]] = self.get_window_events(
+                current_date
             )
 
-            events_in_timeframe.extend(events["items"])
+            if window_events is not None:
+                return window_events
 
-        event_list: List[CalendarEvent] = format_google_events(
-            events_in_timeframe, str(current_date)
-        )
+        event_pages, _ = self.get_event_pages(current_date, {})
+
+        # The events are formatted a page at a time, as they arrive.
+        event_list: List[CalendarEvent] = [
+            event
+            for calendar_id, pages in event_pages.items()
+            for page in pages
+            for event in format_google_events(
+                page.get("items", []), str(current_date), calendar_id
+            )
+        ]
 
         # If we've gone through the trouble of getting the events for today, should store them.
         if current_date == date.today():
@@ -215,6 +259,247 @@ class SimpleNvimGoogleCal:
 
         return event_list
 
+    def get_window_events(self, current_date: date) -> Optional[List[CalendarEvent]]:
+        """get_window_events
+
+        Gets the events for the given date from the prefetch window, which
+        is the days around today. Returns None if the date is outside of the
+        window.
+        """
+
+        window_start, window_end = self.event_window
+
+        if not window_start <= current_date <= window_end:
+            return None
+
+        window: Dict[str, Any] = check_cache(
+            self.config_path, "event_window", EVENT_CACHE_DURATION, self.prefetch_events
+        )
+
+        # The cached window may be from a different day.
+        if window["start"] != str(window_start) or window["end"] != str(window_end):
+            window = self.prefetch_events()
+            set_cache(self.config_path, window, "event_window")
+
+        return get_calendar_objects(window["events"].get(str(current_date), []))
+
+    @property
+    def event_window(self) -> Tuple[date, date]:
+        """event_window
+
+        Get the first and last dates of the prefetch window.
+        """
+
+        return (
+            date.today() - timedelta(days=self.options.event_prefetch_days_before),
+            date.today() + timedelta(days=self.options.event_prefetch_days_after),
+        )
+
+    def prefetch_events(self) -> Dict[str, Any]:
+        """prefetch_events
+
+        Gets all the events in the prefetch window, with a single ranged
+        request for each calendar. The events are grouped by their date.
+        """
+
+        window_start, window_end = self.event_window
+        event_pages, _ = self.get_event_pages(window_start, {}, window_end)
+
+        events_by_date: Dict[str, List[CalendarEvent]] = {}
+
+        for calendar_id, pages in event_pages.items():
+            for page in pages:
+                page_events: Dict[str, List[CalendarEvent]] = (
+                    group_google_events_by_date(page.get("items", []), calendar_id)
+                )
+
+                for event_date, events in page_events.items():
+                    events_by_date.setdefault(event_date, []).extend(events)
+
+        return {
+            "start": str(window_start),
+            "end": str(window_end),
+            "events": events_by_date,
+        }
+
+    def sync_events(self, current_date: date) -> List[CalendarEvent]:
+        """sync_events
+
+        Gets the events for the given date, patching the cached events with
+        only the events that have changed since each calendar was last synced.
+        The sync token for each calendar is stored alongside the events cache.
+        """
+
+        sync_state: Dict[str, Any] = load_cache(self.config_path, "event_sync") or {}
+        cached_events: List[CalendarEvent] = get_calendar_objects(
+            load_cache(self.config_path, "events") or []
+        )
+
+        # The sync tokens only cover the date they were made for, and need the
+        # cached events to have IDs to be patched.
+        sync_tokens: Dict[str, str] = {}
+
+        if sync_state.get("date") == str(current_date) and all(
+            event.event_id != "" for event in cached_events
+        ):
+            sync_tokens = sync_state.get("tokens", {})
+
+        event_pages, synced_calendars = self.get_event_pages(current_date, sync_tokens)
+
+        events_by_calendar: Dict[str, List[CalendarEvent]] = {
+            calendar_id: [] for calendar_id in event_pages
+        }
+
+        for event in cached_events:
+            if event.calendar_id in synced_calendars:
+                events_by_calendar[event.calendar_id].append(event)
+
+        next_sync_tokens: Dict[str, str] = {}
+
+        for calendar_id, pages in event_pages.items():
+            for page in pages:
+                events_by_calendar[calendar_id] = apply_event_changes(
+                    events_by_calendar[calendar_id],
+                    page.get("items", []),
+                    str(current_date),
+                    calendar_id,
+                )
+
+                if "nextSyncToken" in page:
+                    next_sync_tokens[calendar_id] = page["nextSyncToken"]
+
+        event_list: List[CalendarEvent] = list(
+            chain.from_iterable(events_by_calendar.values())
+        )
+
+        # The events must be stored before the tokens, such that a failure
+        # means the changes are fetched again, rather than lost.
+        set_cache(self.config_path, event_list, "events")
+        set_cache(
+            self.config_path,
+            {"date": str(current_date), "tokens": next_sync_tokens},
+            "event_sync",
+        )
+
+        self.events = event_list
+        self.events_set = datetime.now()
+
+        return event_list
+
+    def get_event_pages(
+        self,
+        current_date: date,
+        sync_tokens: Dict[str, str],
+        end_date: Optional[date] = None,
+    ) -> Tuple[Dict[str, Iterator[Dict[str, Any]]], Set[str]]:
+        """get_event_pages
+
+        Get the pages of events for every calendar. Calendars with a sync
+        token only get the events that have changed since that token, whereas
+        the others get every event on the given date, or up to the end date
+        if one is given.
+
+        Returns the pages for each calendar, and the calendars that were
+        synced with a token. If a sync token has expired, that calendar gets
+        every event instead.
+        """
+
+        time_range: Tuple[str, str] = (
+            datetime.combine(current_date, time.min).isoformat() + "Z",
+            datetime.combine(end_date or current_date, time.max).isoformat() + "Z",
+        )
+
+        calendars: Dict[str, str] = self.filter_calendars()
+        token_parameters: Dict[str, Dict[str, Any]] = {
+            calendar_id: get_event_list_parameters(
+                calendar_id,
+                self.options.calendar_page_size,
+                sync_tokens[calendar_id],
+                time_range,
+            )
+            for calendar_id in calendars.values()
+            if calendar_id in sync_tokens
+        }
+
+        # Any calendar whose sync token has expired gets every event instead.
+        synced_pages, _ = self.get_first_event_pages(token_parameters)
+
+        full_parameters: Dict[str, Dict[str, Any]] = {
+            calendar_id: get_event_list_parameters(
+                calendar_id, self.options.calendar_page_size, None, time_range
+            )
+            for calendar_id in calendars.values()
+            if calendar_id not in synced_pages
+        }
+        full_pages, failed_calendars = self.get_first_event_pages(full_parameters)
+
+        event_pages: Dict[str, Iterator[Dict[str, Any]]] = {}
+
+        for calendar_name, calendar_id in calendars.items():
+            if calendar_id in failed_calendars:
+                buffered_error_message(
+                    self.nvim, f"Error getting events from {calendar_name}.\n"
+                )
+                continue
+
+            use_token: bool = calendar_id in synced_pages
+
+            # Any further pages are then followed up.
+            event_pages[calendar_id] = get_pages(
+                lambda **parameters: self.service.events().list(**parameters),
+                first_page=(synced_pages if use_token else full_pages)[calendar_id],
+                **(token_parameters if use_token else full_parameters)[calendar_id],
+            )
+
+        return event_pages, set(synced_pages)
+
+    def get_first_event_pages(
+        self, calendar_parameters: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """get_first_event_pages
+
+        Get the first page of events for every calendar at once, rather than
+        one after another, using the list parameters given for each calendar.
+        """
+
+        return self.execute_batch(
+            [
+                (calendar_id, self.service.events().list(**parameters))
+                for calendar_id, parameters in calendar_parameters.items()
+            ]
+        )
+
+    def execute_batch(
+        self, requests: List[Tuple[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """execute_batch
+
+        Send the given requests to Google as batches, such that many requests
+        only need a single round trip. The responses and errors are returned
+        by the ID given for each request.
+        """
+
+        responses: Dict[str, Any] = {}
+        failures: Dict[str, Exception] = {}
+
+        def store_response(
+            request_id: str, response: Any, exception: Optional[Exception]
+        ) -> None:
+            if exception is None:
+                responses[request_id] = response
+            else:
+                failures[request_id] = exception
+
+        for start in range(0, len(requests), GOOGLE_BATCH_LIMIT):
+            batch: Any = self.service.new_batch_http_request(callback=store_response)
+
+            for request_id, request in requests[start : start + GOOGLE_BATCH_LIMIT]:
+                batch.add(request, request_id=request_id)
+
+            batch.execute()
+
+        return responses, failures
+
     def upload_to_calendar(
         self, markdown_events: List[CalendarEvent], diary_date: date
     ) -> None:
@@ -233,7 +518,10 @@ class SimpleNvimGoogleCal:
             event for event in markdown_events if event not in todays_events
         ]
 
-        for event in missing_events:
+        insert_requests: List[Tuple[str, Any]] = []
+        calendar_ids: List[str] = []
+
+        for index, event in enumerate(missing_events):
 
             target_calendar: str = self.get_calendar_id(event.calendar)
 
@@ -241,19 +529,73 @@ class SimpleNvimGoogleCal:
                 event, self.options.timezone
             )
 
-            try:
-                self.service.events().insert(
-                    calendarId=target_calendar, body=gcal_event
-                ).execute()
-            except (errors.HttpError, HttpLib2Error):
-                self.nvim.err_write("Error adding events to calendar. Quitting.\n")
-                return
+            insert_requests.append(
+                (
+                    str(index),
+                    self.service.events().insert(
+                        calendarId=target_calendar, body=gcal_event
+                    ),
+                )
+            )
+            calendar_ids.append(target_calendar)
+
+        # All the events are added in a single batch, rather than one at a time.
+        try:
+            new_events, failures = self.execute_batch(insert_requests)
+        except (errors.HttpError, HttpLib2Error):
+            buffered_error_message(
+                self.nvim, "Error adding events to calendar. Quitting.\n"
+            )
+            return
 
-        # Now that the events have been updated, update the cache.
-        updated_events: List[CalendarEvent] = self.get_events_for_date(diary_date)
-        set_cache(self.config_path, updated_events, "events")
+        if failures:
+            buffered_error_message(
+                self.nvim, f"Error adding {len(failures)} events to calendar.\n"
+            )
+
+        # The new events are merged straight into the caches, rather than
+        # getting every event again.
+        added_events: List[CalendarEvent] = [
+            format_google_event(new_events[request_id], calendar_ids[int(request_id)])
+            for request_id, _ in insert_requests
+            if request_id in new_events
+        ]
+
+        self.add_to_event_cache(added_events, diary_date)
+
+        buffered_info_message(
+            self.nvim, f"Added {len(added_events)} events to Google calendar.\n"
+        )
+
+    def add_to_event_cache(self, events: List[CalendarEvent], diary_date: date) -> None:
+        """add_to_event_cache
+
+        Add newly made events to the cached events for the given date. Today's
+        events are cached on their own, and the days around it are in the
+        prefetched events.
+        """
+
+        window_start, window_end = self.event_window
+
+        # Today's events are only loaded once they are first used, so they
+        # are loaded before merging, to not overwrite the cache.
+        if diary_date == date.today():
+            self.events = [*self.active_events, *events]
+            self.events_set = datetime.now()
+            set_cache(self.config_path, self.events, "events")
+        elif window_start <= diary_date <= window_end:
+            window: Optional[Dict[str, Any]] = load_cache(
+                self.config_path, "event_window"
+            )
+
+            if window is None or window["start"] != str(window_start):
+                return
 
-        self.nvim.out_write(f"Added {len(missing_events)} events to Google calendar.\n")
+            window["events"][str(diary_date)] = [
+                *window["events"].get(str(diary_date), []),
+                *events,
+            ]
+            set_cache(self.config_path, window, "event_window")
 
     def get_calendar_id(self, target_calendar: str = "") -> str:
         """get_calendar_id
@@ -270,5 +612,7 @@ class SimpleNvimGoogleCal:
         try:
             return self.all_calendars[target_calendar]
         except KeyError:
-            self.nvim.err_write(f"No calendar named {target_calendar} exists.\n")
+            buffered_error_message(
+                self.nvim, f"No calendar named {target_calendar} exists.\n"
+            )
             return ""
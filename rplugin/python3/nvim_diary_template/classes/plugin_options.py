@@ -42,6 +42,16 @@ class PluginOptions:
         self.repo_name: str = ""
         self.user_name: str = ""
         self.sort_issues_on_upload: bool = False
+        self.incremental_issue_sync: bool = True
+        self.upload_concurrency: int = 8
+        self.diff_issue_completion: bool = True
+        self.calendar_page_size: int = 250
+        self.incremental_event_sync: bool = True
+        self.event_prefetch_days_before: int = 7
+        self.event_prefetch_days_after: int = 14
+        self.issue_cache_hard_expiry: int = 1440
+        self.event_cache_hard_expiry: int = 240
+        self.async_commands: bool = True
         self.sort_order: Dict[str, int] = DEFAULT_SORT_ORDER
 
         if nvim is not None:
@@ -0,0 +1,182 @@
+"""diff_helpers
+
+Simple helpers to find the lines that differ between two versions of a part
+of the buffer, so only those need to be set.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# A hunk is given as the range of old lines, [old_start, old_end), that are
+# swapped for the range of new lines, [new_start, new_end).
+Hunk = Tuple[int, int, int, int]
+
+
+def get_line_hunks(old_lines: List[str], new_lines: List[str]) -> List[Hunk]:
+    """get_line_hunks
+
+    Get the hunks needed to turn the old lines into the new lines, in order.
+
+    This is a patience diff. Any lines in common at the start and end are
+    skipped, and then the lines that appear only once in both are matched up
+    in order, to split the rest into smaller ranges to diff in the same way.
+    A range with no unique lines in common is set as a single hunk. The ranges
+    are kept on a stack, rather than using recursion, so a large diff can't
+    hit the recursion limit.
+    """
+
+    hunks: List[Hunk] = []
+    ranges: List[Hunk] = [(0, len(old_lines), 0, len(new_lines))]
+
+    while ranges:
+        old_start, old_end, new_start, new_end = ranges.pop()
+
+        # Skip any lines that are the same at the start and end of the range.
+        while (
+            old_start < old_end
+            and new_start < new_end
+            and old_lines[old_start] == new_lines[new_start]
+        ):
+            old_start += 1
+            new_start += 1
+
+        while (
+            old_start < old_end
+            and new_start < new_end
+            and old_lines[old_end - 1] == new_lines[new_end - 1]
+        ):
+            old_end -= 1
+            new_end -= 1
+
+        if old_start == old_end and new_start == new_end:
+            continue
+
+        anchors: List[Tuple[int, int]] = []
+
+        if old_start != old_end and new_start != new_end:
+            anchors = get_unique_anchors(
+                old_lines, new_lines, (old_start, old_end, new_start, new_end)
+            )
+
+        if not anchors:
+            hunks.append((old_start, old_end, new_start, new_end))
+            continue
+
+        # Diff each of the ranges between the matched lines.
+        for old_anchor, new_anchor in anchors:
+            ranges.append((old_start, old_anchor, new_start, new_anchor))
+            old_start, new_start = old_anchor + 1, new_anchor + 1
+
+        ranges.append((old_start, old_end, new_start, new_end))
+
+    return sorted(hunks)
+
+
+def get_unique_anchors(
+    old_lines: List[str], new_lines: List[str], line_range: Hunk
+) -> List[Tuple[int, int]]:
+    """get_unique_anchors
+
+    Get the longest run of lines, in order in both the old and new lines, from
+    the lines that appear exactly once in each part of the given range.
+    """
+
+    old_start, old_end, new_start, new_end = line_range
+
+    old_counts: Dict[str, int] = {}
+    old_indexes: Dict[str, int] = {}
+
+    for index in range(old_start, old_end):
+        line: str = old_lines[index]
+        old_counts[line] = old_counts.get(line, 0) + 1
+        old_indexes[line] = index
+
+    new_counts: Dict[str, int] = {}
+
+    for index in range(new_start, new_end):
+        new_counts[new_lines[index]] = new_counts.get(new_lines[index], 0) + 1
+
+    # The unique lines, in the order of the new lines.
+    pairs: List[Tuple[int, int]] = [
+        (old_indexes[new_lines[index]], index)
+        for index in range(new_start, new_end)
+        if new_counts[new_lines[index]] == 1
+        and old_counts.get(new_lines[index], 0) == 1
+    ]
+
+    # Find the longest run that is also in order in the old lines.
+    return get_longest_ordered_run(pairs)
+
+
+def get_longest_ordered_run(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """get_longest_ordered_run
+
+    Get the longest run of the given pairs, which are in order of their new
+    index, that is also in order of their old index. This is found by patience
+    sorting. Each pile keeps the smallest old index that ends a run of its
+    length, along with the pair before it in that run.
+    """
+
+    pile_tops: List[int] = []
+    pile_pairs: List[int] = []
+    previous_pairs: List[int] = []
+
+    for pair_index, (old_index, _) in enumerate(pairs):
+        pile: int = bisect_left(pile_tops, old_index)
+
+        if pile == len(pile_tops):
+            pile_tops.append(old_index)
+            pile_pairs.append(pair_index)
+        else:
+            pile_tops[pile] = old_index
+            pile_pairs[pile] = pair_index
+
+        previous_pairs.append(pile_pairs[pile - 1] if pile > 0 else -1)
+
+    run: List[Tuple[int, int]] = []
+    pair_index = pile_pairs[-1] if pile_pairs else -1
+
+    while pair_index != -1:
+        run.append(pairs[pair_index])
+        pair_index = previous_pairs[pair_index]
+
+    return run[::-1]
+
+
+def merge_line_changes(
+    base_lines: List[str], our_lines: List[str], their_lines: List[str]
+) -> Optional[List[str]]:
+    """merge_line_changes
+
+    Merge two sets of changes made to the same base lines, such that both are
+    kept. The changes conflict if any of their hunks overlap or touch in the
+    base lines, in which case None is returned, rather than guessing which
+    order the lines should go in.
+    """
+
+    our_hunks: List[Hunk] = get_line_hunks(base_lines, our_lines)
+    their_hunks: List[Hunk] = get_line_hunks(base_lines, their_lines)
+
+    for our_start, our_end, _, _ in our_hunks:
+        for their_start, their_end, _, _ in their_hunks:
+            if our_start <= their_end and their_start <= our_end:
+                return None
+
+    changes: List[Tuple[int, int, List[str]]] = [
+        (old_start, old_end, our_lines[new_start:new_end])
+        for old_start, old_end, new_start, new_end in our_hunks
+    ] + [
+        (old_start, old_end, their_lines[new_start:new_end])
+        for old_start, old_end, new_start, new_end in their_hunks
+    ]
+
+    merged_lines: List[str] = []
+    base_index: int = 0
+
+    for old_start, old_end, new_lines in sorted(changes):
+        merged_lines.extend(base_lines[base_index:old_start])
+        merged_lines.extend(new_lines)
+        base_index = old_end
+
+    merged_lines.extend(base_lines[base_index:])
+
+    return merged_lines
@@ -5,9 +5,8 @@ Simple helpers to deal with parsed events.
 
 from typing import List
 
-from dateutil import parser
-
 from ..classes.calendar_event_class import CalendarEvent
+from ..helpers.google_calendar_helpers import get_time
 
 
 def sort_events(events: List[CalendarEvent]) -> List[CalendarEvent]:
@@ -26,7 +25,7 @@ def format_event(event: CalendarEvent, format_string: str) -> CalendarEvent:
     Simple helper function to format an event to a given format.
     """
 
-    start_time: str = parser.parse(event.start).strftime(format_string)
-    end_time: str = parser.parse(event.end).strftime(format_string)
+    start_time: str = get_time(event.start).strftime(format_string)
+    end_time: str = get_time(event.end).strftime(format_string)
 
     return CalendarEvent(name=event.name, start=start_time, end=end_time)
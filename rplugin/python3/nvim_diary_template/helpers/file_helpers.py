@@ -6,25 +6,47 @@ Simple helpers to help with opening and finding files.
 import glob
 import json
 import re
+import sys
+import tempfile
+import threading
 import time as t
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from os import makedirs, path, remove
-from typing import Any, Callable, List, Union
+from os import makedirs, path, remove, rename, replace
+from typing import Any, Callable, Dict, Iterator, List, Match, Optional, Set
 
 from dateutil import parser
 
 from ..classes.data_class_json import EnhancedJSONEncoder
+from ..classes.data_class_msgpack import pack_data, unpack_data
+from ..classes.memory_cache_class import MemoryCache, MemoryCacheKey
 from ..classes.plugin_options import PluginOptions
 from ..utils.constants import (
     BULLET_POINT,
-    CACHE_EPOCH_REGEX,
+    CACHE_INDEX_FILE,
     DATE_FORMAT,
     DIARY_FOLDER,
     DIARY_INDEX_FILE,
     HEADING_2,
     HEADING_3,
+    MEMORY_CACHE_SIZE,
+    OLD_CACHE_FILE_REGEX,
+    PACKED_CACHE_NAMES,
 )
 
+if sys.platform == "win32":
+    import msvcrt  # pylint: disable=import-error
+else:
+    import fcntl
+
+# Data that has been read from the cache files, such that later checks in the
+# same session don't need to read and decode the files again.
+MEMORY_CACHE: MemoryCache = MemoryCache(MEMORY_CACHE_SIZE)
+
+# The caches that are currently being refreshed in the background.
+REFRESHING_CACHES: Set[MemoryCacheKey] = set()
+REFRESHING_LOCK: threading.Lock = threading.Lock()
+
 
 def check_cache(
     config_path: str,
@@ -32,6 +54,10 @@ def check_cache(
     data_age: timedelta,
     fallback_function: Callable[[], Any],
     early_return: bool = False,
+    *,
+    revalidate_function: Optional[Callable[[], bool]] = None,
+    hard_expiry: Optional[timedelta] = None,
+    refresh_callback: Optional[Callable[[Any], None]] = None,
 ) -> Any:
     """check_cache
 
@@ -41,68 +67,527 @@ def check_cache(
 
     The early return parameter allows the checking of a cache, without actually
     loading any data from it, in cases where the cache is up to date.
+
+    The revalidate function is called when a cache has expired, and should
+    return True if the cached data is still up to date. If it is, the cache is
+    renewed rather than calling the original function.
+
+    Data read from the cache files is kept in memory, and used until it
+    expires or the cache is set again.
+
+    If a hard expiry and refresh callback are given, expired data that is
+    younger than the hard expiry is returned straight away, and refreshed in
+    the background. The refresh callback is then called with the new data.
     """
 
-    cache_path: str = path.join(config_path, "cache")
-    makedirs(cache_path, exist_ok=True)
+    cached_data: Optional[Any] = MEMORY_CACHE.get((config_path, data_name), data_age)
+
+    if cached_data is not None:
+        return [] if early_return else cached_data
+
+    cache_entry: Optional[Dict[str, Any]] = get_cache_index(config_path).get(data_name)
+
+    if cache_entry_valid(cache_entry, data_age):
+        if early_return:
+            return []
+
+        cached_data = read_cache_file(config_path, data_name, cache_entry)
+
+        if cached_data is not None:
+            return cached_data
 
-    pattern: str = path.join(
-        cache_path, f"nvim_diary_template_{data_name}_cache_*.json"
+    elif (
+        hard_expiry is not None
+        and refresh_callback is not None
+        and not early_return
+        and cache_entry_valid(cache_entry, hard_expiry)
+    ):
+        cached_data = read_cache_file(config_path, data_name, cache_entry)
+
+        if cached_data is not None:
+            refresh_cache_in_background(
+                config_path,
+                data_name,
+                data_age,
+                fallback_function,
+                refresh_callback=refresh_callback,
+                revalidate_function=revalidate_function,
+            )
+            return cached_data
+
+    return refresh_cache(
+        config_path,
+        data_name,
+        data_age,
+        fallback_function,
+        early_return,
+        revalidate_function=revalidate_function,
     )
 
-    try:
-        cache_file_name: str = glob.glob(pattern)[0]
 
-        epoch_search: Union[str, Any] = re.search(
-            CACHE_EPOCH_REGEX, path.basename(cache_file_name)
+def refresh_cache(
+    config_path: str,
+    data_name: str,
+    data_age: timedelta,
+    fallback_function: Callable[[], Any],
+    early_return: bool = False,
+    *,
+    revalidate_function: Optional[Callable[[], bool]] = None,
+) -> Any:
+    """refresh_cache
+
+    Bring an expired cache up to date, by revalidating it or calling the
+    original function to generate the data again.
+    """
+
+    # Only one process should refresh a given cache at once. Any others wait
+    # for the lock, then use the data that the first process stored.
+    with cache_lock(config_path, data_name):
+        cache_entry: Optional[Dict[str, Any]] = get_cache_index(config_path).get(
+            data_name
         )
-        epoch: str = epoch_search[0] if epoch_search is not None else ""
+        cache_is_valid: bool = cache_entry_valid(cache_entry, data_age)
+
+        if (
+            not cache_is_valid
+            and cache_entry is not None
+            and "file" in cache_entry
+            and revalidate_function is not None
+        ):
+            cache_is_valid = revalidate_function()
 
-        cache_file_creation_date: datetime = datetime.fromtimestamp(int(epoch))
+            if cache_is_valid:
+                renew_cache(config_path, data_name)
+                cache_entry = get_cache_index(config_path).get(data_name)
 
-        if cache_valid(cache_file_creation_date, data_age):
+        if cache_is_valid:
 
             if early_return:
                 return []
 
-            with open(cache_file_name) as cache_file:
-                data: Any = json.load(cache_file)
-        else:
-            data = fallback_function()
-            set_cache(config_path, data, data_name)
-    except (IndexError, FileNotFoundError):
-        data = fallback_function()
+            cached_data: Optional[Any] = read_cache_file(
+                config_path, data_name, cache_entry
+            )
+
+            if cached_data is not None:
+                return cached_data
+
+        data: Any = fallback_function()
         set_cache(config_path, data, data_name)
 
     return data
 
 
-def set_cache(config_path: str, data: List[Any], data_name: str) -> None:
+def refresh_cache_in_background(
+    config_path: str,
+    data_name: str,
+    data_age: timedelta,
+    fallback_function: Callable[[], Any],
+    *,
+    refresh_callback: Callable[[Any], None],
+    revalidate_function: Optional[Callable[[], bool]] = None,
+) -> None:
+    """refresh_cache_in_background
+
+    Refresh the given cache on a background thread, and pass the new data
+    to the refresh callback. Nothing is started if the cache is already being
+    refreshed.
+    """
+
+    cache_key: MemoryCacheKey = (config_path, data_name)
+
+    with REFRESHING_LOCK:
+        if cache_key in REFRESHING_CACHES:
+            return
+
+        REFRESHING_CACHES.add(cache_key)
+
+    def refresh() -> None:
+        try:
+            data: Any = refresh_cache(
+                config_path,
+                data_name,
+                data_age,
+                fallback_function,
+                revalidate_function=revalidate_function,
+            )
+        finally:
+            with REFRESHING_LOCK:
+                REFRESHING_CACHES.discard(cache_key)
+
+        refresh_callback(data)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def cache_entry_valid(
+    cache_entry: Optional[Dict[str, Any]], data_age: timedelta
+) -> bool:
+    """cache_entry_valid
+
+    Check if the given cache index entry has a cache file that is still in date.
+    """
+
+    if cache_entry is None or "file" not in cache_entry:
+        return False
+
+    return cache_valid(datetime.fromtimestamp(cache_entry["created"]), data_age)
+
+
+def read_cache_file(
+    config_path: str, data_name: str, cache_entry: Optional[Dict[str, Any]]
+) -> Any:
+    """read_cache_file
+
+    Load the data from the cache file of the given cache index entry, and
+    keep it in memory for later checks.
+    Returns None if the file is missing or can't be read.
+    """
+
+    if cache_entry is None or "file" not in cache_entry:
+        return None
+
+    try:
+        data: Any = read_data_file(
+            path.join(get_cache_path(config_path), cache_entry["file"])
+        )
+    except (FileNotFoundError, ValueError):
+        return None
+
+    MEMORY_CACHE.set((config_path, data_name), cache_entry["created"], data)
+
+    return data
+
+
+@contextmanager
+def cache_lock(config_path: str, lock_name: str) -> Iterator[None]:
+    """cache_lock
+
+    Hold an advisory lock on the given name, shared between every process
+    using the same config folder. Blocks until the lock is free.
+    """
+
+    makedirs(get_cache_path(config_path), exist_ok=True)
+    lock_file_name: str = path.join(
+        get_cache_path(config_path), f"nvim_diary_template_{lock_name}.lock"
+    )
+
+    with open(lock_file_name, "a+", encoding="utf-8") as lock_file:
+        if sys.platform == "win32":
+            lock_file.seek(0)
+
+            # LK_LOCK only retries for a few seconds, so keep trying until the
+            # other process is finished.
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_data_file(file_name: str) -> Any:
+    """read_data_file
+
+    Load the data from the given cache file, which is either packed or json.
+    Raises a ValueError if the file can't be decoded.
+    """
+
+    if file_name.endswith(".msgpack"):
+        with open(file_name, "rb") as packed_file:
+            return unpack_data(packed_file.read())
+
+    with open(file_name, encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def write_file_atomically(
+    file_name: str, write_function: Callable[[Any], None], binary: bool = False
+) -> None:
+    """write_file_atomically
+
+    Write a file by writing a temporary file next to it, and then moving it
+    into place. Readers only ever see the old or the new file, never a half
+    written one.
+    """
+
+    file_handle, temp_file_name = tempfile.mkstemp(
+        dir=path.dirname(file_name), prefix=".tmp_", suffix=path.splitext(file_name)[1]
+    )
+
+    try:
+        with open(
+            file_handle,
+            "wb" if binary else "w",
+            encoding=None if binary else "utf-8",
+        ) as temp_file:
+            write_function(temp_file)
+
+        replace(temp_file_name, file_name)
+    except BaseException:
+        remove(temp_file_name)
+        raise
+
+
+def load_cache(config_path: str, data_name: str) -> Optional[Any]:
+    """load_cache
+
+    Load the data from an existing cache file, regardless of its age.
+    This is useful when old data can be updated rather than replaced.
+    Returns None if there is no cache file.
+    """
+
+    try:
+        return read_data_file(get_cache_file_name(config_path, data_name))
+    except (KeyError, FileNotFoundError, ValueError):
+        return None
+
+
+def get_cache_path(config_path: str) -> str:
+    """get_cache_path
+
+    Get the folder that the cache files are stored in.
+    """
+
+    return path.join(config_path, "cache")
+
+
+def get_cache_file_name(config_path: str, data_name: str) -> str:
+    """get_cache_file_name
+
+    Get the name of the current cache file for the given data.
+    Raises a KeyError if there is no cache file.
+    """
+
+    return path.join(
+        get_cache_path(config_path), get_cache_index(config_path)[data_name]["file"]
+    )
+
+
+def get_cache_index(config_path: str) -> Dict[str, Dict[str, Any]]:
+    """get_cache_index
+
+    Load the cache index, which stores the file, creation time and any
+    validators for every cached piece of data. If there is no index yet,
+    any old style cache files are moved into a new one, while holding the
+    index lock.
+    """
+
+    cache_index: Optional[Dict[str, Dict[str, Any]]] = read_cache_index(config_path)
+
+    if cache_index is not None:
+        return cache_index
+
+    with cache_lock(config_path, "index"):
+        return get_locked_cache_index(config_path)
+
+
+def get_locked_cache_index(config_path: str) -> Dict[str, Dict[str, Any]]:
+    """get_locked_cache_index
+
+    Load the cache index, for callers that already hold the index lock.
+    The old style cache files are only moved if no other process made the
+    index while waiting for the lock.
+    """
+
+    cache_index: Optional[Dict[str, Dict[str, Any]]] = read_cache_index(config_path)
+
+    if cache_index is None:
+        cache_index = migrate_cache_files(config_path)
+        write_cache_index(config_path, cache_index)
+
+    return cache_index
+
+
+def read_cache_index(config_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """read_cache_index
+
+    Read the cache index file. Returns None if there is no index yet, and an
+    empty index if it can't be read.
+    """
+
+    index_file_name: str = path.join(get_cache_path(config_path), CACHE_INDEX_FILE)
+
+    try:
+        with open(index_file_name, encoding="utf-8") as index_file:
+            cache_index: Dict[str, Dict[str, Any]] = json.load(index_file)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        return {}
+
+    return cache_index
+
+
+def write_cache_index(config_path: str, cache_index: Dict[str, Dict[str, Any]]) -> None:
+    """write_cache_index
+
+    Store the given cache index.
+    """
+
+    makedirs(get_cache_path(config_path), exist_ok=True)
+    index_file_name: str = path.join(get_cache_path(config_path), CACHE_INDEX_FILE)
+
+    write_file_atomically(
+        index_file_name, lambda index_file: json.dump(cache_index, index_file)
+    )
+
+
+def migrate_cache_files(config_path: str) -> Dict[str, Dict[str, Any]]:
+    """migrate_cache_files
+
+    Move any cache files that have their creation time in the file name into
+    a cache index. Stored validators are moved into the index itself.
+    """
+
+    cache_index: Dict[str, Dict[str, Any]] = {}
+    old_cache_files: List[str] = glob.glob(
+        path.join(get_cache_path(config_path), "nvim_diary_template_*_cache_*.json")
+    )
+
+    for old_cache_file in sorted(old_cache_files):
+        file_search: Optional[Match[str]] = re.match(
+            OLD_CACHE_FILE_REGEX, path.basename(old_cache_file)
+        )
+
+        if file_search is None:
+            continue
+
+        data_name: str = file_search.group(1)
+        created: int = int(file_search.group(2))
+
+        # Files that have gone since they were listed were already moved.
+        if data_name.endswith("_validators"):
+            try:
+                with open(old_cache_file, encoding="utf-8") as validators_file:
+                    validators: Dict[str, str] = json.load(validators_file)
+
+                remove(old_cache_file)
+            except FileNotFoundError:
+                continue
+
+            cache_index.setdefault(data_name[: -len("_validators")], {})[
+                "validators"
+            ] = validators
+            continue
+
+        new_file_name: str = get_cache_data_file(data_name)
+
+        try:
+            rename(
+                old_cache_file, path.join(get_cache_path(config_path), new_file_name)
+            )
+        except FileNotFoundError:
+            continue
+
+        cache_index.setdefault(data_name, {}).update(
+            {"file": new_file_name, "created": created}
+        )
+
+    return cache_index
+
+
+def get_cache_data_file(data_name: str, file_format: str = "json") -> str:
+    """get_cache_data_file
+
+    Get the name of the file that the given data is cached in.
+    """
+
+    return f"nvim_diary_template_{data_name}_cache.{file_format}"
+
+
+def set_cache(config_path: str, data: Any, data_name: str) -> None:
     """set_cache
 
     Given some data and a name, creates a cache file
-    in the config folder. Cleans up any existing cache files
-    when creating a new one.
+    in the config folder, and marks it as up to date in the cache index.
     """
 
-    cache_file_name: str = path.join(
-        config_path,
-        "cache",
-        f"nvim_diary_template_{data_name}_cache_{int(t.time())}.json",
-    )
+    makedirs(get_cache_path(config_path), exist_ok=True)
+    MEMORY_CACHE.invalidate((config_path, data_name))
+
+    # The larger caches are packed, whereas the rest stay as json, since they
+    # are also read by the deoplete sources.
+    if data_name in PACKED_CACHE_NAMES:
+        cache_file_name: str = get_cache_data_file(data_name, "msgpack")
+        write_file_atomically(
+            path.join(get_cache_path(config_path), cache_file_name),
+            lambda cache_file: cache_file.write(pack_data(data)),
+            binary=True,
+        )
+    else:
+        cache_file_name = get_cache_data_file(data_name)
+        write_file_atomically(
+            path.join(get_cache_path(config_path), cache_file_name),
+            lambda cache_file: json.dump(data, cache_file, cls=EnhancedJSONEncoder),
+        )
 
-    pattern: str = path.join(
-        config_path, "cache", f"nvim_diary_template_{data_name}_cache_*.json"
+    with cache_lock(config_path, "index"):
+        cache_index: Dict[str, Dict[str, Any]] = get_locked_cache_index(config_path)
+        old_file_name: Optional[str] = cache_index.get(data_name, {}).get("file")
+        cache_index.setdefault(data_name, {}).update(
+            {"file": cache_file_name, "created": t.time()}
+        )
+        write_cache_index(config_path, cache_index)
+
+        # Remove the old file, if the data was cached in a different format.
+        if old_file_name is not None and old_file_name != cache_file_name:
+            try:
+                remove(path.join(get_cache_path(config_path), old_file_name))
+            except FileNotFoundError:
+                pass
+
+
+def renew_cache(config_path: str, data_name: str) -> None:
+    """renew_cache
+
+    Mark an existing cache file as being up to date, without rewriting it.
+    """
+
+    MEMORY_CACHE.invalidate((config_path, data_name))
+
+    with cache_lock(config_path, "index"):
+        cache_index: Dict[str, Dict[str, Any]] = get_locked_cache_index(config_path)
+        cache_index[data_name]["created"] = t.time()
+        write_cache_index(config_path, cache_index)
+
+
+def get_cache_validators(config_path: str, data_name: str) -> Dict[str, str]:
+    """get_cache_validators
+
+    Get the stored validators for the given data, such as an ETag.
+    """
+
+    validators: Dict[str, str] = (
+        get_cache_index(config_path).get(data_name, {}).get("validators", {})
     )
 
-    makedirs(path.dirname(cache_file_name), exist_ok=True)
-    old_cache_files: List[str] = glob.glob(pattern)
+    return validators
+
 
-    with open(cache_file_name, "w") as cache_file:
-        json.dump(data, cache_file, cls=EnhancedJSONEncoder)
+def set_cache_validators(
+    config_path: str, validators: Dict[str, str], data_name: str
+) -> None:
+    """set_cache_validators
+
+    Store the validators for the given data, such as an ETag.
+    """
 
-    for old_cache_file in old_cache_files:
-        remove(old_cache_file)
+    with cache_lock(config_path, "index"):
+        cache_index: Dict[str, Dict[str, Any]] = get_locked_cache_index(config_path)
+        cache_index.setdefault(data_name, {})["validators"] = validators
+        write_cache_index(config_path, cache_index)
 
 
 def cache_valid(cache_set_time: datetime, cache_max_age: timedelta) -> bool:
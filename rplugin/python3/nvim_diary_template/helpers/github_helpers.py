@@ -0,0 +1,400 @@
+"""github_helpers
+
+Helpers to sync issues from GitHub, and to pick out and send the changes
+being uploaded to it.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from dateutil import tz
+
+from ..classes.github_issue_class import (
+    CommentBody,
+    GitHubIssue,
+    GitHubIssueComment,
+)
+from ..helpers.issue_helpers import (
+    check_markdown_style,
+    convert_utc_timezone,
+    get_latest_change,
+    get_latest_update,
+    group_comments_by_issue,
+    split_comment,
+)
+from ..utils.constants import ISSUE_COMMENT_WINDOW
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+def fetch_open_issues(
+    repo: Any, timezone: str
+) -> Tuple[List[GitHubIssue], Optional[datetime]]:
+    """fetch_open_issues
+
+    Fetch all the open issues, including all comments, along with the
+    latest update time of any of them.
+    """
+
+    issues: List[Any] = list(repo.get_issues(state="open"))
+
+    if not issues:
+        return [], None
+
+    # Rather than asking for the comments of every issue in turn, list
+    # every comment in the repo in one paginated request. Comments are
+    # always updated after the issue they are on was created, so the
+    # oldest open issue bounds how far back we need to look.
+    # That listing also has every comment on closed issues and pull requests
+    # in that time, so it is only used for recent issues. Older issues get
+    # their comments on their own, so one long lived issue doesn't mean
+    # paging through years of comments.
+    window_start: datetime = get_utc_now(issues[0].created_at) - ISSUE_COMMENT_WINDOW
+    recent_issues: List[Any] = [
+        issue for issue in issues if issue.created_at >= window_start
+    ]
+    comments_by_issue: Dict[int, List[Any]] = {}
+
+    if recent_issues:
+        oldest_issue: datetime = min(issue.created_at for issue in recent_issues)
+        comments_by_issue = group_comments_by_issue(
+            repo.get_issues_comments(
+                sort="created", direction="asc", since=oldest_issue
+            )
+        )
+
+    for issue in issues:
+        if issue.created_at < window_start:
+            comments_by_issue[issue.number] = list(issue.get_comments())
+
+    issue_list: List[GitHubIssue] = [
+        format_issue(issue, comments_by_issue.get(issue.number, []), timezone)
+        for issue in issues
+    ]
+
+    return issue_list, get_latest_change(issues, comments_by_issue)
+
+
+def get_utc_now(github_time: datetime) -> datetime:
+    """get_utc_now
+
+    Get the current time in UTC, in the same form as the given time from
+    GitHub, which may or may not have its timezone set.
+    """
+
+    utc_now: datetime = datetime.now(tz.tzutc())
+
+    if github_time.tzinfo is None:
+        return utc_now.replace(tzinfo=None)
+
+    return utc_now
+
+
+def fetch_issue_changes(
+    repo: Any, cached_issues: List[GitHubIssue], since: datetime, timezone: str
+) -> Tuple[List[GitHubIssue], Optional[datetime]]:
+    """fetch_issue_changes
+
+    Fetch the issues and comments that have changed since the given time,
+    and merge them into the cached issues. Issues that have been closed
+    are removed.
+    """
+
+    changed_issues: List[Any] = list(repo.get_issues(state="all", since=since))
+    changed_comments: Dict[int, List[Any]] = group_comments_by_issue(
+        repo.get_issues_comments(sort="created", direction="asc", since=since)
+    )
+
+    issues_by_number: Dict[int, GitHubIssue] = {
+        issue.number: issue for issue in cached_issues
+    }
+    new_issues: List[GitHubIssue] = []
+
+    for issue in changed_issues:
+        if issue.state == "closed":
+            issues_by_number.pop(issue.number, None)
+            continue
+
+        cached_issue: Optional[GitHubIssue] = issues_by_number.get(issue.number)
+        merged_comments: Optional[List[GitHubIssueComment]] = None
+
+        if cached_issue is not None:
+            merged_comments = merge_comments(
+                cached_issue.all_comments[1:],
+                changed_comments.get(issue.number, []),
+                timezone,
+            )
+
+        # If the changed comments can't be merged in, the comments for that
+        # issue need to be grabbed again.
+        if merged_comments is None:
+            updated_issue: GitHubIssue = format_issue(
+                issue, list(issue.get_comments()), timezone
+            )
+        else:
+            updated_issue = format_issue(issue, [], timezone)
+            updated_issue.all_comments.extend(merged_comments)
+
+        if cached_issue is None:
+            new_issues.append(updated_issue)
+        else:
+            issues_by_number[issue.number] = updated_issue
+
+    # Comments can change without the issue itself being updated, so pick
+    # up any of those for the issues we already have.
+    changed_issue_numbers: Set[int] = {issue.number for issue in changed_issues}
+
+    merge_comment_changes(
+        repo,
+        issues_by_number,
+        {
+            issue_number: comments
+            for issue_number, comments in changed_comments.items()
+            if issue_number not in changed_issue_numbers
+        },
+        timezone,
+    )
+
+    return (
+        [*new_issues, *issues_by_number.values()],
+        get_latest_change(changed_issues, changed_comments),
+    )
+
+
+def merge_comment_changes(
+    repo: Any,
+    issues_by_number: Dict[int, GitHubIssue],
+    changed_comments: Dict[int, List[Any]],
+    timezone: str,
+) -> None:
+    """merge_comment_changes
+
+    Merge the changed comments from GitHub into the cached issues they are
+    on, for issues that haven't changed themselves. If the comments can't
+    be merged, the whole issue is grabbed again.
+    """
+
+    for issue_number, comments in changed_comments.items():
+        if issue_number not in issues_by_number:
+            continue
+
+        cached_issue: GitHubIssue = issues_by_number[issue_number]
+        merged_comments: Optional[List[GitHubIssueComment]] = merge_comments(
+            cached_issue.all_comments[1:], comments, timezone
+        )
+
+        if merged_comments is not None:
+            cached_issue.all_comments[1:] = merged_comments
+            continue
+
+        github_issue: Any = repo.get_issue(issue_number)
+        issues_by_number[issue_number] = format_issue(
+            github_issue, list(github_issue.get_comments()), timezone
+        )
+
+
+def merge_comments(
+    cached_comments: List[GitHubIssueComment],
+    changed_comments: List[Any],
+    timezone: str,
+) -> Optional[List[GitHubIssueComment]]:
+    """merge_comments
+
+    Merge the changed comments from GitHub into the cached comments of an
+    issue, matching them by their ID. Comments that aren't cached are
+    added to the end. Returns None if the cached comments have no IDs, and
+    so can't be matched.
+    """
+
+    if any(comment.comment_id == 0 for comment in cached_comments):
+        return None
+
+    merged_comments: List[GitHubIssueComment] = list(cached_comments)
+    comment_positions: Dict[int, int] = {
+        comment.comment_id: index for index, comment in enumerate(merged_comments)
+    }
+
+    for new_comment in format_comments(changed_comments, timezone):
+        position: Optional[int] = comment_positions.get(new_comment.comment_id)
+
+        if position is None:
+            new_comment.number = len(merged_comments) + 1
+            merged_comments.append(new_comment)
+            continue
+
+        new_comment.number = merged_comments[position].number
+        merged_comments[position] = new_comment
+
+    return merged_comments
+
+
+def format_issue(issue: Any, comments: List[Any], timezone: str) -> GitHubIssue:
+    """format_issue
+
+    Format an issue and its comments into a GitHubIssue object.
+    The issue body is stored as the first comment.
+    """
+
+    initial_comment: GitHubIssueComment = GitHubIssueComment(
+        number=0,
+        body=CommentBody.from_lines(split_comment(issue.body)),
+        tags=[],
+        updated_at=convert_utc_timezone(issue.updated_at, timezone),
+    )
+
+    all_comments: List[GitHubIssueComment] = format_comments(comments, timezone)
+
+    return GitHubIssue(
+        number=issue.number,
+        complete=False,
+        title=issue.title,
+        all_comments=[initial_comment, *all_comments],
+        labels=[label.name for label in issue.labels],
+        metadata=[],
+    )
+
+
+def format_comments(comments: List[Any], timezone: str) -> List[GitHubIssueComment]:
+    """format_comments
+
+    Format all the comments that are passed into GitHubIssueComment
+    objects.
+    """
+
+    comment_objs: List[GitHubIssueComment] = []
+
+    current_comment: int = 1
+
+    for comment in comments:
+        comment_objs.append(
+            GitHubIssueComment(
+                number=current_comment,
+                body=CommentBody.from_lines(split_comment(comment.body)),
+                tags=[],
+                updated_at=convert_utc_timezone(comment.updated_at, timezone),
+                comment_id=comment.id,
+            )
+        )
+
+        current_comment += 1
+
+    return comment_objs
+
+
+def filter_comments(
+    issues: List[GitHubIssue], tag: str
+) -> Tuple[List[GitHubIssue], List[Dict[str, int]]]:
+    """filter_comments
+
+    Filter comments for uploading, by a specific tag.
+    """
+
+    comments_to_upload: List[GitHubIssue] = []
+    change_indexes: List[Dict[str, int]] = []
+
+    # For every issue, check the comments and check if the tags for that
+    # comment contain the target tag. If it does, setup an obj with some
+    # needed value as well as storing the index of the comment, so it can
+    # be updated later.
+    for issue_index, issue in enumerate(issues):
+        for comment_index, comment in enumerate(issue.all_comments):
+            if tag in comment.tags:
+                comment_lines: Sequence[str] = comment.body
+                processed_comment_lines: List[str] = [
+                    check_markdown_style(line, "github") for line in comment_lines
+                ]
+
+                processed_comment: GitHubIssueComment = GitHubIssueComment(
+                    number=comment.number,
+                    body=["\r\n".join(processed_comment_lines)],
+                    tags=comment.tags,
+                    updated_at=comment.updated_at,
+                    comment_id=comment.comment_id,
+                )
+
+                # Lets make an issue with 1 comment per issue, to simplify the code.
+                comments_to_upload.append(
+                    GitHubIssue(
+                        number=issue.number,
+                        title=issue.title,
+                        complete=issue.complete,
+                        labels=issue.labels,
+                        metadata=issue.metadata,
+                        all_comments=[processed_comment],
+                    )
+                )
+
+                change_indexes.append({"issue": issue_index, "comment": comment_index})
+
+    return comments_to_upload, change_indexes
+
+
+def filter_issues(
+    issues: List[GitHubIssue], tag: str
+) -> Tuple[List[GitHubIssue], List[int]]:
+    """filter_issues
+
+    Filter issues for uploading, by a specific tag.
+    """
+
+    issues_to_upload: List[GitHubIssue] = []
+    change_indexes: List[int] = []
+
+    # For every issue, check the metadata to see if it contains the target
+    # tag. If it does, setup an obj with some needed value as well as
+    # storing the index of the issue, so it can be updated later.
+    for index, issue in enumerate(issues):
+        if tag in issue.metadata:
+            comment: GitHubIssueComment = issue.all_comments[0]
+            processed_body: List[str] = [
+                check_markdown_style(line, "github") for line in comment.body
+            ]
+
+            # Here, we use the latest update time to ensure that the issues are in sync.
+            # Since the actual update time isn't needed for an issue update, this is why
+            # it is instead stored here.
+            body_comment: GitHubIssueComment = GitHubIssueComment(
+                number=comment.number,
+                body=["\r\n".join(processed_body)],
+                tags=comment.tags,
+                updated_at=get_latest_update(issue.all_comments),
+            )
+
+            issues_to_upload.append(
+                GitHubIssue(
+                    number=issue.number,
+                    title=issue.title,
+                    complete=False,
+                    labels=issue.labels,
+                    all_comments=[body_comment],
+                    metadata=issue.metadata,
+                )
+            )
+
+            change_indexes.append(index)
+
+    return issues_to_upload, change_indexes
+
+
+def run_concurrently(
+    function: Callable[[ItemT], ResultT],
+    items: List[ItemT],
+    max_workers: int,
+) -> List[ResultT]:
+    """run_concurrently
+
+    Run the given function for every item, with up to max_workers of them
+    being sent to GitHub at once. The results are returned
+    in the same order as the items.
+
+    The function must not use Neovim, since it is not thread safe.
+    """
+
+    if len(items) <= 1:
+        return [function(item) for item in items]
+
+    max_workers = max(1, min(max_workers, len(items)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(function, items))
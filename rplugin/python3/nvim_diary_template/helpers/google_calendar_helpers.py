@@ -2,12 +2,31 @@
 
 Simple helpers to deal with Google calendar, and the replies it sends.
 """
-from datetime import datetime
-from typing import Any, Dict, List, Union
-
-from dateutil import parser
+import re
+from datetime import date, datetime, time, tzinfo
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
+
+from dateutil import parser, tz
 
 from ..classes.calendar_event_class import CalendarEvent
+from ..utils.constants import FAST_DATE_TIME_REGEX, FAST_TIME_REGEX
+
+FAST_DATE_TIME_PATTERN: Pattern[str] = re.compile(FAST_DATE_TIME_REGEX)
+FAST_TIME_PATTERN: Pattern[str] = re.compile(FAST_TIME_REGEX)
 
 
 def convert_events(
@@ -40,15 +59,151 @@ def get_time(time_to_convert: str) -> datetime:
     Since the Google API response can either be a 'dateTime' or
     'date' object depending on if the event is timed, or the whole day,
     we need to parse and return the object differently for each.
+
+    The formats that the plugin and Google write are parsed directly, and
+    anything else is passed on to dateutil. Like dateutil, a time without a
+    date is taken to be for today.
+    """
+
+    date_time_match: Optional[Match[str]] = FAST_DATE_TIME_PATTERN.fullmatch(
+        time_to_convert
+    )
+    time_match: Optional[Match[str]] = (
+        FAST_TIME_PATTERN.fullmatch(time_to_convert)
+        if date_time_match is None
+        else None
+    )
+
+    try:
+        if date_time_match is not None:
+            return build_time(date_time_match)
+
+        if time_match is not None:
+            return datetime.combine(
+                date.today(), time(int(time_match[1]), int(time_match[2]))
+            )
+    except ValueError:
+        pass
+
+    return parse_time(time_to_convert, date.today())
+
+
+def build_time(date_time_match: Match[str]) -> datetime:
+    """build_time
+
+    Build the datetime for a match of the fast date and time regex.
+    The time zone is made in the same way as dateutil, such that the
+    result is the same as parsing the string with dateutil.
+    """
+
+    year, month, day, hour, minute, second, fraction, zone = date_time_match.groups()
+
+    time_zone: Optional[tzinfo] = None
+
+    if zone == "Z":
+        time_zone = tz.UTC
+    elif zone is not None:
+        offset: int = int(zone[1:3]) * 3600 + int(zone[4:6]) * 60
+        offset = offset if zone[0] == "+" else -offset
+        time_zone = tz.UTC if offset == 0 else tz.tzoffset(None, offset)
+
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        int(fraction.ljust(6, "0")) if fraction else 0,
+        tzinfo=time_zone,
+    )
+
+
+@lru_cache(maxsize=1024)
+def parse_time(time_to_convert: str, default_date: date) -> datetime:
+    """parse_time
+
+    Parse any other time with dateutil. The results are kept, along with the
+    date that missing parts are filled in from.
     """
 
-    parsed_datetime: datetime = parser.parse(time_to_convert)
+    parsed_datetime: datetime = parser.parse(
+        time_to_convert, default=datetime.combine(default_date, time())
+    )
 
     return parsed_datetime
 
 
+def get_pages(
+    list_method: Callable[..., Any],
+    first_page: Optional[Dict[str, Any]] = None,
+    **parameters: Any,
+) -> Iterator[Dict[str, Any]]:
+    """get_pages
+
+    Yield every page from a Google API list method, by following the
+    nextPageToken of each page. If the first page has already been fetched,
+    it can be passed in to carry on from there.
+    """
+
+    page: Dict[str, Any] = (
+        first_page if first_page is not None else list_method(**parameters).execute()
+    )
+
+    while True:
+        yield page
+
+        page_token: Optional[str] = page.get("nextPageToken")
+
+        if page_token is None:
+            return
+
+        page = list_method(pageToken=page_token, **parameters).execute()
+
+
+def get_paged_items(
+    list_method: Callable[..., Any],
+    first_page: Optional[Dict[str, Any]] = None,
+    **parameters: Any,
+) -> Iterator[Dict[str, Any]]:
+    """get_paged_items
+
+    Yield every item from a Google API list method, a page at a time.
+    """
+
+    for page in get_pages(list_method, first_page, **parameters):
+        yield from page.get("items", [])
+
+
+def get_event_list_parameters(
+    calendar_id: str,
+    page_size: int,
+    sync_token: Optional[str],
+    time_range: Tuple[str, str],
+) -> Dict[str, Any]:
+    """get_event_list_parameters
+
+    Get the parameters to list the events of a calendar. With a sync token,
+    only the events that have changed since that token are listed, otherwise
+    every event in the time range is.
+    """
+
+    parameters: Dict[str, Any] = {
+        "calendarId": calendar_id,
+        "singleEvents": True,
+        "maxResults": page_size,
+    }
+
+    if sync_token is not None:
+        parameters["syncToken"] = sync_token
+    else:
+        parameters["timeMin"], parameters["timeMax"] = time_range
+
+    return parameters
+
+
 def format_google_events(
-    events_list: List[Dict[str, Any]], diary_date: str
+    events_list: Iterable[Dict[str, Any]], diary_date: str, calendar_id: str = ""
 ) -> List[CalendarEvent]:
     """format_google_events
 
@@ -59,28 +214,85 @@ def format_google_events(
     filtered_events: List[CalendarEvent] = []
 
     for event in events_list:
-
-        try:
-            event_start = event["start"]["dateTime"]
-            event_end = event["end"]["dateTime"]
-        except KeyError:
-            event_start = event["start"]["date"]
-            event_end = event["end"]["date"]
-
-        event_date: str = str(get_time(event_start).date())
+        calendar_event: CalendarEvent = format_google_event(event, calendar_id)
 
         # If its an event not from today, then don't show it.
         # This is needed since it can return some late events somehow.
-        if event_date != diary_date:
+        if str(get_time(calendar_event.start).date()) != diary_date:
             continue
 
-        filtered_events.append(
-            CalendarEvent(name=event["summary"], start=event_start, end=event_end)
-        )
+        filtered_events.append(calendar_event)
 
     return filtered_events
 
 
+def group_google_events_by_date(
+    events_list: Iterable[Dict[str, Any]], calendar_id: str = ""
+) -> Dict[str, List[CalendarEvent]]:
+    """group_google_events_by_date
+
+    Formats a list of GCal events that cover many days, grouping them by the
+    date they start on.
+    """
+
+    grouped_events: Dict[str, List[CalendarEvent]] = {}
+
+    for event in events_list:
+        calendar_event: CalendarEvent = format_google_event(event, calendar_id)
+        event_date: str = str(get_time(calendar_event.start).date())
+
+        grouped_events.setdefault(event_date, []).append(calendar_event)
+
+    return grouped_events
+
+
+def format_google_event(event: Dict[str, Any], calendar_id: str = "") -> CalendarEvent:
+    """format_google_event
+
+    Formats a single GCal event down to the event name, and the start and end
+    date of the event.
+    """
+
+    try:
+        event_start = event["start"]["dateTime"]
+        event_end = event["end"]["dateTime"]
+    except KeyError:
+        event_start = event["start"]["date"]
+        event_end = event["end"]["date"]
+
+    return CalendarEvent(
+        name=event["summary"],
+        start=event_start,
+        end=event_end,
+        event_id=event.get("id", ""),
+        calendar_id=calendar_id,
+    )
+
+
+def apply_event_changes(
+    events: List[CalendarEvent],
+    changes: List[Dict[str, Any]],
+    diary_date: str,
+    calendar_id: str,
+) -> List[CalendarEvent]:
+    """apply_event_changes
+
+    Patch the events of a calendar with a set of changed events from Google.
+    Cancelled events are removed, and any other changed events replace the
+    existing version, if they are still on the given date.
+    """
+
+    changed_ids: Set[str] = {event["id"] for event in changes}
+    active_changes: List[Dict[str, Any]] = [
+        event for event in changes if event.get("status") != "cancelled"
+    ]
+
+    return [
+        *[event for event in events if event.event_id not in changed_ids],
+        *format_google_events(active_changes, diary_date, calendar_id),
+    ]
+
+
 def create_google_event(event: CalendarEvent, timezone: str) -> Dict[str, Any]:
     """create_google_event
 
@@ -91,9 +303,9 @@ def create_google_event(event: CalendarEvent, timezone: str) -> Dict[str, Any]:
         "summary": event.name,
         "start": {
             "timeZone": timezone,
-            "dateTime": parser.parse(event.start).isoformat(),
+            "dateTime": get_time(event.start).isoformat(),
         },
-        "end": {"timeZone": timezone, "dateTime": parser.parse(event.end).isoformat()},
+        "end": {"timeZone": timezone, "dateTime": get_time(event.end).isoformat()},
     }
 
 
@@ -108,17 +320,26 @@ def get_calendar_objects(
     careful usage.
     """
 
-    events_to_convert: List[Dict[str, Any]] = [
-        event for event in events if isinstance(event, dict)
-    ]
+    events_to_convert: List[Dict[str, Any]] = []
+    event_objects: List[CalendarEvent] = []
 
-    event_objects: List[CalendarEvent] = [
-        event for event in events if not isinstance(event, dict)
-    ]
+    # Packed caches unpack their items each time they are used, so only go
+    # through them once.
+    for event in events:
+        if isinstance(event, dict):
+            events_to_convert.append(event)
+        else:
+            event_objects.append(event)
 
     for event in events_to_convert:
         event_objects.append(
-            CalendarEvent(name=event["name"], start=event["start"], end=event["end"])
+            CalendarEvent(
+                name=event["name"],
+                start=event["start"],
+                end=event["end"],
+                event_id=event.get("event_id", ""),
+                calendar_id=event.get("calendar_id", ""),
+            )
         )
 
     return event_objects
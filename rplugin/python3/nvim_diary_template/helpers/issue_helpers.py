@@ -4,29 +4,22 @@ Simple helpers to deal with Github issues.
 """
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from dateutil import parser, tz
 from pynvim import Nvim
 
+from ..classes.diary_document_class import DiaryDocument
 from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
 from ..classes.plugin_options import PluginOptions
-from ..helpers.neovim_helpers import (
-    get_buffer_contents,
-    get_next_heading_of_level,
-    get_section_line,
-    set_line_content,
-)
+from ..helpers.neovim_helpers import get_buffer_document, set_line_content
 from ..utils.constants import (
     EMPTY_TODO,
     GITHUB_TODO,
     HEADING_4,
     HEADING_5,
-    ISSUE_COMMENT,
     ISSUE_HEADING,
-    ISSUE_START,
     SCHEDULE_HEADING,
-    SUBGROUP_HEADING,
     SUBGROUP_HEADING_LEVEL,
     TODO_IN_PROGRESS_REGEX,
     VIMWIKI_TODO,
@@ -41,9 +34,9 @@ def insert_edit_tag(nvim: Nvim, location: str) -> None:
 
     # Grab the indexes needed to find the issue we are in.
     current_line: int = nvim.current.window.cursor[0]
-    current_buffer: List[str] = get_buffer_contents(nvim)
-    issues_header_index: int = get_section_line(current_buffer, ISSUE_HEADING)
-    schedule_header_index: int = get_section_line(current_buffer, SCHEDULE_HEADING) - 1
+    document: DiaryDocument = get_buffer_document(nvim)
+    issues_header_index: int = document.section_line(ISSUE_HEADING)
+    schedule_header_index: int = document.section_line(SCHEDULE_HEADING) - 1
 
     inside_issues_section: bool = issues_header_index <= current_line <= schedule_header_index
 
@@ -51,37 +44,28 @@ def insert_edit_tag(nvim: Nvim, location: str) -> None:
     if not inside_issues_section:
         return
 
-    relevant_buffer: List[str] = current_buffer[issues_header_index:current_line]
-    line_index: int = -1
-
     if location == "issue":
-        target_line: str = ISSUE_START
+        target_lines: List[int] = document.issue_starts
     elif location == "comment":
-        target_line = ISSUE_COMMENT
+        target_lines = document.comment_headers
     else:
         raise ValueError(f"{location} is not a recognised target.")
 
-    # Search the buffer backwards and find the start of the current target, to
-    # get its line index.
-    for index in range(len(relevant_buffer) - 1, 0, -1):
-        line: str = relevant_buffer[index]
-        if re.findall(target_line, line):
-            line_index = index
-
-            break
+    # Find the start of the current target, above the cursor, to get its line
+    # index.
+    line_index: int = document.last_between(
+        target_lines, issues_header_index + 1, current_line
+    )
 
     # If we didn't find the target, return since we can't update it.
     if line_index == -1:
         return
 
     # If we did find a line, we want to append +edit to the end, and set it.
-    # We need to update the line index to be relative to the full buffer.
-    updated_line: str = relevant_buffer[line_index]
+    updated_line: str = document.lines[line_index]
     updated_line += " +edit"
 
-    insert_index: int = issues_header_index + line_index + 1
-
-    set_line_content(nvim, [updated_line], line_index=insert_index, line_offset=1)
+    set_line_content(nvim, [updated_line], line_index=line_index + 1, line_offset=1)
 
 
 def insert_new_issue(nvim: Nvim, options: PluginOptions) -> None:
@@ -94,17 +78,18 @@ def insert_new_issue(nvim: Nvim, options: PluginOptions) -> None:
 
     # Grab the indexes needed to find the issue we are in.
     current_cursor_pos: int = nvim.current.window.cursor[0]
-    current_buffer: List[str] = get_buffer_contents(nvim)
+    document: DiaryDocument = get_buffer_document(nvim)
 
-    issue_heading: int = get_section_line(current_buffer, ISSUE_HEADING)
-    schedule_heading: int = get_section_line(current_buffer, SCHEDULE_HEADING)
+    issue_heading: int = document.section_line(ISSUE_HEADING)
+    schedule_heading: int = document.section_line(SCHEDULE_HEADING)
 
     if current_cursor_pos < issue_heading:
         new_line_number = schedule_heading - 1
     else:
-        offset: int = get_next_heading_of_level(
-            current_buffer[current_cursor_pos:], SUBGROUP_HEADING_LEVEL
+        next_heading: int = document.next_heading_of_level(
+            current_cursor_pos, SUBGROUP_HEADING_LEVEL
         )
+        offset: int = next_heading - current_cursor_pos if next_heading != -1 else -1
         new_line_number = current_cursor_pos + offset
 
     default_labels: str = "".join([f" +label:{l}" for l in options.default_labels])
@@ -130,9 +115,9 @@ def insert_new_comment(nvim: Nvim) -> None:
 
     # Grab the indexes needed to find the issue we are in.
     current_line: int = nvim.current.window.cursor[0]
-    current_buffer: List[str] = get_buffer_contents(nvim)
-    issues_header_index: int = get_section_line(current_buffer, ISSUE_HEADING)
-    schedule_header_index: int = get_section_line(current_buffer, SCHEDULE_HEADING) - 1
+    document: DiaryDocument = get_buffer_document(nvim)
+    issues_header_index: int = document.section_line(ISSUE_HEADING)
+    schedule_header_index: int = document.section_line(SCHEDULE_HEADING) - 1
 
     inside_issues_section: bool = issues_header_index <= current_line <= schedule_header_index
 
@@ -140,39 +125,30 @@ def insert_new_comment(nvim: Nvim) -> None:
     if not inside_issues_section:
         return
 
-    relevant_buffer: List[str] = current_buffer[current_line:schedule_header_index]
-    new_line_number: int = -1
-
-    # Search the buffer forwards and find the start of the next issue, or the
-    # sub-group heading to insert before it. Then, find the last comment number
-    # and increment it.
-    for index, line in enumerate(relevant_buffer):
-        if re.findall(ISSUE_START, line) or re.findall(SUBGROUP_HEADING, line):
-            new_line_number = index
-
-            break
+    # Find the start of the next issue, or the sub-group heading, below the
+    # cursor to insert before it. Then, find the last comment number and
+    # increment it.
+    next_lines: List[int] = [
+        document.first_between(target_lines, current_line, schedule_header_index)
+        for target_lines in (document.issue_starts, document.subgroup_headings)
+    ]
+    next_lines = [line for line in next_lines if line != -1]
 
-    # If we didn't change the new line number, we must be in the last comment.
+    # If we didn't find a next line, we must be in the last comment.
     # Instead, just place above the next section heading.
-    if new_line_number != -1:
-        relative_line: int = current_line + new_line_number
-    else:
-        relative_line = schedule_header_index
-
-    relevant_buffer = current_buffer[issues_header_index:relative_line]
-    comment_number: int = -1
+    relative_line: int = min(next_lines) if next_lines else schedule_header_index
 
     # Search back to find the latest comment number, so we can increment it.
-    for line in reversed(relevant_buffer):
-        if re.findall(ISSUE_COMMENT, line):
-            comment_number = int(re.findall(r"\d+", line)[0])
-
-            break
+    comment_line: int = document.last_between(
+        document.comment_headers, issues_header_index, relative_line
+    )
 
     # If we didn't find a comment number to use, we should probably quit.
-    if comment_number == -1:
+    if comment_line == -1:
         return
 
+    comment_number: int = int(re.findall(r"\d+", document.lines[comment_line])[0])
+
     # Add a new issue comment line, and set the line, before moving the cursor
     # there.
     header_line: str = (
@@ -194,9 +170,9 @@ def toggle_issue_completion(nvim: Nvim) -> None:
 
     # Grab the indexes needed to find the issue we are in.
     current_line: int = nvim.current.window.cursor[0]
-    current_buffer: List[str] = get_buffer_contents(nvim)
-    issues_header_index: int = get_section_line(current_buffer, ISSUE_HEADING)
-    schedule_header_index: int = get_section_line(current_buffer, SCHEDULE_HEADING) - 1
+    document: DiaryDocument = get_buffer_document(nvim)
+    issues_header_index: int = document.section_line(ISSUE_HEADING)
+    schedule_header_index: int = document.section_line(SCHEDULE_HEADING) - 1
 
     inside_issues_section: bool = issues_header_index <= current_line <= schedule_header_index
 
@@ -204,36 +180,25 @@ def toggle_issue_completion(nvim: Nvim) -> None:
     if not inside_issues_section:
         return
 
-    relevant_buffer: List[str] = current_buffer[issues_header_index:current_line]
-    line_index: int = -1
-
-    target_line: str = ISSUE_START
-
-    # Search the buffer backwards and find the start of the current issue, to
-    # get its line index.
-    for index in range(len(relevant_buffer) - 1, 0, -1):
-        line: str = relevant_buffer[index]
-        if re.findall(target_line, line):
-            line_index = index
-
-            break
+    # Find the start of the current issue, above the cursor, to get its line
+    # index.
+    line_index: int = document.last_between(
+        document.issue_starts, issues_header_index + 1, current_line
+    )
 
     # If we didn't find the target, return since we can't update it.
     if line_index == -1:
         return
 
     # If we did find an issue, we want to toggle the completion status.
-    # We need to update the line index to be relative to the full buffer.
-    current_issue: str = relevant_buffer[line_index]
+    current_issue: str = document.lines[line_index]
 
     if re.findall(re.escape(EMPTY_TODO), current_issue):
         updated_line: str = current_issue.replace(EMPTY_TODO, VIMWIKI_TODO)
     elif re.findall(re.escape(VIMWIKI_TODO), current_issue):
         updated_line = current_issue.replace(VIMWIKI_TODO, EMPTY_TODO)
 
-    insert_index: int = issues_header_index + line_index + 1
-
-    set_line_content(nvim, [updated_line], line_index=insert_index, line_offset=1)
+    set_line_content(nvim, [updated_line], line_index=line_index + 1, line_offset=1)
 
 
 def check_markdown_style(line: str, desired_style: str) -> str:
@@ -381,13 +346,16 @@ def get_github_objects(
     careful usage.
     """
 
-    issues_to_convert: List[Dict[str, Any]] = [
-        issue for issue in issues if isinstance(issue, dict)
-    ]
+    issues_to_convert: List[Dict[str, Any]] = []
+    issue_objects: List[GitHubIssue] = []
 
-    issue_objects: List[GitHubIssue] = [
-        issue for issue in issues if not isinstance(issue, dict)
-    ]
+    # Packed caches unpack their items each time they are used, so only go
+    # through them once.
+    for issue in issues:
+        if isinstance(issue, dict):
+            issues_to_convert.append(issue)
+        else:
+            issue_objects.append(issue)
 
     for issue in issues_to_convert:
         current_comments: List[GitHubIssueComment] = []
@@ -441,3 +409,37 @@ def get_issue_index(issues: List[GitHubIssue], target_number: int) -> Optional[i
             target_index = index
 
     return target_index
+
+
+def group_comments_by_issue(comments: Iterable[Any]) -> Dict[int, List[Any]]:
+    """group_comments_by_issue
+
+    Group a repo-wide listing of comments by the issue they belong to.
+    The order of the comments is kept, so each issue gets its comments in
+    the order they were returned.
+    """
+
+    grouped_comments: Dict[int, List[Any]] = {}
+
+    for comment in comments:
+        issue_number: int = int(comment.issue_url.rsplit("/", 1)[-1])
+        grouped_comments.setdefault(issue_number, []).append(comment)
+
+    return grouped_comments
+
+
+def get_latest_change(
+    issues: List[Any], comments: Dict[int, List[Any]]
+) -> Optional[datetime]:
+    """get_latest_change
+
+    Get the latest update time of the given GitHub issues and comments, or
+    None if there are none.
+    """
+
+    update_times: List[datetime] = [issue.updated_at for issue in issues]
+
+    for issue_comments in comments.values():
+        update_times.extend(comment.updated_at for comment in issue_comments)
+
+    return max(update_times, default=None)
@@ -4,10 +4,19 @@ Simple helpers to help interfacing with NeoVim.
 """
 
 import re
+import threading
 from os import path
-from typing import List, Iterable
+from typing import Dict, List, Iterable, Optional, Tuple
 
 from pynvim import Nvim
+from pynvim.api import NvimError
+
+from ..classes.buffer_mirror_class import BufferMirror
+from ..classes.diary_document_class import DiaryDocument
+from ..helpers.diff_helpers import get_line_hunks
+
+# The copies of the attached buffers, by buffer number.
+BUFFER_MIRRORS: Dict[int, BufferMirror] = {}
 
 
 def is_buffer_empty(nvim: Nvim) -> bool:
@@ -23,15 +32,169 @@ def get_buffer_contents(nvim: Nvim) -> List[str]:
     """get_buffer_contents
 
     Get the contents of the current buffer.
+    If the buffer is attached, this is a copy of the lines of its mirror.
     """
 
     buffer_number: int = nvim.current.buffer.number
 
+    if buffer_number in BUFFER_MIRRORS:
+        return list(get_buffer_document(nvim).lines)
+
     buffer_contents: List[str] = nvim.api.buf_get_lines(buffer_number, 0, -1, True)
 
     return buffer_contents
 
 
+def set_lines_from_diff(
+    nvim: Nvim,
+    old_lines: List[str],
+    new_lines: List[str],
+    start_line: int,
+    strict_indexing: bool = True,
+) -> None:
+    """set_lines_from_diff
+
+    Replace the old lines of the current buffer, which start at the given line,
+    with the new lines. Only the hunks that differ are set, in one atomic call,
+    so any unchanged lines are left alone along with their folds and marks.
+    """
+
+    buffer_number: int = nvim.current.buffer.number
+
+    # Set the hunks from the bottom up, so the line numbers of the hunks above
+    # are not moved by the ones below.
+    calls: List[List[object]] = [
+        [
+            "nvim_buf_set_lines",
+            [
+                buffer_number,
+                start_line + old_start,
+                start_line + old_end,
+                strict_indexing,
+                new_lines[new_start:new_end],
+            ],
+        ]
+        for old_start, old_end, new_start, new_end in reversed(
+            get_line_hunks(old_lines, new_lines)
+        )
+    ]
+
+    if not calls:
+        return
+
+    error: Optional[List[object]] = nvim.api.call_atomic(calls)[1]
+
+    if error is not None:
+        raise NvimError(error[2])
+
+
+def get_buffer_document(nvim: Nvim) -> DiaryDocument:
+    """get_buffer_document
+
+    Get an index of the current buffer.
+
+    If the buffer is attached, and its mirror is up to date, the index of the
+    mirror is used, so only the changedtick needs to be fetched. Otherwise,
+    the whole buffer is fetched, and the mirror reset to match it.
+    """
+
+    buffer_number: int = nvim.current.buffer.number
+    mirror: Optional[BufferMirror] = BUFFER_MIRRORS.get(buffer_number)
+
+    if mirror is None:
+        return DiaryDocument(nvim.api.buf_get_lines(buffer_number, 0, -1, True))
+
+    if not mirror.is_current(nvim.api.buf_get_changedtick(buffer_number)):
+        mirror.reset(*fetch_buffer(nvim, buffer_number))
+
+    return mirror.document
+
+
+def fetch_buffer(nvim: Nvim, buffer_number: int) -> Tuple[List[str], int]:
+    """fetch_buffer
+
+    Get the lines of the given buffer, along with the changedtick they are
+    from. Both are fetched in one atomic call, so they always match.
+    """
+
+    results, error = nvim.api.call_atomic(
+        [
+            ["nvim_buf_get_lines", [buffer_number, 0, -1, True]],
+            ["nvim_buf_get_changedtick", [buffer_number]],
+        ]
+    )
+
+    if error is not None:
+        raise NvimError(error[2])
+
+    lines: List[str] = results[0]
+    changedtick: int = results[1]
+
+    return lines, changedtick
+
+
+def attach_buffer(nvim: Nvim) -> None:
+    """attach_buffer
+
+    Attach to the current buffer, if it isn't already, so that a mirror of it
+    can be kept up to date from the line events NeoVim sends for it.
+
+    If the buffer can't be attached to, it is fetched for each command instead.
+    """
+
+    buffer_number: int = nvim.current.buffer.number
+
+    if buffer_number in BUFFER_MIRRORS:
+        return
+
+    try:
+        if not nvim.api.buf_attach(buffer_number, False, {}):
+            return
+    except NvimError:
+        return
+
+    BUFFER_MIRRORS[buffer_number] = BufferMirror(*fetch_buffer(nvim, buffer_number))
+
+
+def detach_buffer(buffer_number: int) -> None:
+    """detach_buffer
+
+    Drop the mirror of a buffer, once NeoVim has detached from it.
+    """
+
+    BUFFER_MIRRORS.pop(buffer_number, None)
+
+
+def update_buffer_mirror(
+    buffer_number: int,
+    changedtick: Optional[int],
+    first_line: int,
+    last_line: int,
+    line_data: List[str],
+) -> None:
+    """update_buffer_mirror
+
+    Apply a line event from NeoVim to the mirror of the given buffer.
+    """
+
+    mirror: Optional[BufferMirror] = BUFFER_MIRRORS.get(buffer_number)
+
+    if mirror is not None:
+        mirror.apply_lines_event(changedtick, first_line, last_line, line_data)
+
+
+def update_buffer_mirror_changedtick(buffer_number: int, changedtick: int) -> None:
+    """update_buffer_mirror_changedtick
+
+    Apply a changedtick event from NeoVim to the mirror of the given buffer.
+    """
+
+    mirror: Optional[BufferMirror] = BUFFER_MIRRORS.get(buffer_number)
+
+    if mirror is not None:
+        mirror.apply_changedtick_event(changedtick)
+
+
 def set_buffer_contents(nvim: Nvim, data: List[str]) -> None:
     """set_buffer_contents
 
@@ -113,11 +276,33 @@ def buffered_info_message(nvim: Nvim, message: str) -> None:
     A helper function to return an info message to the user.
     This is buffered, so this will not print anything until a final
     newline (\n) is sent.
+
+    Messages from any thread but the main one are passed over to the main
+    thread to be written, as NeoVim can only be called from there.
     """
 
+    if threading.current_thread() is not threading.main_thread():
+        nvim.async_call(nvim.out_write, f"{message}")
+        return
+
     nvim.out_write(f"{message}")
 
 
+def buffered_error_message(nvim: Nvim, message: str) -> None:
+    """buffered_error_message
+
+    A helper function to return an error message to the user.
+    As with info messages, this is buffered until a final newline, and is
+    passed over to the main thread if sent from any other thread.
+    """
+
+    if threading.current_thread() is not threading.main_thread():
+        nvim.async_call(nvim.err_write, f"{message}")
+        return
+
+    nvim.err_write(f"{message}")
+
+
 def get_diary_date(nvim: Nvim) -> str:
     """get_diary_date
 
@@ -1,14 +1,16 @@
 # pylint: disable=missing-docstring, keyword-arg-before-vararg, W0201
 from datetime import date
-from typing import Any, List
+from typing import Any, Callable, List, Optional
 
 import pynvim
 from dateutil import parser
 
+from .classes.async_command_class import AsyncCommand, AsyncCommandRunner
 from .classes.calendar_event_class import CalendarEvent
 from .classes.github_issue_class import GitHubIssue
 from .classes.nvim_github_class import SimpleNvimGithub
 from .classes.nvim_google_cal_class import SimpleNvimGoogleCal
+from .classes.diary_document_class import DiaryDocument
 from .classes.plugin_options import PluginOptions
 from .helpers.issue_helpers import (
     insert_edit_tag,
@@ -17,9 +19,21 @@ from .helpers.issue_helpers import (
     toggle_issue_completion,
 )
 from .helpers.markdown_helpers import format_markdown_events, sort_markdown_events
-from .helpers.neovim_helpers import get_diary_date
+from .helpers.neovim_helpers import (
+    attach_buffer,
+    detach_buffer,
+    get_buffer_document,
+    get_diary_date,
+    is_buffer_empty,
+    update_buffer_mirror,
+    update_buffer_mirror_changedtick,
+)
 from .utils.constants import ISO_FORMAT
-from .utils.make_issues import remove_tag_from_issues, set_issues_from_issues_list
+from .utils.make_issues import (
+    get_issues_section_range,
+    remove_tag_from_issues,
+    set_issues_from_issues_list,
+)
 from .utils.make_markdown_file import make_diary
 from .utils.make_schedule import set_schedule_from_events_list
 from .utils.parse_markdown import (
@@ -30,12 +44,17 @@ from .utils.parse_markdown import (
     remove_events_not_from_today,
 )
 
+RETAG_WARNING: str = (
+    "Remove the tags from anything that was uploaded before uploading again."
+)
+
 
 @pynvim.plugin
 class DiaryTemplatePlugin:
     def __init__(self, nvim: pynvim.Nvim) -> None:
         self._nvim: pynvim.Nvim = nvim
         self._fully_setup: bool = False
+        self._command_runner: AsyncCommandRunner = AsyncCommandRunner(nvim)
 
     @pynvim.function("DiaryOptionsInit", sync=False)
     def check_options(self, *_: List[str]) -> None:
@@ -47,8 +66,21 @@ class DiaryTemplatePlugin:
             self._github_service: SimpleNvimGithub = SimpleNvimGithub(
                 self._nvim, self.options
             )
+
+            # Caches can be refreshed in the background, so any open diary is
+            # updated once the new data is in, back on the main thread.
+            self._gcal_service.refresh.callback = lambda: self._nvim.async_call(
+                self._refresh_events
+            )
+            self._github_service.refresh.callback = lambda: self._nvim.async_call(
+                self._refresh_issues
+            )
             self._fully_setup = True
 
+        # Keep a mirror of each diary, so commands don't need to fetch it.
+        if get_diary_date(self._nvim) != "":
+            attach_buffer(self._nvim)
+
     @pynvim.function("DiaryInit", sync=False)
     def init_diary(self, *_: List[str]) -> None:
         self.check_options()
@@ -72,34 +104,58 @@ class DiaryTemplatePlugin:
         markdown_events: List[CalendarEvent] = parse_markdown_file_for_events(
             self._nvim, ISO_FORMAT
         )
-
         buffer_date: date = parser.parse(get_diary_date(self._nvim)).date()
-        self._gcal_service.upload_to_calendar(markdown_events, buffer_date)
 
-        remove_events_not_from_today(self._nvim)
-        format_markdown_events(self._nvim)
+        self._run_command(
+            "DiaryUploadCalendar",
+            lambda _: self._gcal_service.upload_to_calendar(
+                markdown_events, buffer_date
+            ),
+            self._tidy_uploaded_events,
+            discard_on_cancel=False,
+        )
 
     @pynvim.function("DiaryGetCalendar", sync=True)
     def grab_from_calendar(self, *_: List[str]) -> None:
         buffer_date: date = parser.parse(get_diary_date(self._nvim)).date()
 
+        self._run_command(
+            "DiaryGetCalendar",
+            lambda _: self._gcal_service.get_events_for_date(buffer_date),
+            self._set_calendar_events,
+        )
+
+    @pynvim.function("DiaryUpdateCalendar", sync=True)
+    def update_calendar(self, *_: List[str]) -> None:
         markdown_events: List[CalendarEvent] = parse_markdown_file_for_events(
             self._nvim, ISO_FORMAT
         )
-        cal_events: List[CalendarEvent] = self._gcal_service.get_events_for_date(
-            buffer_date
-        )
+        buffer_date: date = parser.parse(get_diary_date(self._nvim)).date()
 
-        combined_events: List[CalendarEvent] = combine_events(
-            markdown_events, cal_events
-        )
-        set_schedule_from_events_list(self._nvim, combined_events, False)
-        self.sort_calendar()
+        def upload_and_get_events(
+            command: AsyncCommand,
+        ) -> Optional[List[CalendarEvent]]:
+            self._gcal_service.upload_to_calendar(markdown_events, buffer_date)
 
-    @pynvim.function("DiaryUpdateCalendar", sync=True)
-    def update_calendar(self, *_: List[str]) -> None:
-        self.upload_to_calendar()
-        self.grab_from_calendar()
+            if command.cancelled:
+                return None
+
+            return self._gcal_service.get_events_for_date(buffer_date)
+
+        def set_events(
+            cal_events: Optional[List[CalendarEvent]], buffer_changed: bool
+        ) -> None:
+            self._tidy_uploaded_events()
+
+            if cal_events is not None:
+                self._set_calendar_events(cal_events, buffer_changed)
+
+        self._run_command(
+            "DiaryUpdateCalendar",
+            upload_and_get_events,
+            set_events,
+            discard_on_cancel=False,
+        )
 
     @pynvim.function("DiarySortCalendar", sync=True)
     def sort_calendar(self, *_: List[str]) -> None:
@@ -107,15 +163,12 @@ class DiaryTemplatePlugin:
 
     @pynvim.function("DiaryGetIssues", sync=True)
     def get_issues(self, *_: List[str]) -> None:
-        markdown_issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim)
-        github_issues: List[GitHubIssue] = self._github_service.get_all_open_issues()
-
-        combined_issues: List[GitHubIssue] = combine_issues(
-            self._nvim, markdown_issues, github_issues
+        self._run_command(
+            "DiaryGetIssues",
+            lambda _: self._github_service.get_all_open_issues(),
+            self._set_github_issues,
         )
 
-        set_issues_from_issues_list(self._nvim, self.options, combined_issues, True)
-
     @pynvim.function("DiarySortIssues", sync=True)
     def sort_issues(self, *_: List[str]) -> None:
         markdown_issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim)
@@ -138,84 +191,207 @@ class DiaryTemplatePlugin:
         insert_edit_tag(self._nvim, "issue")
 
     @pynvim.function("DiaryUploadNew", sync=True)
-    def upload_new_issues(self, buffered: bool = False) -> None:
-        issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim)
+    def upload_new_issues(self, *_: List[str]) -> None:
+        self._upload_issues("DiaryUploadNew", [self._upload_new])
 
-        issues, ignore_list = self._github_service.upload_issues(issues, "new")
-        issues = remove_tag_from_issues(issues, "new", "issues", ignore_list)
+    @pynvim.function("DiaryUploadEdits", sync=True)
+    def upload_edited_issues(self, *_: List[str]) -> None:
+        self._upload_issues("DiaryUploadEdits", [self._upload_edits])
 
-        issues, comment_ignore_list = self._github_service.upload_comments(
-            issues, "new"
+    @pynvim.function("DiaryCompleteIssue", sync=True)
+    def toggle_completion(self, *_: List[str]) -> None:
+        toggle_issue_completion(self._nvim)
+
+    @pynvim.function("DiaryUploadCompletion", sync=True)
+    def upload_issue_completions(self, *_: List[str]) -> None:
+        self._upload_issues("DiaryUploadCompletion", [self._upload_completions])
+
+    @pynvim.function("DiaryUploadIssues", sync=True)
+    def upload_all_issues(self, *_: List[str]) -> None:
+        # Run all the uploads as a single pass, such that the issues can be
+        # reused between them.
+        self._upload_issues(
+            "DiaryUploadIssues",
+            [self._upload_new, self._upload_edits, self._upload_completions],
         )
-        issues_without_new_tag: List[GitHubIssue] = remove_tag_from_issues(
-            issues, "new", "comments", comment_ignore_list
+
+    @pynvim.function("DiaryCancel", sync=True)
+    def cancel_command(self, *_: List[str]) -> None:
+        self._command_runner.cancel()
+
+    @pynvim.function("DiarySwapGroupSorting", sync=True)
+    def swap_group_sorting(self, *_: List[str]) -> None:
+        def rotate(input_list: List[Any], pivot: int) -> List[Any]:
+            return input_list[pivot:] + input_list[:pivot]
+
+        self.options.issue_groups = rotate(self.options.issue_groups, 1)
+        self.sort_issues()
+
+    @pynvim.rpc_export("nvim_buf_lines_event", sync=False)
+    def _on_buffer_lines(
+        self,
+        buffer: pynvim.api.Buffer,
+        changedtick: Optional[int],
+        first_line: int,
+        last_line: int,
+        line_data: List[str],
+        *_: Any,
+    ) -> None:
+        update_buffer_mirror(
+            buffer.number, changedtick, first_line, last_line, line_data
         )
 
-        set_issues_from_issues_list(
-            self._nvim,
-            self.options,
-            issues_without_new_tag,
-            self.options.sort_issues_on_upload,
+    @pynvim.rpc_export("nvim_buf_changedtick_event", sync=False)
+    def _on_buffer_changedtick(
+        self, buffer: pynvim.api.Buffer, changedtick: int, *_: Any
+    ) -> None:
+        update_buffer_mirror_changedtick(buffer.number, changedtick)
+
+    @pynvim.rpc_export("nvim_buf_detach_event", sync=False)
+    def _on_buffer_detach(self, buffer: pynvim.api.Buffer, *_: Any) -> None:
+        detach_buffer(buffer.number)
+
+    def _run_command(
+        self,
+        name: str,
+        work: Callable[[AsyncCommand], Any],
+        apply: Callable[[Any, bool], None],
+        discard_on_cancel: bool = True,
+        unapplied_warning: str = "",
+    ) -> None:
+        # The work is done on a worker thread, unless that is turned off, in
+        # which case the whole command is run here, blocking NeoVim.
+        if self.options.async_commands:
+            self._command_runner.run(
+                name, work, apply, discard_on_cancel, unapplied_warning
+            )
+            return
+
+        apply(work(AsyncCommand(self._nvim, name)), False)
+
+    def _set_calendar_events(self, cal_events: List[CalendarEvent], *_: bool) -> None:
+        # The buffer is read again here, rather than when the command was
+        # started, so any changes made to it since are kept.
+        markdown_events: List[CalendarEvent] = parse_markdown_file_for_events(
+            self._nvim, ISO_FORMAT
         )
 
-        if not buffered:
-            self.flush_messages()
+        combined_events: List[CalendarEvent] = combine_events(
+            markdown_events, cal_events
+        )
+        set_schedule_from_events_list(self._nvim, combined_events, False)
+        self.sort_calendar()
 
-    @pynvim.function("DiaryUploadEdits", sync=True)
-    def upload_edited_issues(self, buffered: bool = False) -> None:
-        issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim)
+    def _tidy_uploaded_events(self, *_: Any) -> None:
+        remove_events_not_from_today(self._nvim)
+        format_markdown_events(self._nvim)
 
-        issues, ignore_list = self._github_service.update_comments(issues, "edit")
-        issues = remove_tag_from_issues(issues, "edit", "comments", ignore_list)
+    def _set_github_issues(self, github_issues: List[GitHubIssue], *_: bool) -> None:
+        # As with the events, the buffer is read again once the issues are in.
+        markdown_issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim)
 
-        issues, issue_ignore_list = self._github_service.update_issues(issues, "edit")
-        issues_without_edit_tag: List[GitHubIssue] = remove_tag_from_issues(
-            issues, "edit", "issues", issue_ignore_list
+        combined_issues: List[GitHubIssue] = combine_issues(
+            self._nvim, markdown_issues, github_issues
         )
 
-        set_issues_from_issues_list(
-            self._nvim,
-            self.options,
-            issues_without_edit_tag,
-            self.options.sort_issues_on_upload,
+        set_issues_from_issues_list(self._nvim, self.options, combined_issues, True)
+
+    def _upload_issues(
+        self,
+        name: str,
+        upload_steps: List[Callable[[List[GitHubIssue]], List[GitHubIssue]]],
+    ) -> None:
+        document: DiaryDocument = get_buffer_document(self._nvim)
+        issues_start, issues_end = get_issues_section_range(document)
+
+        # Keep the issues section as it was when read, such that any changes
+        # made to it during the upload can be merged with the uploaded issues.
+        base_lines: List[str] = document.lines[issues_start:issues_end]
+        issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim, document)
+
+        def upload(command: AsyncCommand) -> List[GitHubIssue]:
+            uploaded_issues: List[GitHubIssue] = issues
+
+            with self._github_service.upload_pass():
+                for upload_step in upload_steps:
+                    if command.cancelled:
+                        break
+
+                    uploaded_issues = upload_step(uploaded_issues)
+
+            return uploaded_issues
+
+        def set_uploaded_issues(uploaded_issues: List[GitHubIssue], *_: bool) -> None:
+            issues_set: bool = set_issues_from_issues_list(
+                self._nvim,
+                self.options,
+                uploaded_issues,
+                self.options.sort_issues_on_upload,
+                base_lines,
+            )
+
+            self._flush_messages()
+
+            if not issues_set:
+                self._nvim.err_write(
+                    f"{name}: The issues were edited in the same place as the "
+                    "uploaded changes, so the edits were kept instead. "
+                    f"{RETAG_WARNING}\n"
+                )
+
+        # Whatever was uploaded before a cancel is still set, so the tags of
+        # those issues and comments are removed. If the diary was swapped out,
+        # they can't be, so the user is told to remove them.
+        self._run_command(
+            name,
+            upload,
+            set_uploaded_issues,
+            discard_on_cancel=False,
+            unapplied_warning=RETAG_WARNING,
         )
 
-        if not buffered:
-            self.flush_messages()
+    def _upload_new(self, issues: List[GitHubIssue]) -> List[GitHubIssue]:
+        issues, ignore_list = self._github_service.upload_issues(issues, "new")
+        issues = remove_tag_from_issues(issues, "new", "issues", ignore_list)
 
-    @pynvim.function("DiaryCompleteIssue", sync=True)
-    def toggle_completion(self, *_: List[str]) -> None:
-        toggle_issue_completion(self._nvim)
+        issues, comment_ignore_list = self._github_service.upload_comments(
+            issues, "new"
+        )
 
-    @pynvim.function("DiaryUploadCompletion", sync=True)
-    def upload_issue_completions(self, buffered: bool = False) -> None:
-        issues: List[GitHubIssue] = parse_markdown_file_for_issues(self._nvim)
+        return remove_tag_from_issues(issues, "new", "comments", comment_ignore_list)
+
+    def _upload_edits(self, issues: List[GitHubIssue]) -> List[GitHubIssue]:
+        issues, ignore_list = self._github_service.update_comments(issues, "edit")
+        issues = remove_tag_from_issues(issues, "edit", "comments", ignore_list)
+
+        issues, issue_ignore_list = self._github_service.update_issues(issues, "edit")
+
+        return remove_tag_from_issues(issues, "edit", "issues", issue_ignore_list)
+
+    def _upload_completions(self, issues: List[GitHubIssue]) -> List[GitHubIssue]:
+        # Nothing changes here, but the issues are still set again, to sort them.
         self._github_service.complete_issues(issues)
 
-        # Despite no changes happening here, we want to set the issues again to
-        # sort them.
-        set_issues_from_issues_list(
-            self._nvim, self.options, issues, self.options.sort_issues_on_upload
-        )
+        return issues
 
-        if not buffered:
-            self.flush_messages()
+    def _refresh_events(self) -> None:
+        diary_date: str = get_diary_date(self._nvim)
 
-    @pynvim.function("DiaryUploadIssues", sync=True)
-    def upload_all_issues(self, *_: List[str]) -> None:
-        self.upload_new_issues(True)
-        self.upload_edited_issues(True)
-        self.upload_issue_completions(True)
+        # Only today's events are refreshed in the background.
+        if (
+            diary_date == ""
+            or is_buffer_empty(self._nvim)
+            or parser.parse(diary_date).date() != date.today()
+        ):
+            return
 
-        self.flush_messages()
+        self._set_calendar_events(self._gcal_service.active_events)
 
-    @pynvim.function("DiarySwapGroupSorting", sync=True)
-    def swap_group_sorting(self, *_: List[str]) -> None:
-        def rotate(input_list: List[Any], pivot: int) -> List[Any]:
-            return input_list[pivot:] + input_list[:pivot]
+    def _refresh_issues(self) -> None:
+        if get_diary_date(self._nvim) == "" or is_buffer_empty(self._nvim):
+            return
 
-        self.options.issue_groups = rotate(self.options.issue_groups, 1)
-        self.sort_issues()
+        self._set_github_issues(self._github_service.active_issues)
 
-    def flush_messages(self, *_: List[str]) -> None:
+    def _flush_messages(self, *_: List[str]) -> None:
         self._nvim.out_write("\n")
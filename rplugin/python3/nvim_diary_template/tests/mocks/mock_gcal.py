@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Any, List, Callable, Dict, Tuple
+from typing import Any, List, Callable, Dict, Optional, Set, Tuple
 from tempfile import mkdtemp
 
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
 from ...classes.calendar_event_class import CalendarEvent
 from ...classes.plugin_options import PluginOptions
 
@@ -25,11 +28,13 @@ def get_mock_gcal() -> Tuple[MockGCalService, PluginOptions]:
         "timeZone": "Europe/London",
         "items": [
             {
+                "id": "event1",
                 "summary": "Event 1",
                 "start": {"dateTime": "2019-11-10T12:00:00Z"},
                 "end": {"dateTime": "2019-11-10T13:00:00Z"},
             },
             {
+                "id": "event2",
                 "summary": "Event 2",
                 "start": {"dateTime": "2019-11-10T17:30:00Z"},
                 "end": {"dateTime": "2019-11-10T18:30:00Z"},
@@ -60,32 +65,129 @@ class MockGCalService:
         self._cal_json: Dict[Any, Any] = {}
 
         self._events_call_num = 0
+        self._request_count = 0
+        self._inserted_count = 0
+
+        # Incremental syncs return the changes, if the sync token is current.
+        self._sync_token = "sync_token_1"
+        self._changes: List[Dict[Any, Any]] = []
+
+        # Listing the events of these calendars fails.
+        self._failing_calendars: Set[str] = set()
 
     def get_events_for_date(self, date_today: date) -> List[CalendarEvent]:
         return self._events
 
+    def request(self) -> None:
+        self._request_count += 1
+
     def calendarList(self) -> MockGCalFunc:
-        return MockGCalFunc(self._cal_json)
+        return MockGCalFunc(self, self._cal_json)
 
     def events(self) -> MockGCalFunc:
 
         if self._events_call_num > 0:
             self._events_call_num += 1
-            return MockGCalFunc({"items": []})
+            return MockGCalFunc(self, {"items": []})
 
         self._events_call_num += 1
-        return MockGCalFunc(self._event_json)
+        return MockGCalFunc(self, self._event_json)
+
+    def new_batch_http_request(
+        self, callback: Optional[Callable[..., None]] = None
+    ) -> MockGCalBatch:
+        return MockGCalBatch(self, callback)
 
 
 class MockGCalFunc:
-    def __init__(self, input_json: Dict[Any, Any]) -> None:
+    def __init__(
+        self,
+        service: MockGCalService,
+        input_json: Dict[Any, Any],
+        error: Optional[Exception] = None,
+    ) -> None:
+        self._service: MockGCalService = service
         self._json_response: Dict[Any, Any] = input_json
+        self._error: Optional[Exception] = error
+
+    def list(
+        self,
+        pageToken: Optional[str] = None,
+        maxResults: Optional[int] = None,
+        syncToken: Optional[str] = None,
+        calendarId: Optional[str] = None,
+        **_: List[Any],
+    ) -> MockGCalFunc:
+        if calendarId in self._service._failing_calendars:
+            return MockGCalFunc(
+                self._service, {}, HttpError(Response({"status": 500}), b"")
+            )
+
+        if syncToken is not None:
+            if syncToken != self._service._sync_token:
+                return MockGCalFunc(
+                    self._service, {}, HttpError(Response({"status": 410}), b"")
+                )
+
+            return MockGCalFunc(
+                self._service,
+                {
+                    "items": self._service._changes,
+                    "nextSyncToken": self._service._sync_token,
+                },
+            )
+
+        if maxResults is None or "items" not in self._json_response:
+            return MockGCalFunc(self._service, self._json_response)
+
+        # Split the items into pages, where the page token is the start index.
+        items: List[Any] = self._json_response["items"]
+        start: int = int(pageToken) if pageToken is not None else 0
+        end: int = start + maxResults
+
+        page: Dict[Any, Any] = {**self._json_response, "items": items[start:end]}
+
+        if end < len(items):
+            page["nextPageToken"] = str(end)
+        else:
+            page["nextSyncToken"] = self._service._sync_token
+
+        return MockGCalFunc(self._service, page)
+
+    def insert(self, body: Dict[str, Any] = {}, **_: List[Any]) -> MockGCalFunc:
+        self._service._inserted_count += 1
+        new_id: str = f"inserted_{self._service._inserted_count}"
+
+        return MockGCalFunc(self._service, {**body, "id": new_id})
 
-    def list(self, **_: List[Any]) -> MockGCalFunc:
-        return MockGCalFunc(self._json_response)
+    def execute(self) -> Dict[Any, Any]:
+        self._service.request()
 
-    def insert(self, **_: List[Any]) -> MockGCalFunc:
-        return MockGCalFunc({})
+        if self._error is not None:
+            raise self._error
 
-    def execute(self) -> Dict[Any, Any]:
         return self._json_response
+
+
+class MockGCalBatch:
+    def __init__(
+        self, service: MockGCalService, callback: Optional[Callable[..., None]]
+    ) -> None:
+        self._service: MockGCalService = service
+        self._callback: Optional[Callable[..., None]] = callback
+        self._requests: List[Tuple[str, MockGCalFunc]] = []
+
+    def add(self, request: MockGCalFunc, request_id: str = "") -> None:
+        self._requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self._service.request()
+
+        for request_id, request in self._requests:
+            if self._callback is None:
+                continue
+
+            if request._error is not None:
+                self._callback(request_id, None, request._error)
+            else:
+                self._callback(request_id, request._json_response, None)
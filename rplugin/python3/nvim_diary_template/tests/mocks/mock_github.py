@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime
+from itertools import count
+from math import ceil
 from tempfile import mkdtemp
-from typing import Any, List, Tuple
+from threading import Event, Lock
+from time import sleep
+from typing import Any, Dict, List, Optional, Tuple
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from dateutil import parser
 
 from ...classes.github_issue_class import GitHubIssue
@@ -62,36 +66,124 @@ def get_mock_github() -> Tuple[MockGitHubService, PluginOptions]:
     return new_api, options
 
 
+MOCK_PAGE_SIZE = 100
+MOCK_COMMENT_IDS = count(1)
+
+
+@dataclass
+class MockRequestLog:
+    count: int = 0
+    latency: float = 0.0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    lock: Lock = field(default_factory=Lock)
+    gate: Optional[Event] = None
+
+    def request(self, count: int = 1) -> None:
+        # Requests can be held until the test lets them through.
+        if self.gate is not None:
+            self.gate.wait(5)
+
+        # Track how many requests are being sent at once, to check uploads are
+        # concurrent without relying on timings.
+        with self.lock:
+            self.count += count
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+        sleep(self.latency * count)
+
+        with self.lock:
+            self.in_flight -= 1
+
+    def paged(self, items: List[Any]) -> List[Any]:
+        self.request(max(1, ceil(len(items) / MOCK_PAGE_SIZE)))
+        return items
+
+
 class MockGitHubService:
     def __init__(self) -> None:
         self.active = True
         self.issues: List[GitHubIssue] = []
-        self.repo: MockGitHubRepo = MockGitHubRepo()
+        self.requests: MockRequestLog = MockRequestLog()
+        self.repo: MockGitHubRepo = MockGitHubRepo(self.requests)
         self.user: MockGitHubUser = MockGitHubUser([self.repo])
+        self.requester: MockGitHubRequester = MockGitHubRequester(self.requests)
 
     def get_repo(self, name: str) -> MockGitHubRepo:
+        self.requests.request()
         return self.repo
 
     def get_user(self, name: str) -> MockGitHubUser:
         return self.user
 
 
+class MockGitHubRequester:
+    def __init__(self, requests: MockRequestLog) -> None:
+        self.requests: MockRequestLog = requests
+        self.etag: str = '"initial"'
+
+    def requestJson(
+        self,
+        verb: str,
+        url: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, Dict[str, str], str]:
+        self.requests.request()
+
+        if headers and headers.get("If-None-Match") == self.etag:
+            return 304, {"etag": self.etag}, ""
+
+        return 200, {"etag": self.etag}, "[]"
+
+
 class MockGitHubRepo:
-    def __init__(self) -> None:
+    def __init__(self, requests: Optional[MockRequestLog] = None) -> None:
         self.full_name: str = ""
         self.labels: List[str] = []
         self.issues: List[MockGitHubIssue] = []
+        self.requests: MockRequestLog = requests if requests else MockRequestLog()
 
     def get_labels(self) -> List[str]:
         return self.labels
 
-    def get_issues(self, state: str = "open") -> List[MockGitHubIssue]:
-        return self.issues
+    def get_issues(
+        self, state: str = "open", since: Any = None
+    ) -> List[MockGitHubIssue]:
+        for issue in self.issues:
+            issue.requests = self.requests
+
+        return self.requests.paged(
+            [
+                issue
+                for issue in self.issues
+                if state in ("all", issue.state)
+                and (since is None or issue.updated_at >= since)
+            ]
+        )
+
+    def get_issues_comments(
+        self, sort: str = "created", direction: str = "asc", since: Any = None
+    ) -> List[MockGitHubComment]:
+        all_comments: List[MockGitHubComment] = []
+
+        for issue in self.issues:
+            for comment in issue.comments:
+                comment.issue_url = f"https://api.github.com/issues/{issue.number}"
+
+                if since is None or comment.updated_at >= since:
+                    all_comments.append(comment)
+
+        return self.requests.paged(all_comments)
 
     def get_issue(self, issue_number: int) -> MockGitHubIssue:
+        self.requests.request()
+        self.issues[issue_number - 1].requests = self.requests
         return self.issues[issue_number - 1]
 
     def create_issue(self, title: str, body: str, labels: List[str]) -> MockGitHubIssue:
+        self.requests.request()
         new_issue: MockGitHubIssue = MockGitHubIssue()
         new_issue.number = len(self.issues) + 1
         new_issue.title = title
@@ -113,6 +205,7 @@ class MockGitHubIssue:
         comments: List[MockGitHubComment] = [],
         updated_at: datetime = parser.parse("2018-01-01 10:00"),
         state: str = "open",
+        created_at: datetime = parser.parse("2018-01-01 10:00"),
     ) -> None:
         self.number: int = number
         self.title: str = title
@@ -121,14 +214,32 @@ class MockGitHubIssue:
         self.labels: List[MockGitHubLabel] = labels
         self.comments: List[MockGitHubComment] = comments
         self.updated_at: datetime = updated_at
+        self.created_at: datetime = created_at
         self.state: str = state
+        self.requests: MockRequestLog = MockRequestLog()
 
     def get_comments(self) -> List[MockGitHubComment]:
-        return self.comments
+        for comment in self.comments:
+            comment.requests = self.requests
+
+        return self.requests.paged(self.comments)
+
+    def get_comment(self, comment_id: int) -> MockGitHubComment:
+        self.requests.request()
+
+        for comment in self.comments:
+            if comment.id == comment_id:
+                comment.requests = self.requests
+                return comment
+
+        raise ValueError(f"No comment with ID {comment_id}")
 
     def edit(
         self, body: str = "", title: str = "", labels: List[str] = [], state: str = ""
     ) -> None:
+        self.requests.request()
+        self.updated_at = datetime.now()
+
         if body != "":
             self.body = body
 
@@ -138,10 +249,11 @@ class MockGitHubIssue:
         if labels != []:
             self.labels = [MockGitHubLabel(label) for label in labels]
 
-        if state != []:
+        if state != "":
             self.state = state
 
     def create_comment(self, body: str) -> MockGitHubComment:
+        self.requests.request()
         next_comment_number: int = 0
 
         if len(self.comments) != 0:
@@ -161,13 +273,19 @@ class MockGitHubComment:
         number: int = 0,
         body: str = "",
         updated_at: datetime = parser.parse("2018-01-01 10:00"),
+        id: int = 0,
     ) -> None:
+        self.id: int = id if id != 0 else next(MOCK_COMMENT_IDS)
         self.number: int = number
         self.body: str = body
         self.updated_at: datetime = updated_at
+        self.issue_url: str = ""
+        self.requests: MockRequestLog = MockRequestLog()
 
     def edit(self, body: str) -> None:
+        self.requests.request()
         self.body = body
+        self.updated_at = datetime.now()
 
 
 @dataclass
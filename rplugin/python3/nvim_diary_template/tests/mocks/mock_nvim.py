@@ -1,4 +1,14 @@
-from typing import List, Tuple
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pynvim.api import NvimError
+
+
+# NeoVim can only be called from the main thread, and raises an error for
+# requests from any other thread. Calls must be passed over with async_call.
+def check_main_thread() -> None:
+    if threading.current_thread() is not threading.main_thread():
+        raise NvimError("request from non-main thread")
 
 
 class MockNvim:
@@ -8,25 +18,47 @@ class MockNvim:
         self.commands: List[str] = []
         self.errors: List[str] = []
         self.messages: List[str] = []
+        self.async_calls: List[Tuple[Callable[..., Any], Tuple[Any, ...]]] = []
 
         self.error_print_count = 0
         self.message_print_count = 0
 
     def err_write(self, message: str) -> None:
+        check_main_thread()
+
         if message.endswith("\n"):
             self.message_print_count += 1
 
         self.errors.append(message)
 
     def out_write(self, message: str) -> None:
+        check_main_thread()
+
         if message.endswith("\n"):
             self.message_print_count += 1
 
         self.messages.append(message)
 
     def command(self, command: str) -> None:
+        check_main_thread()
+
         self.commands.append(command)
 
+    def request(self, name: str, *args: Any) -> Any:
+        check_main_thread()
+
+        return getattr(self.api, name[len("nvim_") :])(*args)
+
+    # Calls from other threads are kept until the test runs them, as the main
+    # thread would.
+    def async_call(self, function: Callable[..., Any], *args: Any) -> None:
+        self.async_calls.append((function, args))
+
+    def run_async_calls(self) -> None:
+        while self.async_calls:
+            function, args = self.async_calls.pop(0)
+            function(*args)
+
 
 class MockNvimApi:
     def __init__(self, nvim_mock: MockNvim) -> None:
@@ -34,6 +66,8 @@ class MockNvimApi:
 
         self.set_count = 0
         self.get_count = 0
+        self.attached: List[int] = []
+        self.atomic_calls: List[Any] = []
 
     def buf_set_lines(
         self,
@@ -43,6 +77,7 @@ class MockNvimApi:
         strict_indexing: bool,
         replacement: List[str],
     ) -> None:
+        check_main_thread()
 
         if end == -1:
             self.nvim.current.buffer.lines[start:] = replacement
@@ -54,11 +89,13 @@ class MockNvimApi:
         else:
             self.nvim.current.buffer.lines[start:end] = replacement
 
+        self.nvim.current.buffer.changedtick += 1
         self.set_count += 1
 
     def buf_get_lines(
         self, buffer: int, start: int, end: int, strict_indexing: bool
     ) -> List[str]:
+        check_main_thread()
 
         self.get_count += 1
 
@@ -67,6 +104,30 @@ class MockNvimApi:
 
         return self.nvim.current.buffer.lines[start:end]
 
+    def buf_get_changedtick(self, buffer: int) -> int:
+        check_main_thread()
+
+        return self.nvim.current.buffer.changedtick
+
+    def buf_attach(
+        self, buffer: int, send_buffer: bool, options: Dict[str, Any]
+    ) -> bool:
+        check_main_thread()
+
+        self.attached.append(buffer)
+        return True
+
+    def call_atomic(self, calls: List[Any]) -> Tuple[List[Any], Optional[List[Any]]]:
+        check_main_thread()
+
+        self.atomic_calls.append(calls)
+
+        results: List[Any] = [
+            getattr(self, name[len("nvim_") :])(*args) for name, args in calls
+        ]
+
+        return results, None
+
 
 class MockNvimCurrent:
     def __init__(self) -> None:
@@ -77,9 +138,21 @@ class MockNvimCurrent:
 class MockNvimBuffer:
     def __init__(self) -> None:
         self.number: int = 0
-        self.lines: List[str] = [""]
+        self.changedtick: int = 0
+        self._lines: List[str] = [""]
         self.name: str = ""
 
+    # Setting the lines directly is a change to the buffer, just like setting
+    # them through the API.
+    @property
+    def lines(self) -> List[str]:
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: List[str]) -> None:
+        self._lines = lines
+        self.changedtick += 1
+
 
 class MockNvimWindow:
     def __init__(self) -> None:
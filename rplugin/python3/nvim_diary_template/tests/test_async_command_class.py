@@ -0,0 +1,122 @@
+import unittest
+from threading import Event
+from typing import Any, List, Tuple
+
+from ..classes.async_command_class import AsyncCommand, AsyncCommandRunner
+from .mocks.mock_nvim import MockNvim
+
+
+class async_command_classTest(unittest.TestCase):
+    """
+    Tests for the AsyncCommandRunner class.
+    """
+
+    def setUp(self) -> None:
+        self.nvim: MockNvim = MockNvim()
+        self.runner: AsyncCommandRunner = AsyncCommandRunner(self.nvim)
+        self.applied: List[Tuple[Any, bool]] = []
+
+    def apply(self, result: Any, buffer_changed: bool) -> None:
+        self.applied.append((result, buffer_changed))
+
+    def wait_for_command(self) -> None:
+        command: Any = self.runner.command
+        command.thread.join()
+        self.nvim.run_async_calls()
+
+    def test_run(self) -> None:
+        self.runner.run("DiaryTest", lambda _: "result", self.apply)
+
+        # Nothing is applied until the main thread runs the result.
+        assert self.runner.command is not None
+        assert self.applied == []
+
+        self.wait_for_command()
+
+        assert self.runner.command is None
+        assert self.applied == [("result", False)]
+        assert self.nvim.messages == [
+            "DiaryTest: Started. Use DiaryCancel to stop it.\n",
+            "DiaryTest: Done.\n",
+        ]
+
+    def test_run_with_changed_buffer(self) -> None:
+        self.runner.run("DiaryTest", lambda _: "result", self.apply)
+
+        self.nvim.current.buffer.lines = ["Typed while waiting"]
+        self.wait_for_command()
+
+        assert self.applied == [("result", True)]
+
+        # If the buffer was swapped, nothing is applied.
+        self.runner.run("DiaryTest", lambda _: "result", self.apply)
+
+        self.nvim.current.buffer.number = 1
+        self.wait_for_command()
+
+        assert len(self.applied) == 1
+        assert "no longer the current buffer" in self.nvim.errors[-1]
+
+        # Anything that was changed online still needs tidying up by hand.
+        self.nvim.current.buffer.number = 0
+        self.runner.run(
+            "DiaryUpload",
+            lambda _: "result",
+            self.apply,
+            discard_on_cancel=False,
+            unapplied_warning="Remove the tags.",
+        )
+
+        self.nvim.current.buffer.number = 1
+        self.wait_for_command()
+
+        assert len(self.applied) == 1
+        assert self.nvim.errors[-1] == (
+            "DiaryUpload: The diary is no longer the current buffer, so it wasn't "
+            "updated. Remove the tags.\n"
+        )
+
+    def test_run_one_at_a_time(self) -> None:
+        started: Event = Event()
+
+        def work(command: AsyncCommand) -> str:
+            started.set()
+            command.cancel_event.wait()
+            return "result"
+
+        self.runner.run("DiaryFirst", work, self.apply)
+        started.wait()
+
+        self.runner.run("DiarySecond", lambda _: "second", self.apply)
+        assert self.nvim.errors == [
+            "DiaryFirst is still running. Use DiaryCancel to stop it.\n"
+        ]
+
+        # A cancelled command is thrown away by default.
+        self.runner.cancel()
+        self.wait_for_command()
+
+        assert self.applied == []
+        assert self.nvim.messages[-1] == "DiaryFirst: Cancelled.\n"
+
+        # Unless whatever was done before the cancel still needs applying.
+        self.runner.run("DiaryUpload", work, self.apply, discard_on_cancel=False)
+        self.runner.cancel()
+        self.wait_for_command()
+
+        assert self.applied == [("result", False)]
+        assert self.nvim.messages[-1] == "DiaryUpload: Cancelled.\n"
+
+        self.runner.cancel()
+        assert self.nvim.messages[-1] == "No diary command is running.\n"
+
+    def test_run_with_error(self) -> None:
+        def work(_: AsyncCommand) -> None:
+            raise ValueError("Bad reply")
+
+        self.runner.run("DiaryTest", work, self.apply)
+        self.wait_for_command()
+
+        assert self.runner.command is None
+        assert self.applied == []
+        assert self.nvim.errors == ["DiaryTest: Failed with ValueError('Bad reply').\n"]
@@ -0,0 +1,110 @@
+import unittest
+from typing import List, Tuple
+
+from ..classes.diary_document_class import DiaryDocument
+from ..helpers.neovim_helpers import (
+    get_buffer_document,
+    get_next_heading_of_level,
+    get_section_line,
+)
+from ..utils.constants import ISSUE_HEADING, SCHEDULE_HEADING
+from .mocks.mock_nvim import MockNvim
+
+
+class diary_document_classTest(unittest.TestCase):
+    """
+    Tests for the DiaryDocument class.
+    """
+
+    def setUp(self) -> None:
+        self.nvim: MockNvim = MockNvim()
+        self.lines: List[str] = [
+            "# Diary for 2019-11-10",
+            "",
+            "## Issues",
+            "",
+            "### Work",
+            "",
+            "#### [ ] Issue {1}: +label:work",
+            "##### Title: Issue 1",
+            "",
+            "##### Comment {0} - 2019-01-01 12:00:",
+            "Body of comment 0.",
+            "",
+            "##### Comment {1} - 2019-01-01 12:00:",
+            "Body of comment 1.",
+            "",
+            "#### [X] Issue {2}:",
+            "##### Title: Issue 2",
+            "",
+            "##### Comment {0} - 2019-01-01 12:00:",
+            "",
+            "## Schedule",
+            "",
+            "- 09:00 - 10:00: Event",
+        ]
+        self.nvim.current.buffer.lines = self.lines
+
+    def test_document_index(self) -> None:
+        document: DiaryDocument = get_buffer_document(self.nvim)
+
+        assert document.lines == self.lines
+        assert document.headings == [0, 2, 4, 6, 7, 9, 12, 15, 16, 18, 20]
+        assert document.sections == {ISSUE_HEADING: 2, SCHEDULE_HEADING: 20}
+        assert document.issue_starts == [6, 15]
+        assert document.comment_headers == [9, 12, 18]
+        assert document.subgroup_headings == [4]
+
+        # Only a single fetch of the buffer is needed for everything.
+        assert self.nvim.api.get_count == 1
+
+    def test_section_line(self) -> None:
+        document: DiaryDocument = DiaryDocument(self.lines)
+
+        for heading in (ISSUE_HEADING, SCHEDULE_HEADING, "## Missing"):
+            assert document.section_line(heading) == get_section_line(
+                self.lines, heading
+            )
+
+    def test_next_heading_of_level(self) -> None:
+        document: DiaryDocument = DiaryDocument(self.lines)
+
+        for start in range(len(self.lines)):
+            expected: int = get_next_heading_of_level(self.lines[start:], 3)
+            result: int = document.next_heading_of_level(start, 3)
+
+            assert result == (start + expected if expected != -1 else -1)
+
+    def test_first_and_last_between(self) -> None:
+        document: DiaryDocument = DiaryDocument(self.lines)
+
+        assert document.first_between(document.comment_headers, 10, 20) == 12
+        assert document.first_between(document.comment_headers, 19, 20) == -1
+        assert document.last_between(document.comment_headers, 0, 18) == 12
+        assert document.last_between(document.comment_headers, 0, 19) == 18
+        assert document.last_between(document.comment_headers, 13, 18) == -1
+
+    def test_with_change(self) -> None:
+        original: DiaryDocument = DiaryDocument(self.lines)
+        document: DiaryDocument = original
+        changes: List[Tuple[int, int, List[str]]] = [
+            (0, 0, ["### Inserted", ""]),
+            (6, 7, ["#### [X] Issue {1}: +label:work"]),
+            (9, 15, []),
+            (16, -1, ["## Schedule", "", "## Notes"]),
+            (4, 5, ["Not a heading", "##### Comment {3} - 2019-01-01 12:00:"]),
+        ]
+
+        for first_line, last_line, new_lines in changes:
+            document = document.with_change(first_line, last_line, new_lines)
+            expected: DiaryDocument = DiaryDocument(document.lines)
+
+            assert document.headings == expected.headings
+            assert document.sections == expected.sections
+            assert document.issue_starts == expected.issue_starts
+            assert document.comment_headers == expected.comment_headers
+            assert document.subgroup_headings == expected.subgroup_headings
+
+        # The document that was changed is left as it was.
+        assert original.lines is self.lines
+        assert original.headings == [0, 2, 4, 6, 7, 9, 12, 15, 16, 18, 20]
@@ -0,0 +1,108 @@
+import random
+import unittest
+from typing import List, Tuple
+
+from ..helpers.diff_helpers import (
+    Hunk,
+    get_line_hunks,
+    get_longest_ordered_run,
+    get_unique_anchors,
+    merge_line_changes,
+)
+
+
+def apply_hunks(
+    old_lines: List[str], new_lines: List[str], hunks: List[Hunk]
+) -> List[str]:
+    result: List[str] = list(old_lines)
+
+    for old_start, old_end, new_start, new_end in reversed(hunks):
+        result[old_start:old_end] = new_lines[new_start:new_end]
+
+    return result
+
+
+class diff_helpersTest(unittest.TestCase):
+    """
+    Tests for functions in the diff_helpers module.
+    """
+
+    def test_get_line_hunks(self) -> None:
+        old_lines: List[str] = ["a", "", "b", "", "c", "", "d", ""]
+
+        assert get_line_hunks(old_lines, old_lines) == []
+        assert get_line_hunks([], ["a"]) == [(0, 0, 0, 1)]
+        assert get_line_hunks(["a"], []) == [(0, 1, 0, 0)]
+
+        # A single changed line is a single hunk.
+        new_lines: List[str] = ["a", "", "b", "", "C", "", "d", ""]
+        assert get_line_hunks(old_lines, new_lines) == [(4, 5, 4, 5)]
+
+        # A moved block is a delete and an insert, of just that block.
+        new_lines = ["a", "", "c", "", "d", "", "b", ""]
+        hunks: List[Hunk] = get_line_hunks(old_lines, new_lines)
+
+        assert hunks == [(2, 4, 2, 2), (7, 7, 5, 7)]
+        assert apply_hunks(old_lines, new_lines, hunks) == new_lines
+
+    def test_get_line_hunks_random(self) -> None:
+        generator: random.Random = random.Random(0)
+        words: List[str] = ["", "#### Issue", "Line", "##### Comment"]
+
+        for _ in range(200):
+            old_lines: List[str] = [
+                generator.choice(words) + str(generator.randrange(20))
+                for _ in range(generator.randrange(30))
+            ]
+            new_lines: List[str] = list(old_lines)
+
+            for _ in range(generator.randrange(5)):
+                index: int = generator.randrange(len(new_lines) + 1)
+
+                if new_lines and generator.random() < 0.5:
+                    del new_lines[min(index, len(new_lines) - 1)]
+                else:
+                    new_lines.insert(index, generator.choice(words))
+
+            hunks: List[Hunk] = get_line_hunks(old_lines, new_lines)
+            assert apply_hunks(old_lines, new_lines, hunks) == new_lines
+
+    def test_get_unique_anchors(self) -> None:
+        old_lines: List[str] = ["a", "b", "x", "c", "x", "d"]
+        new_lines: List[str] = ["b", "a", "c", "x", "d"]
+
+        result: List[Tuple[int, int]] = get_unique_anchors(
+            old_lines, new_lines, (0, 6, 0, 5)
+        )
+        assert result == [(0, 1), (3, 2), (5, 4)]
+
+    def test_get_longest_ordered_run(self) -> None:
+        pairs: List[Tuple[int, int]] = [(3, 0), (0, 1), (4, 2), (1, 3), (2, 4)]
+
+        assert get_longest_ordered_run(pairs) == [(0, 1), (1, 3), (2, 4)]
+        assert get_longest_ordered_run([]) == []
+
+    def test_merge_line_changes(self) -> None:
+        base_lines: List[str] = ["a", "", "b", "", "c", "", "d", ""]
+        our_lines: List[str] = ["a", "", "B", "", "c", "", "d", ""]
+        their_lines: List[str] = ["a", "", "b", "", "c", "", "d", "", "e", ""]
+
+        # Changes in different places are both kept.
+        assert merge_line_changes(base_lines, our_lines, their_lines) == [
+            "a",
+            "",
+            "B",
+            "",
+            "c",
+            "",
+            "d",
+            "",
+            "e",
+            "",
+        ]
+        assert merge_line_changes(base_lines, our_lines, base_lines) == our_lines
+        assert merge_line_changes(base_lines, base_lines, their_lines) == their_lines
+
+        # Changes to the same lines conflict.
+        their_lines = ["a", "", "b2", "", "c", "", "d", ""]
+        assert merge_line_changes(base_lines, our_lines, their_lines) is None
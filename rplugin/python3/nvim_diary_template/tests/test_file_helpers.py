@@ -4,11 +4,24 @@ import shutil
 import tempfile
 import time as t
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from random import choices
 from typing import Any, Dict, List
 
-from ..helpers.file_helpers import check_cache, generate_diary_index, set_cache
+from ..classes.calendar_event_class import CalendarEvent
+from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
+from ..classes.memory_cache_class import MemoryCache
+from ..helpers.file_helpers import (
+    check_cache,
+    generate_diary_index,
+    get_cache_file_name,
+    get_cache_index,
+    get_cache_validators,
+    load_cache,
+    set_cache,
+    set_cache_validators,
+)
 from ..classes.plugin_options import PluginOptions
 
 
@@ -54,3 +67,202 @@ class file_helpersTest(unittest.TestCase):
         # Test the existing file is still there.
         result = check_cache(self.config, "test", timedelta(days=1), fallback)
         assert result == {"Issues": ["Two", "Four", "Six", random_string]}
+
+        # Test an old cache file that is revalidated is used, not replaced.
+        result = check_cache(
+            self.config,
+            "test",
+            timedelta(microseconds=1),
+            lambda: {"Issues": []},
+            revalidate_function=lambda: True,
+        )
+        assert result == {"Issues": ["Two", "Four", "Six", random_string]}
+
+    def test_check_cache_shared_refresh(self) -> None:
+        fallback_calls: List[int] = []
+
+        def slow_fallback() -> Dict[str, List[str]]:
+            fallback_calls.append(1)
+            t.sleep(0.2)
+            return {"Issues": ["One"]}
+
+        # Every caller refreshing at once should wait for the first refresh,
+        # rather than all calling the fallback.
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(
+                executor.map(
+                    lambda _: check_cache(
+                        self.config, "test", timedelta(days=1), slow_fallback
+                    ),
+                    range(5),
+                )
+            )
+
+        assert len(fallback_calls) == 1
+        assert results == [{"Issues": ["One"]}] * 5
+
+        # No temporary files should be left behind by the writes.
+        cache_files: List[str] = os.listdir(os.path.join(self.config, "cache"))
+        assert [name for name in cache_files if name.startswith(".tmp_")] == []
+
+    def test_check_cache_memory(self) -> None:
+        set_cache(self.config, {"Issues": ["One"]}, "test")
+        assert check_cache(self.config, "test", timedelta(days=1), dict) == {
+            "Issues": ["One"]
+        }
+
+        # Once read, the data should be used without reading the file again.
+        os.remove(
+            os.path.join(self.config, "cache", "nvim_diary_template_test_cache.json")
+        )
+        assert check_cache(self.config, "test", timedelta(days=1), dict) == {
+            "Issues": ["One"]
+        }
+
+        # Setting the cache should drop the data from memory.
+        set_cache(self.config, {"Issues": ["Two"]}, "test")
+        assert check_cache(self.config, "test", timedelta(days=1), dict) == {
+            "Issues": ["Two"]
+        }
+
+        # Data from memory should still expire.
+        assert check_cache(self.config, "test", timedelta(microseconds=1), dict) == {}
+
+    def test_memory_cache(self) -> None:
+        memory_cache: MemoryCache = MemoryCache(2)
+        memory_cache.set(("config", "one"), t.time(), 1)
+        memory_cache.set(("config", "two"), t.time(), 2)
+
+        # Using the first entry means the second is the least recently used.
+        assert memory_cache.get(("config", "one"), timedelta(days=1)) == 1
+        memory_cache.set(("config", "three"), t.time(), 3)
+
+        assert memory_cache.get(("config", "two"), timedelta(days=1)) is None
+        assert memory_cache.get(("config", "one"), timedelta(days=1)) == 1
+        assert memory_cache.get(("config", "three"), timedelta(days=1)) == 3
+
+        memory_cache.set(("config", "old"), t.time() - 120, 4)
+        assert memory_cache.get(("config", "old"), timedelta(minutes=1)) is None
+
+        memory_cache.invalidate(("config", "one"))
+        assert memory_cache.get(("config", "one"), timedelta(days=1)) is None
+
+    def test_load_cache(self) -> None:
+        assert load_cache(self.config, "test") is None
+
+        set_cache(self.config, {"Issues": ["One"]}, "test")
+        assert load_cache(self.config, "test") == {"Issues": ["One"]}
+
+        # Setting the cache twice in the same second should keep the new data.
+        set_cache(self.config, {"Issues": ["Two"]}, "test")
+        assert load_cache(self.config, "test") == {"Issues": ["Two"]}
+
+    def test_packed_cache(self) -> None:
+        issues: List[GitHubIssue] = [
+            GitHubIssue(
+                number=1,
+                title="Test Issue",
+                complete=False,
+                labels=["work"],
+                all_comments=[
+                    GitHubIssueComment(
+                        number=0,
+                        body=["Line 1", "Line 2"],
+                        tags=[],
+                        updated_at="2019-01-01 12:00",
+                        comment_id=10,
+                    )
+                ],
+                metadata=[],
+            )
+        ]
+
+        # Start with an old json cache, which should be replaced.
+        os.makedirs(os.path.join(self.config, "cache"))
+        with open(
+            os.path.join(
+                self.config, "cache", "nvim_diary_template_open_issues_cache_1000.json"
+            ),
+            "w",
+        ) as old_file:
+            json.dump([], old_file)
+
+        json_file: str = get_cache_file_name(self.config, "open_issues")
+        assert json_file.endswith(".json")
+        set_cache(self.config, issues, "open_issues")
+
+        assert get_cache_file_name(self.config, "open_issues").endswith(".msgpack")
+        assert not os.path.exists(json_file)
+
+        cached_issues: Any = load_cache(self.config, "open_issues")
+        assert cached_issues == issues
+        assert cached_issues[0].all_comments[0].comment_id == 10
+
+        # Each use unpacks new objects, so changes aren't shared.
+        cached_issues[0].title = "Changed"
+        assert cached_issues[0].title == "Test Issue"
+
+        # Lists of events in other data are packed in the same way.
+        event: CalendarEvent = CalendarEvent(
+            name="Event", start="2019-01-01 10:00", end="2019-01-01 11:00"
+        )
+        set_cache(
+            self.config,
+            {"start": "2019-01-01", "events": {"2019-01-01": [event]}},
+            "event_window",
+        )
+        window: Any = load_cache(self.config, "event_window")
+        assert window["start"] == "2019-01-01"
+        assert list(window["events"]["2019-01-01"]) == [event]
+
+    def test_cache_index(self) -> None:
+        cache_path: str = os.path.join(self.config, "cache")
+        os.makedirs(cache_path)
+
+        # Make some old style cache files, to check they are moved over.
+        old_cache_files: Dict[str, Any] = {
+            "nvim_diary_template_test_cache_1000.json": {"Issues": ["One"]},
+            "nvim_diary_template_open_issues_cache_2000.json": [],
+            "nvim_diary_template_open_issues_validators_cache_2000.json": {
+                "etag": "1234"
+            },
+        }
+
+        for file_name, data in old_cache_files.items():
+            with open(os.path.join(cache_path, file_name), "w") as json_file:
+                json.dump(data, json_file)
+
+        cache_index: Dict[str, Dict[str, Any]] = {
+            "test": {"file": "nvim_diary_template_test_cache.json", "created": 1000},
+            "open_issues": {
+                "file": "nvim_diary_template_open_issues_cache.json",
+                "created": 2000,
+                "validators": {"etag": "1234"},
+            },
+        }
+
+        # Only one caller should move the files, with the rest using its index.
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(
+                executor.map(lambda _: get_cache_index(self.config), range(5))
+            )
+
+        assert results == [cache_index] * 5
+        assert sorted(os.listdir(cache_path)) == [
+            "nvim_diary_template_cache_index.json",
+            "nvim_diary_template_index.lock",
+            "nvim_diary_template_open_issues_cache.json",
+            "nvim_diary_template_test_cache.json",
+        ]
+        assert load_cache(self.config, "test") == {"Issues": ["One"]}
+
+        # The old cache should be treated as expired.
+        result = check_cache(self.config, "test", timedelta(days=1), lambda: [])
+        assert result == []
+
+        # Validators are stored alongside the cached data.
+        set_cache_validators(self.config, {"etag": "5678"}, "open_issues")
+        set_cache(self.config, ["Issue"], "open_issues")
+        assert get_cache_validators(self.config, "open_issues") == {"etag": "5678"}
+        assert get_cache_validators(self.config, "missing") == {}
+        assert load_cache(self.config, "open_issues") == ["Issue"]
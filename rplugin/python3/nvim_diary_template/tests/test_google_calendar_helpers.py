@@ -1,4 +1,5 @@
 import unittest
+from datetime import datetime
 from typing import Any, Dict, List
 
 from dateutil import parser
@@ -9,8 +10,13 @@ from ..helpers.google_calendar_helpers import (
     create_google_event,
     format_google_events,
     get_calendar_objects,
+    get_event_list_parameters,
+    get_paged_items,
+    get_time,
+    group_google_events_by_date,
 )
 from ..utils.constants import ISO_FORMAT
+from .mocks.mock_gcal import MockGCalFunc, MockGCalService
 
 
 class google_calendar_helpersTest(unittest.TestCase):
@@ -173,3 +179,116 @@ class google_calendar_helpersTest(unittest.TestCase):
 
         result = get_calendar_objects(objects_to_check)
         assert result == objects_to_check
+
+    def test_get_paged_items(self) -> None:
+        service: MockGCalService = MockGCalService()
+        items: List[Dict[str, Any]] = [{"id": number} for number in range(10)]
+        list_method: Any = MockGCalFunc(service, {"items": items}).list
+
+        # All the pages should be followed, and only when needed.
+        paged_items: Any = get_paged_items(list_method, maxResults=4)
+        assert service._request_count == 0
+        assert next(paged_items) == {"id": 0}
+        assert service._request_count == 1
+        assert list(paged_items) == items[1:]
+        assert service._request_count == 3
+
+        # An already fetched page should be carried on from.
+        first_page: Dict[str, Any] = list_method(maxResults=8).execute()
+        service._request_count = 0
+
+        assert list(get_paged_items(list_method, first_page, maxResults=8)) == items
+        assert service._request_count == 1
+
+        # Without any paging, there is just a single page.
+        assert list(get_paged_items(list_method)) == items
+
+    def test_get_event_list_parameters(self) -> None:
+        time_range = ("2019-11-10T00:00:00Z", "2019-11-10T23:59:59.999999Z")
+
+        # Without a sync token, every event in the time range is listed.
+        assert get_event_list_parameters("cal_1", 50, None, time_range) == {
+            "calendarId": "cal_1",
+            "singleEvents": True,
+            "maxResults": 50,
+            "timeMin": "2019-11-10T00:00:00Z",
+            "timeMax": "2019-11-10T23:59:59.999999Z",
+        }
+
+        # Whereas the sync token replaces the time range.
+        assert get_event_list_parameters("cal_1", 50, "token_1", time_range) == {
+            "calendarId": "cal_1",
+            "singleEvents": True,
+            "maxResults": 50,
+            "syncToken": "token_1",
+        }
+
+    def test_group_google_events_by_date(self) -> None:
+        events: List[Dict[str, Any]] = [
+            {
+                "id": "event1",
+                "summary": "Event 1",
+                "start": {"dateTime": "2019-11-10T12:00:00Z"},
+                "end": {"dateTime": "2019-11-10T13:00:00Z"},
+            },
+            {
+                "id": "event2",
+                "summary": "Event 2",
+                "start": {"date": "2019-11-11"},
+                "end": {"date": "2019-11-12"},
+            },
+            {
+                "id": "event3",
+                "summary": "Event 3",
+                "start": {"dateTime": "2019-11-10T17:30:00Z"},
+                "end": {"dateTime": "2019-11-10T18:30:00Z"},
+            },
+        ]
+
+        result: Dict[str, List[CalendarEvent]] = group_google_events_by_date(
+            events, "calendar"
+        )
+
+        assert result == {
+            "2019-11-10": [
+                CalendarEvent(
+                    name="Event 1",
+                    start="2019-11-10T12:00:00Z",
+                    end="2019-11-10T13:00:00Z",
+                ),
+                CalendarEvent(
+                    name="Event 3",
+                    start="2019-11-10T17:30:00Z",
+                    end="2019-11-10T18:30:00Z",
+                ),
+            ],
+            "2019-11-11": [
+                CalendarEvent(name="Event 2", start="2019-11-11", end="2019-11-12")
+            ],
+        }
+        assert result["2019-11-11"][0].event_id == "event2"
+        assert result["2019-11-11"][0].calendar_id == "calendar"
+
+    def test_get_time(self) -> None:
+        times: List[str] = [
+            "2019-11-10",
+            "2019-11-10 09:30",
+            "2019-11-10 9:30",
+            "2019-11-10T12:00:00Z",
+            "2019-11-10T12:00:00.5Z",
+            "2019-11-10T12:00:00+01:00",
+            "2019-11-10T12:00:00-05:30",
+            "2019-11-10T12:00:00+00:00",
+            "9:30",
+            "10/11/2019 12:00",
+        ]
+
+        for time_to_convert in times:
+            result: datetime = get_time(time_to_convert)
+            expected: datetime = parser.parse(time_to_convert)
+
+            assert result == expected
+            assert result.utcoffset() == expected.utcoffset()
+
+        with self.assertRaises(ValueError):
+            get_time("2019-02-30")
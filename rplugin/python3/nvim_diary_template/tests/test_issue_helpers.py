@@ -4,12 +4,17 @@ from typing import Any, Dict, List
 
 import pytest
 
-from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
+from ..classes.github_issue_class import (
+    CommentBody,
+    GitHubIssue,
+    GitHubIssueComment,
+)
 from ..classes.plugin_options import PluginOptions
 from ..helpers.issue_helpers import (
     check_markdown_style,
     get_github_objects,
     get_latest_update,
+    group_comments_by_issue,
     insert_edit_tag,
     insert_new_comment,
     insert_new_issue,
@@ -17,6 +22,7 @@ from ..helpers.issue_helpers import (
     split_comment,
     toggle_issue_completion,
 )
+from .mocks.mock_github import MockGitHubComment
 from .mocks.mock_nvim import MockNvim
 
 
@@ -760,3 +766,46 @@ class issue_helpersTest(unittest.TestCase):
 
         result: List[str] = split_comment(initial_comment)
         assert result == final_comment
+
+    def test_comment_body(self) -> None:
+        lines: List[str] = ["Line 1", "", "Line 3"]
+        body: CommentBody = CommentBody.from_lines(lines)
+
+        assert body == lines
+        assert lines == body
+        assert len(body) == 3
+        assert body[-1] == "Line 3"
+        assert body[:-1] == ["Line 1", ""]
+
+        # An empty body and a single empty line should stay different.
+        assert CommentBody.from_lines([]) == []
+        assert CommentBody.from_lines([""]) == [""]
+        assert CommentBody.from_lines([]) != CommentBody.from_lines([""])
+
+        # Comments using either form of body should still compare equal.
+        comment: GitHubIssueComment = GitHubIssueComment(
+            number=1, body=body, tags=["edit"], updated_at="2019-01-01 12:00"
+        )
+        assert comment == GitHubIssueComment(
+            number=1, body=lines, tags=["edit"], updated_at="2019-01-01 12:00"
+        )
+        assert comment in [
+            GitHubIssueComment(
+                number=1, body=lines, tags=["edit"], updated_at="2019-01-01 12:00"
+            )
+        ]
+        assert not hasattr(comment, "__dict__")
+
+    def test_group_comments_by_issue(self) -> None:
+        comments: List[MockGitHubComment] = []
+
+        for issue_number, body in [(2, "First"), (1, "Second"), (2, "Third")]:
+            comment: MockGitHubComment = MockGitHubComment(body=body)
+            comment.issue_url = f"https://api.github.com/issues/{issue_number}"
+            comments.append(comment)
+
+        result: Dict[int, List[Any]] = group_comments_by_issue(comments)
+
+        assert list(result.keys()) == [2, 1]
+        assert [comment.body for comment in result[1]] == ["Second"]
+        assert [comment.body for comment in result[2]] == ["First", "Third"]
@@ -249,6 +249,37 @@ class make_issuesTest(unittest.TestCase):
         set_issues_from_issues_list(self.nvim, self.options, self.issues, False)
         assert self.nvim.current.buffer.lines == final_buffer
 
+    def test_set_issues_from_issues_list_with_base_lines(self) -> None:
+        set_issues_from_issues_list(self.nvim, self.options, self.issues, False)
+        base_lines: List[str] = list(self.nvim.current.buffer.lines[10:-2])
+
+        # An edit made after the issues were read is kept, as long as it is
+        # away from the changes to the issues.
+        self.nvim.current.buffer.lines[12] = "##### Title: Edited Title"
+        self.issues[2].complete = True
+
+        result: bool = set_issues_from_issues_list(
+            self.nvim, self.options, self.issues, False, base_lines
+        )
+
+        assert result
+        assert self.nvim.current.buffer.lines[12] == "##### Title: Edited Title"
+        assert self.nvim.current.buffer.lines[26] == (
+            "#### [X] Issue {3}: +label:inprogress +label:work"
+        )
+
+        # An edit to the same lines is kept instead, and nothing is set.
+        base_lines = list(self.nvim.current.buffer.lines[10:-2])
+        self.nvim.current.buffer.lines[26] = "#### [ ] Issue {3}: +label:work"
+        self.issues[2].complete = False
+
+        result = set_issues_from_issues_list(
+            self.nvim, self.options, self.issues, False, base_lines
+        )
+
+        assert not result
+        assert self.nvim.current.buffer.lines[26] == "#### [ ] Issue {3}: +label:work"
+
     def test_set_issues_from_issues_list_with_groups(self) -> None:
         final_buffer: List[str] = [
             "<!---",
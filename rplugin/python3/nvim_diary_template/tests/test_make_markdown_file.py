@@ -6,9 +6,10 @@ from dateutil import parser
 from ..classes.calendar_event_class import CalendarEvent
 from ..classes.plugin_options import PluginOptions
 from ..classes.nvim_github_class import SimpleNvimGithub
+from ..classes.nvim_google_cal_class import SimpleNvimGoogleCal
 from ..utils.constants import ISO_FORMAT
 from ..utils.make_markdown_file import generate_markdown_metadata, make_diary
-from .mocks.mock_gcal import MockGCalService
+from .mocks.mock_gcal import MockGCalService, get_mock_gcal
 from .mocks.mock_github import get_mock_github
 from .mocks.mock_nvim import MockNvim
 
@@ -35,6 +36,9 @@ class make_markdown_fileTest(unittest.TestCase):
         assert len(nvim.current.buffer.lines) == 41
         assert nvim.commands == [":w"]
 
+        # The whole diary is set in a single write.
+        assert nvim.api.set_count == 1
+
         # Check doesn't save over modified.
         nvim = MockNvim()
         nvim.current.buffer.name = "/home/crossr/diary/2018-01-01.md"
@@ -193,6 +197,22 @@ class make_markdown_fileTest(unittest.TestCase):
 
         assert final_grouped_markdown == nvim.current.buffer.lines
 
+    def test_make_diary_service_errors(self) -> None:
+        nvim: Any = MockNvim()
+        nvim.current.buffer.name = "/home/crossr/diary/2018-01-01.md"
+        gcal_api, options = get_mock_gcal()
+        gcal: SimpleNvimGoogleCal = SimpleNvimGoogleCal(nvim, options, gcal_api)
+        github: SimpleNvimGithub = SimpleNvimGithub(nvim, options, None)
+
+        # The issues and events are fetched on other threads, so any errors
+        # are written once the diary is made, rather than stopping it.
+        gcal.service = None
+        make_diary(nvim, options, gcal, github)
+        assert nvim.commands == [":w"]
+
+        nvim.run_async_calls()
+        assert "Google service not ready...\n" in nvim.errors
+
     def test_generate_markdown_metadata(self) -> None:
 
         diary_metadata: Dict[str, str] = {"Date": "2018-01-01"}
@@ -110,10 +110,11 @@ class markdown_helpersTest(unittest.TestCase):
         format_markdown_events(nvim)
         assert nvim.current.buffer.lines == final_buffer
 
-        # Calling when sorted should still update, since this is a forced update.
+        # Calling when sorted still forces an update, but with nothing changed
+        # there are no lines to send.
         nvim.api.get_count = 0
         nvim.api.set_count = 0
         format_markdown_events(nvim)
         assert nvim.current.buffer.lines == final_buffer
         assert nvim.api.get_count == 2
-        assert nvim.api.set_count == 1
+        assert nvim.api.set_count == 0
@@ -1,14 +1,24 @@
 import unittest
+from threading import Thread
 from typing import List
 
+from ..classes.diary_document_class import DiaryDocument
 from ..helpers.neovim_helpers import (
+    BUFFER_MIRRORS,
+    attach_buffer,
+    buffered_error_message,
     buffered_info_message,
+    detach_buffer,
     get_buffer_contents,
+    get_buffer_document,
     get_diary_date,
     get_section_line,
     is_buffer_empty,
     set_buffer_contents,
     set_line_content,
+    set_lines_from_diff,
+    update_buffer_mirror,
+    update_buffer_mirror_changedtick,
 )
 from ..utils.constants import ISSUE_HEADING, SCHEDULE_HEADING
 from .mocks.mock_nvim import MockNvim
@@ -22,6 +32,9 @@ class neovim_helpersTest(unittest.TestCase):
     def setUp(self) -> None:
         self.nvim: MockNvim = MockNvim()
 
+    def tearDown(self) -> None:
+        BUFFER_MIRRORS.clear()
+
     def test_is_buffer_empty(self) -> None:
         # The buffer is initialised to be empty, so should be empty straight
         # away.
@@ -123,6 +136,35 @@ class neovim_helpersTest(unittest.TestCase):
         ]
         assert self.nvim.message_print_count == 1
 
+        # From any other thread, the message is passed to the main thread.
+        thread: Thread = Thread(
+            target=buffered_info_message, args=(self.nvim, "From a thread.\n")
+        )
+        thread.start()
+        thread.join()
+
+        assert len(self.nvim.messages) == 2
+
+        self.nvim.run_async_calls()
+        assert self.nvim.messages[-1] == "From a thread.\n"
+
+    def test_buffered_error_message(self) -> None:
+        buffered_error_message(self.nvim, "Error message to send.\n")
+
+        assert self.nvim.errors == ["Error message to send.\n"]
+
+        # From any other thread, the error is passed to the main thread.
+        thread: Thread = Thread(
+            target=buffered_error_message, args=(self.nvim, "From a thread.\n")
+        )
+        thread.start()
+        thread.join()
+
+        assert len(self.nvim.errors) == 1
+
+        self.nvim.run_async_calls()
+        assert self.nvim.errors[-1] == "From a thread.\n"
+
     def test_get_diary_date(self) -> None:
         self.nvim.current.buffer.name = "/home/crossr/git/wiki/diary/2018-01-01.md"
         diary_date: str = "2018-01-01"
@@ -134,3 +176,79 @@ class neovim_helpersTest(unittest.TestCase):
 
         result = get_diary_date(self.nvim)
         assert result == ""
+
+    def test_buffer_mirror(self) -> None:
+        self.nvim.current.buffer.lines = ["# Diary", "", "## Issues", "", "Line."]
+
+        attach_buffer(self.nvim)
+        attach_buffer(self.nvim)
+
+        assert self.nvim.api.attached == [0]
+        assert self.nvim.api.get_count == 1
+
+        # While the mirror is up to date, the buffer isn't fetched again.
+        document: DiaryDocument = get_buffer_document(self.nvim)
+        assert document.lines == self.nvim.current.buffer.lines
+        assert get_buffer_contents(self.nvim) == self.nvim.current.buffer.lines
+        assert self.nvim.api.get_count == 1
+
+        # A change, as sent by NeoVim, is applied to the mirror.
+        self.nvim.current.buffer.lines = ["# Diary", "", "## Issues", "", "### New"]
+        update_buffer_mirror(0, self.nvim.current.buffer.changedtick, 4, 5, ["### New"])
+
+        document = get_buffer_document(self.nvim)
+        assert document.lines == self.nvim.current.buffer.lines
+        assert document.headings == [0, 2, 4]
+        assert self.nvim.api.get_count == 1
+
+        # Old events are ignored, and a changedtick without a change is kept.
+        update_buffer_mirror(0, 1, 0, 1, ["Old line"])
+        update_buffer_mirror_changedtick(0, self.nvim.current.buffer.changedtick + 1)
+        self.nvim.current.buffer.changedtick += 1
+
+        assert get_buffer_document(self.nvim) is document
+        assert self.nvim.api.get_count == 1
+
+        # If a change is missed, the buffer is fetched again.
+        self.nvim.current.buffer.lines = ["# Diary"]
+
+        assert get_buffer_contents(self.nvim) == ["# Diary"]
+        assert self.nvim.api.get_count == 2
+
+        # An event without a changedtick means the mirror can't be trusted.
+        update_buffer_mirror(0, None, 0, 1, ["# Changed"])
+        update_buffer_mirror(0, 100, 0, 1, ["# Changed again"])
+
+        assert get_buffer_contents(self.nvim) == ["# Diary"]
+        assert self.nvim.api.get_count == 3
+
+        detach_buffer(0)
+        assert BUFFER_MIRRORS == {}
+
+    def test_set_lines_from_diff(self) -> None:
+        old_lines: List[str] = [f"Line {number}" for number in range(100)]
+        new_lines: List[str] = list(old_lines)
+        new_lines[10] = "Changed line"
+        new_lines.insert(50, "Added line")
+        del new_lines[90]
+
+        self.nvim.current.buffer.lines = ["# Heading", ""] + old_lines + ["", "End"]
+
+        set_lines_from_diff(self.nvim, old_lines, new_lines, 2)
+
+        assert self.nvim.current.buffer.lines == ["# Heading", ""] + new_lines + [
+            "",
+            "End",
+        ]
+
+        # Only the three changed hunks are sent, in a single call.
+        assert len(self.nvim.api.atomic_calls) == 1
+        assert [call[1][4] for call in self.nvim.api.atomic_calls[0]] == [
+            [],
+            ["Added line"],
+            ["Changed line"],
+        ]
+
+        # When nothing has changed, nothing is sent.
+        set_lines_from_diff(self.nvim, new_lines, new_lines, 2)
+        assert len(self.nvim.api.atomic_calls) == 1
@@ -1,12 +1,31 @@
+import time
 import unittest
-from typing import Any, List
+from copy import deepcopy
+from datetime import datetime, timedelta
+from threading import Event, Thread
+from typing import Any, Dict, List, Optional
 
 from dateutil import parser
 
 from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
 from ..classes.nvim_github_class import SimpleNvimGithub
 from ..classes.plugin_options import PluginOptions
-from .mocks.mock_github import MockGitHubComment, MockGitHubService, get_mock_github
+from ..helpers.file_helpers import (
+    get_cache_index,
+    get_cache_validators,
+    load_cache,
+    set_cache,
+    write_cache_index,
+)
+from ..helpers.github_helpers import filter_comments, filter_issues
+from ..utils.parse_markdown import combine_issues
+from .mocks.mock_github import (
+    MockGitHubComment,
+    MockGitHubIssue,
+    MockGitHubLabel,
+    MockGitHubService,
+    get_mock_github,
+)
 from .mocks.mock_nvim import MockNvim
 
 
@@ -88,6 +107,221 @@ class SimpleNvimGithubTest(unittest.TestCase):
         result = self.github.active_issues
         assert result == issue_list
 
+    def test_get_all_open_issues_request_count(self) -> None:
+        issue_count: int = 300
+        recently: datetime = datetime.now() - timedelta(days=1)
+
+        self.api.repo.issues = [
+            MockGitHubIssue(
+                number=number,
+                title=f"Issue {number}",
+                labels=[MockGitHubLabel("backlog")],
+                body="Issue body",
+                comments=[
+                    MockGitHubComment(
+                        number=comment, body=f"Comment {comment}", updated_at=recently
+                    )
+                    for comment in range(2)
+                ],
+                created_at=recently,
+            )
+            for number in range(1, issue_count + 1)
+        ]
+        self.api.requests.count = 0
+
+        result: List[GitHubIssue] = self.github.get_all_open_issues()
+
+        assert len(result) == issue_count
+        assert all(len(issue.all_comments) == 3 for issue in result)
+
+        # The repo handle is reused, so only 3 pages of issues and 6 pages of
+        # comments are needed, rather than a request for every issue.
+        assert self.api.requests.count == 9
+        assert self.api.requests.count / issue_count < 0.05
+
+    def test_get_all_open_issues_old_issue(self) -> None:
+        recently: datetime = datetime.now() - timedelta(days=1)
+
+        def make_comments(count: int, updated_at: datetime) -> List[MockGitHubComment]:
+            return [
+                MockGitHubComment(number=comment, body="Comment", updated_at=updated_at)
+                for comment in range(count)
+            ]
+
+        self.api.repo.issues = [
+            MockGitHubIssue(
+                number=1,
+                title="Old Issue",
+                comments=make_comments(2, parser.parse("2018-08-19 18:18")),
+            ),
+            MockGitHubIssue(
+                number=2,
+                title="Closed Issue",
+                comments=make_comments(500, parser.parse("2018-09-01 10:00")),
+                state="closed",
+            ),
+            MockGitHubIssue(
+                number=3,
+                title="New Issue",
+                comments=make_comments(2, recently),
+                created_at=recently,
+            ),
+        ]
+        self.api.requests.count = 0
+
+        result: List[GitHubIssue] = self.github.get_all_open_issues()
+        assert [len(issue.all_comments) for issue in result] == [3, 3]
+
+        # The old issue gets its comments on its own, so the repo listing
+        # doesn't page through every comment since it was made.
+        assert self.api.requests.count == 3
+
+    def test_sync_open_issues(self) -> None:
+        initial_issues: List[GitHubIssue] = self.github.active_issues
+        assert [issue.number for issue in initial_issues] == [1, 2]
+
+        # Close the first issue, comment on the second and add a third.
+        self.api.repo.issues[0].state = "closed"
+        self.api.repo.issues[0].updated_at = parser.parse("2019-01-01 10:00")
+        self.api.repo.issues[1].updated_at = parser.parse("2019-01-01 11:00")
+        self.api.repo.issues[1].comments.append(
+            MockGitHubComment(
+                number=2,
+                body="New comment",
+                updated_at=parser.parse("2019-01-01 11:00"),
+            )
+        )
+        self.api.repo.issues.append(
+            MockGitHubIssue(
+                number=3,
+                title="Test Issue 3",
+                labels=[],
+                body="Third issue body",
+                comments=[],
+                updated_at=parser.parse("2019-01-01 12:00"),
+            )
+        )
+        self.api.requests.count = 0
+
+        result: List[GitHubIssue] = self.github.sync_open_issues()
+
+        assert [issue.number for issue in result] == [3, 2]
+        assert result[0].all_comments[0].body == ["Third issue body"]
+        assert result[1].all_comments[0].updated_at == "2019-01-01 11:00"
+        assert result[1].all_comments[1:] == initial_issues[1].all_comments[1:] + [
+            GitHubIssueComment(
+                number=3,
+                body=["New comment"],
+                tags=[],
+                updated_at="2019-01-01 11:00",
+            )
+        ]
+
+        # Only the changes should have been fetched, which is the changed
+        # issues and comments, and then the comments of the new issue. The new
+        # comment is merged into the cached comments by its ID.
+        assert self.api.requests.count == 3
+        assert self.github.refresh.marker is not None
+        assert self.github.refresh.marker["updated_at"] == "2019-01-01T12:00:00"
+
+        # With nothing else changed, only the latest issue should be fetched
+        # again, since the sync includes changes at the marker itself. Its
+        # comments haven't changed, so are kept from the cache.
+        set_cache(self.options.config_path, result, "open_issues")
+        set_cache(self.options.config_path, self.github.refresh.marker, "issue_sync")
+        self.api.requests.count = 0
+
+        assert self.github.sync_open_issues() == result
+        assert self.api.requests.count == 2
+
+    def test_issues_not_modified(self) -> None:
+        config_path: str = self.options.config_path
+
+        # With no stored validators, the issues must be treated as changed.
+        assert self.github.issues_not_modified() == False
+        assert get_cache_validators(config_path, "open_issues") == {
+            "etag": '"initial"',
+            "last_modified": "",
+        }
+
+        # Then when nothing has changed, the requests should say so.
+        self.api.requests.count = 0
+        assert self.github.issues_not_modified() == True
+        assert self.api.requests.count == 2
+
+        self.api.requester.etag = '"changed"'
+        assert self.github.issues_not_modified() == False
+
+    def test_revalidate_open_issues(self) -> None:
+        self.github.active_issues
+        self.github.issues_not_modified()
+
+        # Expire the cache, then check an unmodified response renews it,
+        # without fetching any issues.
+        cache_index: Dict[str, Dict[str, Any]] = get_cache_index(
+            self.options.config_path
+        )
+        cache_index["open_issues"]["created"] = 1
+        write_cache_index(self.options.config_path, cache_index)
+        self.github.issues_set = None
+        self.api.requests.count = 0
+
+        result: List[GitHubIssue] = self.github.active_issues
+        assert self.api.requests.count == 2
+        assert result == self.github.get_all_open_issues()
+
+        cache_index = get_cache_index(self.options.config_path)
+        assert cache_index["open_issues"]["created"] > 1
+
+    def test_stale_open_issues(self) -> None:
+        cached_issues: List[GitHubIssue] = self.github.active_issues
+        refreshed: Event = Event()
+        self.github.refresh.callback = refreshed.set
+
+        # Expire the cache, but keep it within the hard expiry.
+        cache_index: Dict[str, Dict[str, Any]] = get_cache_index(
+            self.options.config_path
+        )
+        cache_index["open_issues"]["created"] = time.time() - 60 * 60
+        write_cache_index(self.options.config_path, cache_index)
+        self.github.issues_set = None
+        self.api.requests.gate = Event()
+
+        # The expired issues should be returned without waiting for GitHub,
+        # so the refresh can't have finished yet.
+        result: List[GitHubIssue] = self.github.active_issues
+        assert result == cached_issues
+        assert not refreshed.is_set()
+
+        # Then once GitHub replies, they are refreshed in the background.
+        self.api.requests.gate.set()
+        assert refreshed.wait(5)
+        assert self.github.issues == cached_issues
+        cache_index = get_cache_index(self.options.config_path)
+        assert cache_index["open_issues"]["created"] > time.time() - 60
+
+    def test_stale_open_issues_error(self) -> None:
+        self.github.active_issues
+        refreshed: Event = Event()
+        self.github.refresh.callback = refreshed.set
+
+        cache_index: Dict[str, Dict[str, Any]] = get_cache_index(
+            self.options.config_path
+        )
+        cache_index["open_issues"]["created"] = time.time() - 60 * 60
+        write_cache_index(self.options.config_path, cache_index)
+        self.github.issues_set = None
+        self.options.repo_name = ""
+        self.nvim.errors = []
+
+        # Errors from the background refresh are written on the main thread.
+        self.github.active_issues
+        assert refreshed.wait(5)
+        assert self.nvim.errors == []
+
+        self.nvim.run_async_calls()
+        assert self.nvim.errors == ["Github service not currently running...\n"]
+
     def test_filter_comments(self) -> None:
         self.github.active_issues[1].all_comments[2].tags = ["edit"]
 
@@ -111,7 +345,7 @@ class SimpleNvimGithubTest(unittest.TestCase):
 
         change_list: List[Any] = [{"issue": 1, "comment": 2}]
 
-        result: Any = SimpleNvimGithub.filter_comments(self.github.issues, "edit")
+        result: Any = filter_comments(self.github.issues, "edit")
         assert result[0] == filtered_list
         assert result[1] == change_list
 
@@ -140,7 +374,7 @@ class SimpleNvimGithubTest(unittest.TestCase):
 
         change_list: List[int] = [1]
 
-        result: Any = SimpleNvimGithub.filter_issues(self.github.issues, "edit")
+        result: Any = filter_issues(self.github.issues, "edit")
         assert result[0] == filtered_list
         assert result[1] == change_list
 
@@ -167,12 +401,12 @@ class SimpleNvimGithubTest(unittest.TestCase):
         ]
 
         # Check the service is checked before being used.
-        self.github.repo_name = ""
+        self.options.repo_name = ""
         assert self.nvim.message_print_count == 0
         self.github.upload_comments(issue_list, "new")
         assert self.nvim.message_print_count == 1
 
-        self.github.repo_name = "CrossR/nvim_diary_template"
+        self.options.repo_name = "CrossR/nvim_diary_template"
         self.nvim.message_print_count = 0
         self.nvim.errors = []
 
@@ -213,12 +447,12 @@ class SimpleNvimGithubTest(unittest.TestCase):
         ]
 
         # Check the service is checked before being used.
-        self.github.repo_name = ""
+        self.options.repo_name = ""
         assert self.nvim.message_print_count == 0
         self.github.upload_issues(issue_list, "new")
         assert self.nvim.message_print_count == 1
 
-        self.github.repo_name = "CrossR/nvim_diary_template"
+        self.options.repo_name = "CrossR/nvim_diary_template"
         self.nvim.message_print_count = 0
         self.nvim.errors = []
 
@@ -260,12 +494,12 @@ class SimpleNvimGithubTest(unittest.TestCase):
         ]
 
         # Check the service is checked before being used.
-        self.github.repo_name = ""
+        self.options.repo_name = ""
         assert self.nvim.message_print_count == 0
         self.github.update_comments(issue_list, "edit")
         assert self.nvim.message_print_count == 1
 
-        self.github.repo_name = "CrossR/nvim_diary_template"
+        self.options.repo_name = "CrossR/nvim_diary_template"
         self.nvim.message_print_count = 0
         self.nvim.errors = []
 
@@ -344,6 +578,103 @@ class SimpleNvimGithubTest(unittest.TestCase):
         self.github.update_comments(issue_list, "edit")
         assert self.api.repo.issues[0].comments[1].body == "After the edit"
 
+    def test_update_comment_by_id(self) -> None:
+        comment_count: int = 250
+
+        self.api.repo.issues[0].comments = [
+            MockGitHubComment(
+                number=number,
+                body=f"Comment {number}",
+                updated_at=parser.parse("2018-01-01 10:00"),
+            )
+            for number in range(comment_count)
+        ]
+        target_comment: MockGitHubComment = self.api.repo.issues[0].comments[199]
+
+        # The comment IDs should be stored alongside the cached issues.
+        cached_issue: GitHubIssue = self.github.active_issues[0]
+        assert cached_issue.all_comments[200].comment_id == target_comment.id
+
+        cache: Any = load_cache(self.options.config_path, "open_issues")
+        assert cache[0].all_comments[200].comment_id == target_comment.id
+
+        issue_list: List[GitHubIssue] = [
+            GitHubIssue(
+                number=1,
+                title="Test Issue",
+                complete=False,
+                labels=[],
+                all_comments=[
+                    GitHubIssueComment(
+                        number=200,
+                        body=["Edited comment"],
+                        tags=["edit"],
+                        updated_at="2018-01-01 10:00",
+                    )
+                ],
+                metadata=[],
+            )
+        ]
+        self.api.requests.count = 0
+
+        # However long the thread, the comment is grabbed and edited directly,
+        # with the update time taken from the edit itself.
+        self.github.update_comments(issue_list, "edit")
+
+        assert target_comment.body == "Edited comment"
+        assert self.api.requests.count == 3
+        assert issue_list[0].all_comments[0].comment_id == target_comment.id
+        assert issue_list[0].all_comments[0].updated_at != "2018-01-01 10:00"
+
+    def test_update_comments_concurrently(self) -> None:
+        comment_count: int = 40
+        request_latency: float = 0.01
+
+        self.api.repo.issues[0].comments = [
+            MockGitHubComment(
+                number=number,
+                body=f"Comment {number}",
+                updated_at=parser.parse("2018-01-01 10:00"),
+            )
+            for number in range(comment_count)
+        ]
+
+        issue_list: List[GitHubIssue] = [
+            GitHubIssue(
+                number=1,
+                title="Test Issue",
+                complete=False,
+                labels=[],
+                all_comments=[
+                    GitHubIssueComment(
+                        number=number,
+                        body=[f"Edited comment {number}"],
+                        tags=["edit"],
+                        updated_at="2018-01-01 10:00",
+                    )
+                    for number in range(comment_count + 1)
+                ],
+                metadata=[],
+            )
+        ]
+
+        self.options.upload_concurrency = 8
+        self.api.requests.latency = request_latency
+
+        self.github.update_comments(issue_list, "edit")
+
+        # Every edit should be applied, and the results put back in the
+        # correct place, with several requests sent at once, but no more than
+        # the limit.
+        assert self.nvim.messages[-1] == (
+            f"Updated {comment_count + 1} comments on GitHub. "
+        )
+        assert self.api.repo.issues[0].body == "Edited comment 0"
+        assert [comment.body for comment in self.api.repo.issues[0].comments] == [
+            f"Edited comment {number}" for number in range(1, comment_count + 1)
+        ]
+        assert 1 < self.api.requests.peak_in_flight <= 8
+
     def test_update_issues(self) -> None:
         issue_list: List[GitHubIssue] = [
             GitHubIssue(
@@ -364,12 +695,12 @@ class SimpleNvimGithubTest(unittest.TestCase):
         ]
 
         # Check the service is checked before being used.
-        self.github.repo_name = ""
+        self.options.repo_name = ""
         assert self.nvim.message_print_count == 0
         self.github.update_issues(issue_list, "edit")
         assert self.nvim.message_print_count == 1
 
-        self.github.repo_name = "CrossR/nvim_diary_template"
+        self.options.repo_name = "CrossR/nvim_diary_template"
         self.nvim.message_print_count = 0
         self.nvim.errors = []
 
@@ -426,12 +757,12 @@ class SimpleNvimGithubTest(unittest.TestCase):
         ]
 
         # Check the service is checked before being used.
-        self.github.repo_name = ""
+        self.options.repo_name = ""
         assert self.nvim.message_print_count == 0
         self.github.complete_issues(issue_list)
         assert self.nvim.message_print_count == 1
 
-        self.github.repo_name = "CrossR/nvim_diary_template"
+        self.options.repo_name = "CrossR/nvim_diary_template"
         self.nvim.message_print_count = 0
         self.nvim.errors = []
 
@@ -450,6 +781,134 @@ class SimpleNvimGithubTest(unittest.TestCase):
         self.github.complete_issues(issue_list)
         assert self.api.repo.issues[0].state == "open"
 
+    def test_complete_issues_diff(self) -> None:
+        issue_list: List[GitHubIssue] = [
+            GitHubIssue(
+                number=number,
+                title=f"Test Issue {number}",
+                complete=number == 1,
+                labels=[],
+                all_comments=[],
+                metadata=[],
+            )
+            for number in (1, 2)
+        ]
+
+        assert [issue.number for issue in self.github.active_issues] == [1, 2]
+        self.api.requests.count = 0
+
+        # Only the toggled issue should be sent to GitHub.
+        self.github.complete_issues(issue_list)
+        assert self.api.repo.issues[0].state == "closed"
+        assert self.api.repo.issues[1].state == "open"
+        assert self.api.requests.count == 2
+
+        # The closed issue is no longer open, so there is nothing to do.
+        assert [issue.number for issue in self.github.active_issues] == [2]
+        cached_issues: Optional[List[Any]] = load_cache(
+            self.options.config_path, "open_issues"
+        )
+        assert cached_issues is not None
+        assert [issue.number for issue in cached_issues] == [2]
+        self.api.requests.count = 0
+
+        self.github.complete_issues(issue_list)
+        assert self.api.requests.count == 0
+        assert self.nvim.messages[-1] == (
+            "Changed the completion status of 0 issues on GitHub. "
+        )
+
+        # Reopening an issue should still be sent.
+        issue_list[0].complete = False
+        self.github.complete_issues(issue_list)
+        assert self.api.repo.issues[0].state == "open"
+        assert self.api.requests.count == 2
+
+    def test_complete_issues_after_merge(self) -> None:
+        open_issues: List[GitHubIssue] = deepcopy(self.github.active_issues)
+        local_issue: GitHubIssue = GitHubIssue(
+            number=0,
+            title="local",
+            complete=False,
+            labels=[],
+            all_comments=[
+                GitHubIssueComment(
+                    number=0, body=["Body"], tags=["new"], updated_at="0000-00-00 00:00"
+                )
+            ],
+            metadata=[],
+        )
+        edited_issue: GitHubIssue = deepcopy(open_issues[1])
+        edited_issue.all_comments.append(
+            GitHubIssueComment(
+                number=3, body=["New"], tags=["new"], updated_at="0000-00-00 00:00"
+            )
+        )
+
+        # Merging the buffer issues into the open issues, as a refresh does,
+        # shouldn't add the buffer issues or comments to the open issues.
+        combined_issues: List[GitHubIssue] = combine_issues(
+            self.nvim, [edited_issue, local_issue], self.github.active_issues
+        )
+        assert [issue.number for issue in combined_issues] == [1, 2, 0]
+        assert self.github.active_issues == open_issues
+
+        # So they aren't written to the cache when it is next set.
+        closed_issue: GitHubIssue = deepcopy(open_issues[0])
+        closed_issue.complete = True
+        self.github.complete_issues([closed_issue])
+
+        cached_issues: Optional[List[Any]] = load_cache(
+            self.options.config_path, "open_issues"
+        )
+        assert cached_issues is not None
+        assert list(cached_issues) == open_issues[1:]
+
+    def test_upload_pass(self) -> None:
+        issue_list: List[GitHubIssue] = [
+            GitHubIssue(
+                number=1,
+                title="Edited Issue",
+                complete=True,
+                labels=[],
+                all_comments=[
+                    GitHubIssueComment(
+                        number=0,
+                        body=["This is the main issue body"],
+                        tags=[],
+                        updated_at="2018-01-01 10:00",
+                    )
+                ],
+                metadata=["edit"],
+            )
+        ]
+
+        # Outside of a pass, the issue is fetched for every operation.
+        self.options.diff_issue_completion = False
+        self.api.requests.count = 0
+        self.github.update_issues(issue_list, "edit")
+        self.github.complete_issues(issue_list)
+        assert self.api.requests.count == 4
+
+        self.api.repo.issues[0].state = "open"
+        self.api.requests.count = 0
+        self.nvim.messages = []
+
+        # Whereas in a pass, even a nested one, it is only fetched once.
+        with self.github.upload_pass():
+            self.github.update_issues(issue_list, "edit")
+
+            with self.github.upload_pass():
+                self.github.complete_issues(issue_list)
+
+            assert self.github.handles.issues is not None
+
+        assert self.github.handles.issues is None
+        assert self.api.repo.issues[0].title == "Edited Issue"
+        assert self.api.repo.issues[0].state == "closed"
+        assert self.api.requests.count == 3
+        assert self.nvim.messages[-1] == "Saved 2 requests to GitHub. "
+
     def test_missing_service(self) -> None:
 
         # Setup an object with no service to check that.
@@ -476,6 +935,18 @@ class SimpleNvimGithubTest(unittest.TestCase):
         assert self.nvim.message_print_count == 8
         assert len(set(self.nvim.errors)) == 1
 
+        # Commands run on a worker thread, so the error is passed to the main
+        # thread to be written, rather than failing the command.
+        self.nvim.errors = []
+        thread: Thread = Thread(target=test_github.get_all_open_issues)
+        thread.start()
+        thread.join()
+
+        assert self.nvim.errors == []
+
+        self.nvim.run_async_calls()
+        assert self.nvim.errors == ["Github service not currently running...\n"]
+
     def test_service_not_valid(self) -> None:
         assert self.github.active == True
         self.github.service = None
@@ -1,12 +1,15 @@
 import unittest
+from threading import Event, Thread
 from typing import Any, Dict, List, Union
 
-from datetime import date
+from datetime import date, datetime, time, timedelta
 from dateutil import parser
 
 from ..classes.calendar_event_class import CalendarEvent
 from ..classes.nvim_google_cal_class import SimpleNvimGoogleCal
 from ..classes.plugin_options import PluginOptions
+from ..helpers.file_helpers import get_cache_index, load_cache, write_cache_index
+from ..helpers.google_calendar_helpers import get_calendar_objects
 from ..utils.constants import ISO_FORMAT
 from .mocks.mock_gcal import MockGCalService, get_mock_gcal
 from .mocks.mock_nvim import MockNvim
@@ -46,6 +49,186 @@ class SimpleNvimGoogleCalTest(unittest.TestCase):
         result: List[CalendarEvent] = self.google.get_events_for_date(diary_date)
         assert result == event_list
 
+    def test_get_events_for_date_batched(self) -> None:
+        calendar_count: int = 12
+
+        self.google.all_calendars = {
+            f"Calendar {number}": f"calendar_{number}"
+            for number in range(calendar_count)
+        }
+        self.api._request_count = 0
+
+        result: List[CalendarEvent] = self.google.get_events_for_date(
+            date(2019, 11, 10)
+        )
+
+        # All the calendars should be fetched in a single round trip, rather
+        # than one after another.
+        assert [event.name for event in result] == ["Event 1", "Event 2"]
+        assert self.api._events_call_num == calendar_count
+        assert self.api._request_count == 1
+
+    def test_sync_events(self) -> None:
+        today: str = str(date.today())
+
+        def make_event(event_id: str, name: str, hour: int) -> Dict[str, Any]:
+            return {
+                "id": event_id,
+                "summary": name,
+                "start": {"dateTime": f"{today}T{hour}:00:00Z"},
+                "end": {"dateTime": f"{today}T{hour}:30:00Z"},
+            }
+
+        self.api._event_json = {
+            "items": [
+                make_event("event1", "Event 1", 10),
+                make_event("event2", "Event 2", 12),
+            ]
+        }
+        self.google.all_calendars = {"GMail Events": "gmail_events"}
+        self.api._request_count = 0
+
+        # The first sync has to get every event, and stores the sync token.
+        result: List[CalendarEvent] = self.google.get_events_for_date(date.today())
+        assert [event.name for event in result] == ["Event 1", "Event 2"]
+        assert self.api._request_count == 1
+        assert load_cache(self.options.config_path, "event_sync") == {
+            "date": today,
+            "tokens": {"gmail_events": "sync_token_1"},
+        }
+
+        # After a restart, only the changes are fetched and patched in.
+        self.google = SimpleNvimGoogleCal(self.nvim, self.options, self.api)
+        self.google.all_calendars = {"GMail Events": "gmail_events"}
+        self.api._changes = [
+            {"id": "event1", "status": "cancelled"},
+            make_event("event2", "Event 2 (Moved)", 14),
+            make_event("event3", "Event 3", 16),
+            {
+                "id": "event4",
+                "summary": "Event 4",
+                "start": {"date": "2000-01-01"},
+                "end": {"date": "2000-01-02"},
+            },
+        ]
+        self.api._request_count = 0
+
+        result = self.google.get_events_for_date(date.today())
+        assert [event.name for event in result] == ["Event 2 (Moved)", "Event 3"]
+        assert self.api._request_count == 1
+        assert self.google.active_events == result
+
+        # Once the sync token has expired, all the events are fetched again.
+        # The mock only returns events for the first calls, which here are both
+        # the expired sync and the full listing.
+        self.api._sync_token = "sync_token_2"
+        self.api._events_call_num = -1
+        self.api._request_count = 0
+
+        result = self.google.get_events_for_date(date.today())
+        assert [event.name for event in result] == ["Event 1", "Event 2"]
+        assert self.api._request_count == 2
+        assert load_cache(self.options.config_path, "event_sync") == {
+            "date": today,
+            "tokens": {"gmail_events": "sync_token_2"},
+        }
+
+    def test_active_events_from_yesterday(self) -> None:
+        self.google.active_events
+        self.options.event_cache_hard_expiry = 48 * 60
+        refreshed: Event = Event()
+        self.google.refresh.callback = refreshed.set
+
+        # Events cached before midnight are for yesterday, so shouldn't be
+        # used, even while they are refreshed in the background.
+        yesterday: datetime = datetime.combine(date.today(), time.min) - timedelta(
+            minutes=1
+        )
+        cache_index: Dict[str, Dict[str, Any]] = get_cache_index(
+            self.options.config_path
+        )
+        cache_index["events"]["created"] = yesterday.timestamp()
+        write_cache_index(self.options.config_path, cache_index)
+        self.google.events_set = yesterday
+        self.api._request_count = 0
+
+        self.google.active_events
+        assert self.api._request_count == 1
+        assert not refreshed.is_set()
+        cache_index = get_cache_index(self.options.config_path)
+        assert cache_index["events"]["created"] > yesterday.timestamp()
+
+    def test_get_events_for_date_prefetched(self) -> None:
+        yesterday: date = date.today() - timedelta(days=1)
+        next_week: date = date.today() + timedelta(days=7)
+
+        def make_event(name: str, day: date) -> Dict[str, Any]:
+            return {
+                "id": name,
+                "summary": name,
+                "start": {"dateTime": f"{day}T10:00:00Z"},
+                "end": {"dateTime": f"{day}T11:00:00Z"},
+            }
+
+        self.api._event_json = {
+            "items": [
+                make_event("Yesterday", yesterday),
+                make_event("Next Week", next_week),
+                make_event("Next Week Again", next_week),
+            ]
+        }
+        self.api._request_count = 0
+
+        # The whole window is fetched in one go, so other days in it are free.
+        result: List[CalendarEvent] = self.google.get_events_for_date(yesterday)
+        assert [event.name for event in result] == ["Yesterday"]
+        assert self.api._request_count == 1
+
+        result = self.google.get_events_for_date(next_week)
+        assert [event.name for event in result] == ["Next Week", "Next Week Again"]
+        assert self.google.get_events_for_date(yesterday - timedelta(days=1)) == []
+        assert self.api._request_count == 1
+
+        # Days outside of the window still need to be fetched.
+        self.google.get_events_for_date(date.today() + timedelta(days=30))
+        assert self.api._request_count == 2
+
+        # Uploaded events should be added to the window, without fetching it again.
+        new_event: CalendarEvent = CalendarEvent(
+            name="New Event",
+            start=f"{yesterday}T12:00:00.000000",
+            end=f"{yesterday}T13:00:00.000000",
+        )
+        self.google.upload_to_calendar([new_event], yesterday)
+        assert self.api._request_count == 3
+
+        result = self.google.get_events_for_date(yesterday)
+        assert [event.name for event in result] == ["Yesterday", "New Event"]
+        assert self.api._request_count == 3
+
+    def test_get_events_for_date_from_thread(self) -> None:
+        self.google.all_calendars = {
+            "GMail Events": "gmail_events",
+            "Broken Calendar": "broken",
+        }
+        self.api._failing_calendars = {"broken"}
+        result: List[CalendarEvent] = []
+
+        def get_events() -> None:
+            result.extend(self.google.get_events_for_date(date(2019, 11, 10)))
+
+        # A failed calendar is reported back on the main thread, and doesn't
+        # stop the events of the other calendars being returned.
+        thread: Thread = Thread(target=get_events)
+        thread.start()
+        thread.join()
+
+        assert [event.name for event in result] == ["Event 1", "Event 2"]
+        assert self.nvim.errors == []
+
+        self.nvim.run_async_calls()
+        assert self.nvim.errors == ["Error getting events from Broken Calendar.\n"]
+
     def test_service_is_not_ready(self) -> None:
         assert self.google.active == True
         self.google.service = None
@@ -64,6 +247,17 @@ class SimpleNvimGoogleCalTest(unittest.TestCase):
         result: Union[List[str], Dict[str, str]] = self.google.get_all_calendars()
         assert result == all_calendars
 
+    def test_get_all_calendars_paged(self) -> None:
+        self.options.calendar_page_size = 4
+        self.api._request_count = 0
+
+        # Every page of calendars should be followed, not just the first.
+        result: Union[List[str], Dict[str, str]] = self.google.get_all_calendars()
+        assert isinstance(result, dict)
+        assert len(result) == 6
+        assert result["Holidays in United Kingdom"] == "holInUk"
+        assert self.api._request_count == 2
+
     def test_filter_calendars(self) -> None:
         filtered_calendars: Dict[str, str] = {
             "NVim Notes": "NvimNotesCal123",
@@ -111,10 +305,49 @@ class SimpleNvimGoogleCalTest(unittest.TestCase):
                 end=parser.parse("2019-11-10T19:30:00Z").strftime(ISO_FORMAT),
             ),
         ]
+        self.google.events_set = datetime.now()
 
+        self.api._request_count = 0
         self.google.upload_to_calendar(all_events, date.today())
-        # 3 inserts + 6 calendar event look ups.
-        assert self.google.service._events_call_num == 9
+
+        # The 3 inserts should be sent in one batch, without looking up the
+        # calendar events again.
+        assert self.google.service._events_call_num == 3
+        assert self.api._request_count == 1
+        assert self.nvim.messages[-1] == "Added 3 events to Google calendar.\n"
+
+        # The new events should be in the cache, with their IDs.
+        assert [event.name for event in self.google.events] == [
+            "Event 3",
+            "Event 1",
+            "Event 2",
+            "Event 4",
+        ]
+        assert self.google.events[-1].event_id == "inserted_3"
+        assert self.google.events[-1].calendar_id == "NvimNotesCal123"
+        cache: Any = load_cache(self.options.config_path, "events")
+        assert get_calendar_objects(cache) == self.google.events
+
+        # Uploading before today's events are loaded should still keep the
+        # cached events.
+        new_event: CalendarEvent = CalendarEvent(
+            name="Event 5",
+            start=parser.parse("2019-11-10T23:00:00Z").strftime(ISO_FORMAT),
+            end=parser.parse("2019-11-10T23:30:00Z").strftime(ISO_FORMAT),
+        )
+        google: SimpleNvimGoogleCal = SimpleNvimGoogleCal(
+            self.nvim, self.options, self.api
+        )
+        google.upload_to_calendar([new_event], date.today())
+
+        cache = load_cache(self.options.config_path, "events")
+        assert [event.name for event in get_calendar_objects(cache)] == [
+            "Event 3",
+            "Event 1",
+            "Event 2",
+            "Event 4",
+            "Event 5",
+        ]
 
     def test_get_calendar_id(self) -> None:
         assert self.google.get_calendar_id() == "NvimNotesCal123"
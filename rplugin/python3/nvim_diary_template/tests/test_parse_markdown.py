@@ -10,6 +10,7 @@ from ..utils.constants import ISO_FORMAT
 from ..utils.parse_markdown import (
     combine_events,
     combine_issues,
+    parse_buffer_issues,
     parse_markdown_file_for_events,
     parse_markdown_file_for_issues,
     remove_events_not_from_today,
@@ -189,6 +190,57 @@ class parse_markdownTest(unittest.TestCase):
         result: List[GitHubIssue] = parse_markdown_file_for_issues(self.nvim)
         assert result == issues
 
+    def test_parse_buffer_issues(self) -> None:
+        issue_lines: List[str] = [
+            "#### [X] Issue {3}: +label:work +label:blocked +edit",
+            "##### Title:   Completed Issue  ",
+            "",
+            "##### Comment {0} - 2018-01-01 12:00: +edit",
+            "# A markdown heading in the body",
+            "#### Not an issue",
+            "",
+            "### Next Group",
+            "",
+            "#### [ ] Issue {4}:",
+            "##### Title: Open Issue",
+            "",
+            "##### Comment {0} - 2018-01-02 13:00:",
+            "",
+        ]
+
+        issues: List[GitHubIssue] = [
+            GitHubIssue(
+                number=3,
+                title="Completed Issue",
+                complete=True,
+                labels=["work", "blocked"],
+                metadata=["edit"],
+                all_comments=[
+                    GitHubIssueComment(
+                        number=0,
+                        body=["# A markdown heading in the body", "#### Not an issue"],
+                        tags=["edit"],
+                        updated_at="2018-01-01 12:00",
+                    )
+                ],
+            ),
+            GitHubIssue(
+                number=4,
+                title="Open Issue",
+                complete=False,
+                labels=[],
+                metadata=[],
+                all_comments=[
+                    GitHubIssueComment(
+                        number=0, body=[], tags=[], updated_at="2018-01-02 13:00"
+                    )
+                ],
+            ),
+        ]
+
+        result: List[GitHubIssue] = parse_buffer_issues(issue_lines)
+        assert result == issues
+
     def test_parse_markdown_file_for_grouped_issues(self) -> None:
         self.nvim.current.buffer.lines = [
             "<!---",
@@ -11,12 +11,21 @@ DIARY_FOLDER = "diary"
 DIARY_INDEX_FILE = "diary.md"
 
 # Google Calendar Constants
-CACHE_EPOCH_REGEX = "([0-9])+"
+CACHE_INDEX_FILE = "nvim_diary_template_cache_index.json"
+OLD_CACHE_FILE_REGEX = r"nvim_diary_template_(.+)_cache_([0-9]+)\.json"
 CALENDAR_CACHE_DURATION = timedelta(days=31)
 LABELS_CACHE_DURATION = timedelta(days=31)
 REPO_CACHE_DURATION = timedelta(days=1)
 EVENT_CACHE_DURATION = timedelta(minutes=30)
 ISSUE_CACHE_DURATION = timedelta(minutes=30)
+ISSUE_FULL_SYNC_DURATION = timedelta(days=1)
+GOOGLE_BATCH_LIMIT = 50
+MEMORY_CACHE_SIZE = 16
+PACKED_CACHE_NAMES = ("open_issues", "events", "event_window")
+
+# GitHub Constants
+GITHUB_PAGE_SIZE = 100
+ISSUE_COMMENT_WINDOW = timedelta(days=30)
 
 # DateTime Formats
 TIME_FORMAT = "%H:%M"
@@ -27,6 +36,15 @@ ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
 DATETIME_REGEX = r"[0-9]{1,2}[\/\-.][0-9]{1,2}[\/\-.][0-9]{4} [0-9]{1,2}:[0-9]{2}"
 TIME_REGEX = r"[0-9]{1,2}:[0-9]{1,2}"
 
+# The date and time formats that the plugin and Google write, which can be
+# parsed without dateutil.
+FAST_DATE_TIME_REGEX = (
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})"
+    r"(?:[T ]([0-9]{1,2}):([0-9]{2})(?::([0-9]{2})(?:\.([0-9]{1,6}))?)?"
+    r"(Z|[+-][0-9]{2}:[0-9]{2})?)?"
+)
+FAST_TIME_REGEX = r"([0-9]{1,2}):([0-9]{2})"
+
 # To-do Existence and State Regex
 TODO_REGEX = r"(?<=\[[ .oOX]\]: ).*$"
 TODO_IS_CHECKED = r"\[X\]"
@@ -46,6 +64,18 @@ ISSUE_METADATA = r"\+[a-zA-Z0-9]+"
 ISSUE_LABELS = r"\+label:[a-zA-Z0-9]+"
 SUBGROUP_HEADING = r"^### [a-zA-Z0-9]"
 
+# All the issue heading lines in one, to find the kind of a line and its parts
+# with a single match.
+ISSUE_LINE_REGEX = (
+    r"^(?:"
+    r"(?P<issue>#### \[(?P<issue_check>[ X])\] Issue \{(?P<issue_number>[0-9]+)\}:)"
+    r"|(?P<title>##### Title: )"
+    r"|(?P<comment>##### Comment \{(?P<comment_number>[0-9]+)\} - "
+    r"(?P<updated_at>[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}):)"
+    r"|(?P<subgroup>### [a-zA-Z0-9])"
+    r")"
+)
+
 # Event related Regex
 EVENT_REGEX = r"(?<=: ).*$"
 CALENDAR_REGEX = r"{cal:(.+)}"
@@ -2,14 +2,16 @@
 
 Functions to build and parse the issue section of the markdown.
 """
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from pynvim import Nvim
 
+from ..classes.diary_document_class import DiaryDocument
 from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
 from ..classes.plugin_options import PluginOptions
+from ..helpers.diff_helpers import merge_line_changes
 from ..helpers.issue_helpers import check_markdown_style, sort_issues
-from ..helpers.neovim_helpers import get_buffer_contents, get_section_line
+from ..helpers.neovim_helpers import get_buffer_document, set_lines_from_diff
 from ..utils.constants import (
     EMPTY_TODO,
     HEADING_3,
@@ -182,25 +184,57 @@ def remove_tag_from_issues(
 
 
 def set_issues_from_issues_list(
-    nvim: Nvim, options: PluginOptions, issues: List[GitHubIssue], should_sort: bool
-) -> None:
+    nvim: Nvim,
+    options: PluginOptions,
+    issues: List[GitHubIssue],
+    should_sort: bool,
+    base_lines: Optional[List[str]] = None,
+) -> bool:
     """set_issues_from_issues_list
 
     Update the issues for the current buffer with a new list of issues.
+
+    If the lines of the issues section that the list was made from are given,
+    any changes made to the section since then are kept, as long as they don't
+    overlap the changes to the issues. If they do, nothing is set, and False
+    is returned.
     """
 
     # Get the formatted lines to set.
     issue_lines: List[str] = format_issues(options, issues, should_sort)
 
-    buffer_number: int = nvim.current.buffer.number
-    current_buffer: List[str] = get_buffer_contents(nvim)
+    document: DiaryDocument = get_buffer_document(nvim)
+    old_issues_start_line, old_issues_end_line = get_issues_section_range(document)
+    old_issue_lines: List[str] = document.lines[
+        old_issues_start_line:old_issues_end_line
+    ]
+
+    if base_lines is not None and base_lines != old_issue_lines:
+        merged_lines: Optional[List[str]] = merge_line_changes(
+            base_lines, old_issue_lines, issue_lines
+        )
+
+        if merged_lines is None:
+            return False
+
+        issue_lines = merged_lines
+
+    # Only the lines that changed are sent.
+    set_lines_from_diff(nvim, old_issue_lines, issue_lines, old_issues_start_line)
+
+    return True
+
+
+def get_issues_section_range(document: DiaryDocument) -> Tuple[int, int]:
+    """get_issues_section_range
+
+    Get the range of lines, [start, end), that hold the issues in the given
+    document.
+    """
 
     # We want the line after, as this gives the line of the heading.
     # Then add one to the end to replace the newline, as we add one.
-    old_issues_start_line: int = get_section_line(current_buffer, ISSUE_HEADING) + 1
-
-    old_issues_end_line: int = get_section_line(current_buffer, SCHEDULE_HEADING) - 1
+    old_issues_start_line: int = document.section_line(ISSUE_HEADING) + 1
+    old_issues_end_line: int = document.section_line(SCHEDULE_HEADING) - 1
 
-    nvim.api.buf_set_lines(
-        buffer_number, old_issues_start_line, old_issues_end_line, True, issue_lines
-    )
+    return old_issues_start_line, old_issues_end_line
@@ -4,6 +4,7 @@ Functions to open the markdown files from the filesystem, or make them if
 they don't exist.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
 from typing import Dict, List
 
@@ -52,46 +53,93 @@ def make_diary(
         nvim.err_write("Options weren't initialised, aborting.\n")
         return
 
-    full_markdown: List[str] = []
-
     diary_date: str = get_diary_date(nvim)
-    diary_metadata: Dict[str, str] = {"Date": diary_date}
 
-    full_markdown.extend(generate_markdown_metadata(diary_metadata))
-    set_buffer_contents(nvim, full_markdown)
+    # The issues and events are fetched at the same time, since each can mean
+    # a round trip to GitHub or Google. Neither uses NeoVim, apart from
+    # errors, which are passed back to the main thread to be written once the
+    # diary is made.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        issues_future: "Future[List[GitHubIssue]]" = executor.submit(
+            get_diary_issues, options, github_service
+        )
+        events_future: "Future[List[CalendarEvent]]" = executor.submit(
+            get_diary_events, options, gcal_service, diary_date
+        )
 
-    for heading in options.daily_headings:
-        full_markdown.append(f"## {heading}")
-        full_markdown.append("")
+        issues: List[GitHubIssue] = issues_future.result()
+        days_events: List[CalendarEvent] = events_future.result()
+
+    full_markdown: List[str] = build_diary(options, diary_date, issues, days_events)
+
+    # Set the buffer contents and save the file.
     set_buffer_contents(nvim, full_markdown)
+    nvim.command(":w")
+
+    if options.auto_generate_diary_index:
+        generate_diary_index(options)
+
+
+def get_diary_issues(
+    options: PluginOptions, github_service: SimpleNvimGithub
+) -> List[GitHubIssue]:
+    """get_diary_issues
+
+    Get the issues to put in a new diary, if GitHub is in use.
+    """
 
-    # Add in issues section
-    issues: List[GitHubIssue] = []
     if options.use_github_repo and github_service and github_service.active:
-        issues = github_service.active_issues
+        return github_service.active_issues
 
-    issue_markdown: List[str] = produce_issue_markdown(options, issues)
-    full_markdown.extend(issue_markdown)
-    set_buffer_contents(nvim, full_markdown)
+    return []
+
+
+def get_diary_events(
+    options: PluginOptions, gcal_service: SimpleNvimGoogleCal, diary_date: str
+) -> List[CalendarEvent]:
+    """get_diary_events
+
+    Get the events to put in a new diary, if Google calendar is in use.
+    """
 
-    # Add in the calendar entries
-    days_events: List[CalendarEvent] = []
     if options.use_google_calendar and gcal_service and gcal_service.active:
         date_today_object: date = parser.parse(diary_date).date()
         if date_today_object == date.today():
-            days_events = gcal_service.active_events
-        else:
-            days_events = gcal_service.get_events_for_date(date_today_object)
+            return gcal_service.active_events
 
-    schedule_markdown: List[str] = produce_schedule_markdown(days_events)
-    full_markdown.extend(schedule_markdown)
+        return gcal_service.get_events_for_date(date_today_object)
 
-    # Set the buffer contents and save the file.
-    set_buffer_contents(nvim, full_markdown)
-    nvim.command(":w")
+    return []
 
-    if options.auto_generate_diary_index:
-        generate_diary_index(options)
+
+def build_diary(
+    options: PluginOptions,
+    diary_date: str,
+    issues: List[GitHubIssue],
+    days_events: List[CalendarEvent],
+) -> List[str]:
+    """build_diary
+
+    Build the full markdown for a new diary, from each of its parts in turn,
+    so that it can be set in a single write.
+    """
+
+    full_markdown: List[str] = []
+
+    diary_metadata: Dict[str, str] = {"Date": diary_date}
+    full_markdown.extend(generate_markdown_metadata(diary_metadata))
+
+    for heading in options.daily_headings:
+        full_markdown.append(f"## {heading}")
+        full_markdown.append("")
+
+    # Add in issues section
+    full_markdown.extend(produce_issue_markdown(options, issues))
+
+    # Add in the calendar entries
+    full_markdown.extend(produce_schedule_markdown(days_events))
+
+    return full_markdown
 
 
 def generate_markdown_metadata(metadata_obj: Dict[str, str]) -> List[str]:
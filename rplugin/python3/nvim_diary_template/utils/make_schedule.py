@@ -7,9 +7,10 @@ from typing import List
 from pynvim import Nvim
 
 from ..classes.calendar_event_class import CalendarEvent
+from ..classes.diary_document_class import DiaryDocument
 from ..helpers.event_helpers import sort_events
 from ..helpers.google_calendar_helpers import convert_events
-from ..helpers.neovim_helpers import get_buffer_contents, get_section_line
+from ..helpers.neovim_helpers import get_buffer_document, set_lines_from_diff
 from ..utils.constants import BULLET_POINT, SCHEDULE_HEADING, TIME_FORMAT
 
 
@@ -64,19 +65,19 @@ def set_schedule_from_events_list(
 
     event_lines: List[str] = format_events_lines(events)
 
-    buffer_number: int = nvim.current.buffer.number
-    current_buffer: List[str] = get_buffer_contents(nvim)
+    document: DiaryDocument = get_buffer_document(nvim)
 
     # We want the line after, as this gives the line of the heading.
     # Then add one to the end to replace the newline, as we add one.
-    old_events_start_line: int = get_section_line(current_buffer, SCHEDULE_HEADING) + 1
+    old_events_start_line: int = document.section_line(SCHEDULE_HEADING) + 1
 
     old_events_end_line: int = old_events_start_line + len(events) + 1
 
-    nvim.api.buf_set_lines(
-        buffer_number,
+    # Only the lines that changed are sent.
+    set_lines_from_diff(
+        nvim,
+        document.lines[old_events_start_line:old_events_end_line],
+        event_lines,
         old_events_start_line,
-        old_events_end_line,
         strict_indexing,
-        event_lines,
     )
@@ -4,21 +4,21 @@ Functions for the parsing of the document markdown.
 """
 
 import re
+from dataclasses import replace
 from datetime import date
-from typing import List, Match, Optional
+from typing import List, Match, Optional, Pattern, cast
 
-from dateutil import parser
 from pynvim import Nvim
 
 from ..classes.calendar_event_class import CalendarEvent
+from ..classes.diary_document_class import DiaryDocument
 from ..classes.github_issue_class import GitHubIssue, GitHubIssueComment
 from ..helpers.event_helpers import format_event
-from ..helpers.google_calendar_helpers import convert_events
+from ..helpers.google_calendar_helpers import convert_events, get_time
 from ..helpers.issue_helpers import get_issue_index
 from ..helpers.neovim_helpers import (
-    get_buffer_contents,
+    get_buffer_document,
     get_diary_date,
-    get_section_line,
     set_line_content,
 )
 from ..utils.constants import (
@@ -26,19 +26,20 @@ from ..utils.constants import (
     DATETIME_REGEX,
     EVENT_REGEX,
     ISO_FORMAT,
-    ISSUE_COMMENT,
     ISSUE_HEADING,
     ISSUE_LABELS,
+    ISSUE_LINE_REGEX,
     ISSUE_METADATA,
-    ISSUE_START,
-    ISSUE_TITLE,
     SCHEDULE_HEADING,
-    SUBGROUP_HEADING,
     TIME_FORMAT,
     TIME_REGEX,
-    TODO_IS_CHECKED,
+    VIMWIKI_TODO,
 )
 
+ISSUE_LINE_PATTERN: Pattern[str] = re.compile(ISSUE_LINE_REGEX)
+ISSUE_METADATA_PATTERN: Pattern[str] = re.compile(ISSUE_METADATA)
+ISSUE_LABELS_PATTERN: Pattern[str] = re.compile(ISSUE_LABELS)
+
 
 def parse_buffer_events(
     event_lines: List[str], format_string: str, diary_date: str
@@ -60,15 +61,15 @@ def parse_buffer_events(
 
         if not matches_date_time:
             matches_time: List[str] = re.findall(TIME_REGEX, event)
-            start_date: str = parser.parse(f"{diary_date} {matches_time[0]}").strftime(
+            start_date: str = get_time(f"{diary_date} {matches_time[0]}").strftime(
                 format_string
             )
-            end_date: str = parser.parse(f"{diary_date} {matches_time[1]}").strftime(
+            end_date: str = get_time(f"{diary_date} {matches_time[1]}").strftime(
                 format_string
             )
         else:
-            start_date = parser.parse(matches_date_time[0]).strftime(format_string)
-            end_date = parser.parse(matches_date_time[1]).strftime(format_string)
+            start_date = get_time(matches_date_time[0]).strftime(format_string)
+            end_date = get_time(matches_date_time[1]).strftime(format_string)
 
         event_name_search: Optional[Match[str]] = re.search(EVENT_REGEX, event)
         event_details: str = event_name_search[
@@ -113,61 +114,62 @@ def parse_buffer_issues(issue_lines: List[str]) -> List[GitHubIssue]:
     comment_number: int = -1
 
     for line in issue_lines:
-        # If its the start of a new issue, add a new object.
-        # Reset the comment number.
-        if re.findall(ISSUE_START, line):
-            issue_number += 1
-            comment_number = -1
-            metadata: List[str] = re.findall(ISSUE_METADATA, line)
-            labels: List[str] = re.findall(ISSUE_LABELS, line)
-
-            # Strip the leading '+' from the metadata.
-            metadata = [tag[1:] for tag in metadata if not tag.startswith("+label")]
-
-            # Strip the leading '+label:' from the labels.
-            labels = [label[7:] for label in labels]
-
-            formatted_issues.append(
-                GitHubIssue(
-                    number=int(re.findall(r"\d+", line)[0]),
-                    complete=re.search(TODO_IS_CHECKED, line) is not None,
-                    title="",
-                    labels=labels,
-                    all_comments=[],
-                    metadata=metadata,
+        # Only heading lines need to be matched, since any other line is part
+        # of a comment. A single match gives the kind of heading and its parts.
+        line_match: Optional[Match[str]] = (
+            ISSUE_LINE_PATTERN.match(line) if line.startswith("#") else None
+        )
+        line_kind: Optional[str] = line_match.lastgroup if line_match else None
+
+        if line_match is not None and line_kind != "subgroup":
+            line_tags: str = line[line_match.end() :]
+
+            # If its the start of a new issue, add a new object.
+            # Reset the comment number.
+            if line_kind == "issue":
+                issue_number += 1
+                comment_number = -1
+                metadata: List[str] = ISSUE_METADATA_PATTERN.findall(line_tags)
+                labels: List[str] = ISSUE_LABELS_PATTERN.findall(line_tags)
+
+                # Strip the leading '+' from the metadata.
+                metadata = [tag[1:] for tag in metadata if not tag.startswith("+label")]
+
+                # Strip the leading '+label:' from the labels.
+                labels = [label[7:] for label in labels]
+
+                formatted_issues.append(
+                    GitHubIssue(
+                        number=int(line_match.group("issue_number")),
+                        complete=VIMWIKI_TODO in line,
+                        title="",
+                        labels=labels,
+                        all_comments=[],
+                        metadata=metadata,
+                    )
                 )
-            )
-
-            continue
-
-        # If its the issue title, then add that to the empty object.
-        if re.findall(ISSUE_TITLE, line):
-            issue_title: str = re.sub(ISSUE_TITLE, "", line).strip()
-
-            formatted_issues[issue_number].title = issue_title
 
-            continue
-
-        # If this is a comment, start to add it to the existing object.
-        if re.findall(ISSUE_COMMENT, line):
-            comment_number = int(re.findall(r"\d+", line)[0])
-            update_search: Optional[Match[str]] = re.match(ISSUE_COMMENT, line)
-            updated_at: str = update_search.group(
-                1
-            ) if update_search is not None else ""
-            comment_metadata: List[str] = re.findall(ISSUE_METADATA, line)
-
-            # Strip the leading '+' from the tags.
-            comment_metadata = [tag[1:] for tag in comment_metadata]
-
-            formatted_issues[issue_number].all_comments.append(
-                GitHubIssueComment(
-                    number=comment_number,
-                    tags=comment_metadata,
-                    updated_at=updated_at,
-                    body=[],
+            # If its the issue title, then add that to the empty object.
+            elif line_kind == "title":
+                formatted_issues[issue_number].title = line_tags.strip()
+
+            # If this is a comment, start to add it to the existing object.
+            elif line_kind == "comment":
+                comment_number = int(line_match.group("comment_number"))
+
+                # Strip the leading '+' from the tags.
+                comment_metadata: List[str] = [
+                    tag[1:] for tag in ISSUE_METADATA_PATTERN.findall(line_tags)
+                ]
+
+                formatted_issues[issue_number].all_comments.append(
+                    GitHubIssueComment(
+                        number=comment_number,
+                        tags=comment_metadata,
+                        updated_at=line_match.group("updated_at"),
+                        body=[],
+                    )
                 )
-            )
 
             continue
 
@@ -177,18 +179,17 @@ def parse_buffer_issues(issue_lines: List[str]) -> List[GitHubIssue]:
             current_issue: List[GitHubIssueComment] = formatted_issues[
                 issue_number
             ].all_comments
-            current_comment: List[str] = current_issue[comment_number].body
+            # Comments made from the markdown always have a list for a body.
+            current_comment: List[str] = cast(
+                List[str], current_issue[comment_number].body
+            )
             current_comment.append(line)
 
         # However, we need to make sure we haven't hit a sub-group heading,
         # so check for that as well. If it was, remove the line and also
         # the previous line (if its whitespace).
         # We also want to close the issue, since its finished now.
-        if (
-            re.findall(SUBGROUP_HEADING, line)
-            and issue_number != -1
-            and comment_number != -1
-        ):
+        if line_kind == "subgroup" and issue_number != -1 and comment_number != -1:
             current_comment.pop()
             comment_number = -1
 
@@ -214,16 +215,15 @@ def remove_events_not_from_today(nvim: Nvim) -> None:
     Remove events from the file if they are not for the correct date.
     """
 
+    document: DiaryDocument = get_buffer_document(nvim)
     current_events: List[CalendarEvent] = parse_markdown_file_for_events(
-        nvim, ISO_FORMAT
+        nvim, ISO_FORMAT, document
     )
-    date_today: date = parser.parse(get_diary_date(nvim)).date()
-    schedule_index: int = get_section_line(
-        get_buffer_contents(nvim), SCHEDULE_HEADING
-    ) + 1
+    date_today: date = get_time(get_diary_date(nvim)).date()
+    schedule_index: int = document.section_line(SCHEDULE_HEADING) + 1
 
     for index, event in enumerate(current_events):
-        event_date: date = parser.parse(event.start).date()
+        event_date: date = get_time(event.start).date()
 
         if date_today == event_date:
             continue
@@ -234,18 +234,21 @@ def remove_events_not_from_today(nvim: Nvim) -> None:
 
 
 def parse_markdown_file_for_events(
-    nvim: Nvim, format_string: str
+    nvim: Nvim, format_string: str, document: Optional[DiaryDocument] = None
 ) -> List[CalendarEvent]:
     """parse_markdown_file_for_events
 
     Gets the contents of the current NeoVim buffer,
     and parses the schedule section into events.
+
+    An index of the buffer can be given, if the caller already has one.
     """
 
-    current_buffer: List[str] = get_buffer_contents(nvim)
+    if document is None:
+        document = get_buffer_document(nvim)
 
-    buffer_events_index: int = get_section_line(current_buffer, SCHEDULE_HEADING)
-    events: List[str] = current_buffer[buffer_events_index:]
+    buffer_events_index: int = document.section_line(SCHEDULE_HEADING)
+    events: List[str] = document.lines[buffer_events_index:]
     diary_date: str = get_diary_date(nvim)
     formatted_events: List[CalendarEvent] = parse_buffer_events(
         events, format_string, diary_date
@@ -254,23 +257,28 @@ def parse_markdown_file_for_events(
     return formatted_events
 
 
-def parse_markdown_file_for_issues(nvim: Nvim) -> List[GitHubIssue]:
+def parse_markdown_file_for_issues(
+    nvim: Nvim, document: Optional[DiaryDocument] = None
+) -> List[GitHubIssue]:
     """parse_markdown_file_for_issues
 
     Gets the contents of the current NeoVim buffer,
     and parses the issues section into issues.
+
+    An index of the buffer can be given, if the caller already has one.
     """
 
-    current_buffer: List[str] = get_buffer_contents(nvim)
+    if document is None:
+        document = get_buffer_document(nvim)
 
     # Get the start of each section, to grab the lines between. We plus one to
     # the issues header, to skip the empty line there. We remove two from the
     # events header to remove both the Events header itself, as well as the
     # empty line at the end of the issues section.
-    buffer_issues_index: int = get_section_line(current_buffer, ISSUE_HEADING) + 1
-    buffer_events_index: int = get_section_line(current_buffer, SCHEDULE_HEADING) - 2
+    buffer_issues_index: int = document.section_line(ISSUE_HEADING) + 1
+    buffer_events_index: int = document.section_line(SCHEDULE_HEADING) - 2
 
-    issue_lines: List[str] = current_buffer[buffer_issues_index:buffer_events_index]
+    issue_lines: List[str] = document.lines[buffer_issues_index:buffer_events_index]
     formatted_issues: List[GitHubIssue] = parse_buffer_issues(issue_lines)
 
     return formatted_issues
@@ -314,10 +322,11 @@ def combine_issues(
 
     Treats the GitHub version as the truth, and keeps around any issues with an
     edit or new tag.
+    The API issues are left as they were, as they may be the cached issues.
     """
 
     # Default to using the API version.
-    combined_issues: List[GitHubIssue] = api_issues
+    combined_issues: List[GitHubIssue] = list(api_issues)
 
     # Then, copy over any issues/comments with a new/edit tag, or that are missing.
     for issue in markdown_issues:
@@ -328,7 +337,12 @@ def combine_issues(
             combined_issues.append(issue)
             continue
 
-        api_issue: GitHubIssue = combined_issues[api_issue_index]
+        # Any issue that may be changed is copied, along with its comment list.
+        api_issue: GitHubIssue = replace(
+            api_issues[api_issue_index],
+            all_comments=list(api_issues[api_issue_index].all_comments),
+        )
+        combined_issues[api_issue_index] = api_issue
 
         # Add the new/edited comments
         for index, comment in enumerate(issue.all_comments):
@@ -0,0 +1,126 @@
+"""benchmark_cache_format
+
+Compare the size of the issue cache, and the time taken to load it, between
+the json and the packed cache formats.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_cache_format.py
+"""
+import json
+import sys
+import tempfile
+import time
+from os import path
+from typing import Any, Callable, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.classes.data_class_json import EnhancedJSONEncoder
+from nvim_diary_template.classes.data_class_msgpack import pack_data, unpack_data
+from nvim_diary_template.classes.github_issue_class import (
+    GitHubIssue,
+    GitHubIssueComment,
+)
+from nvim_diary_template.helpers.issue_helpers import get_github_objects
+
+ISSUE_COUNTS = [1000, 10000]
+COMMENTS_PER_ISSUE = 5
+REPEATS = 5
+
+
+def make_issues(issue_count: int) -> List[GitHubIssue]:
+    """make_issues
+
+    Make a list of issues, each with a few comments.
+    """
+
+    return [
+        GitHubIssue(
+            number=number,
+            title=f"Issue {number}",
+            complete=False,
+            labels=["backlog", "work"],
+            all_comments=[
+                GitHubIssueComment(
+                    number=comment,
+                    body=[f"Line {line} of comment {comment}." for line in range(4)],
+                    tags=[],
+                    updated_at="2019-01-01 12:00",
+                    comment_id=number * COMMENTS_PER_ISSUE + comment,
+                )
+                for comment in range(COMMENTS_PER_ISSUE)
+            ],
+            metadata=[],
+        )
+        for number in range(issue_count)
+    ]
+
+
+def best_time(function: Callable[[], Any]) -> float:
+    """best_time
+
+    Get the fastest of a few runs of the given function, in milliseconds.
+    """
+
+    times: List[float] = []
+
+    for _ in range(REPEATS):
+        start_time: float = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+
+    return min(times) * 1000
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the file size and load times for each issue count.
+    """
+
+    print(
+        f"{'Issues':>8} {'Format':>8} {'Size (KB)':>10} "
+        f"{'Load (ms)':>10} {'Objects (ms)':>13}"
+    )
+
+    for issue_count in ISSUE_COUNTS:
+        issues: List[GitHubIssue] = make_issues(issue_count)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_file_name: str = path.join(temp_dir, "issues.json")
+            packed_file_name: str = path.join(temp_dir, "issues.msgpack")
+
+            with open(json_file_name, "w") as json_file:
+                json.dump(issues, json_file, cls=EnhancedJSONEncoder)
+
+            with open(packed_file_name, "wb") as packed_file:
+                packed_file.write(pack_data(issues))
+
+            def load_json() -> Any:
+                with open(json_file_name) as json_file:
+                    return json.load(json_file)
+
+            def load_packed() -> Any:
+                with open(packed_file_name, "rb") as packed_file:
+                    return unpack_data(packed_file.read())
+
+            for name, file_name, load in (
+                ("json", json_file_name, load_json),
+                ("msgpack", packed_file_name, load_packed),
+            ):
+                # Loading a packed file leaves the issues packed until they
+                # are used, so also time making the issue objects.
+                size: float = path.getsize(file_name) / 1024
+                load_time: float = best_time(load)
+                object_time: float = best_time(lambda: get_github_objects(load()))
+
+                print(
+                    f"{issue_count:>8} {name:>8} {size:>10.0f} "
+                    f"{load_time:>10.1f} {object_time:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    run_benchmark()
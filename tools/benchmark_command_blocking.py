@@ -0,0 +1,78 @@
+"""benchmark_command_blocking
+
+Measure how long DiaryGetIssues blocks NeoVim for, when getting the issues
+from GitHub takes a fixed time, with and without running the command on a
+worker thread.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_command_blocking.py
+"""
+import sys
+import time
+from os import path
+from typing import Any, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.classes.github_issue_class import GitHubIssue
+from nvim_diary_template.classes.plugin_options import PluginOptions
+from nvim_diary_template.plugin import DiaryTemplatePlugin
+from nvim_diary_template.tests.mocks.mock_nvim import MockNvim
+from nvim_diary_template.utils.constants import ISSUE_HEADING, SCHEDULE_HEADING
+
+ISSUES_DELAY = 0.5
+
+
+class StubGithub:
+    """StubGithub
+
+    Return no issues, after the time it would take to get them.
+    """
+
+    def get_all_open_issues(self) -> List[GitHubIssue]:
+        time.sleep(ISSUES_DELAY)
+        return []
+
+
+def time_command(async_commands: bool) -> float:
+    """time_command
+
+    Get the time that DiaryGetIssues blocks for, then wait for it to finish.
+    """
+
+    nvim: Any = MockNvim()
+    nvim.current.buffer.lines = ["# 2019-11-10", "", ISSUE_HEADING, ""]
+    nvim.current.buffer.lines.append(SCHEDULE_HEADING)
+
+    plugin: DiaryTemplatePlugin = DiaryTemplatePlugin(nvim)
+    plugin._github_service = StubGithub()  # type: ignore
+    plugin.options = PluginOptions()
+    plugin.options.async_commands = async_commands
+
+    start_time: float = time.perf_counter()
+    plugin.get_issues()
+    blocked_time: float = time.perf_counter() - start_time
+
+    # Apply the result on this thread, as NeoVim would.
+    if plugin._command_runner.command is not None:
+        plugin._command_runner.command.thread.join()  # type: ignore
+        nvim.run_async_calls()
+
+    return blocked_time
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the time DiaryGetIssues blocks for, in each mode.
+    """
+
+    print(f"Getting the issues takes {ISSUES_DELAY * 1000:.0f}ms")
+    print(f"Blocked for {time_command(False) * 1000:.1f}ms when run inline")
+    print(f"Blocked for {time_command(True) * 1000:.1f}ms on a worker thread")
+
+
+if __name__ == "__main__":
+    run_benchmark()
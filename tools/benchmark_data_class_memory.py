@@ -0,0 +1,114 @@
+"""benchmark_data_class_memory
+
+Compare the memory used by a cache of issue comments, between plain
+Dataclasses with a list of lines for each body, and the slotted classes the
+plugin uses.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_data_class_memory.py
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from os import path
+from typing import Any, Callable, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.classes.github_issue_class import (
+    CommentBody,
+    GitHubIssueComment,
+)
+
+COMMENT_COUNT = 10000
+LINES_PER_COMMENT = 4
+
+
+@dataclass
+class PlainComment:
+    """PlainComment
+
+    The comment class, as it was before it had slots.
+    """
+
+    number: int
+    body: List[str]
+    tags: List[str]
+    updated_at: str
+    comment_id: int = 0
+
+
+def make_lines(number: int) -> List[str]:
+    return [f"Line {line} of comment {number}." for line in range(LINES_PER_COMMENT)]
+
+
+def make_tag() -> str:
+    # Build a new string each time, like a tag read from the diary, rather
+    # than sharing a single constant.
+    return "".join(["ed", "it"])
+
+
+def make_plain_comments() -> List[Any]:
+    return [
+        PlainComment(
+            number=number,
+            body=make_lines(number),
+            tags=[make_tag()],
+            updated_at="2019-01-01 12:00",
+            comment_id=number,
+        )
+        for number in range(COMMENT_COUNT)
+    ]
+
+
+def make_slotted_comments() -> List[Any]:
+    return [
+        GitHubIssueComment(
+            number=number,
+            body=CommentBody.from_lines(make_lines(number)),
+            tags=[make_tag()],
+            updated_at="2019-01-01 12:00",
+            comment_id=number,
+        )
+        for number in range(COMMENT_COUNT)
+    ]
+
+
+def measure(function: Callable[[], List[Any]]) -> int:
+    """measure
+
+    Get the memory still in use after making the comments, in bytes.
+    """
+
+    tracemalloc.start()
+    comments: List[Any] = function()
+    used_memory: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del comments
+    return used_memory
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the memory used for each style of comment.
+    """
+
+    print(f"{'Classes':>10} {'Memory (KB)':>12} {'Per comment (B)':>16}")
+
+    for name, function in (
+        ("plain", make_plain_comments),
+        ("slotted", make_slotted_comments),
+    ):
+        used_memory: int = measure(function)
+        print(
+            f"{name:>10} {used_memory / 1024:>12.0f} "
+            f"{used_memory / COMMENT_COUNT:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,107 @@
+"""benchmark_get_calendar
+
+Measure how long DiaryGetCalendar takes to merge the events from Google into
+the schedule of a busy day, without any calls to Google.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_get_calendar.py
+"""
+import sys
+import time
+from datetime import date
+from os import path
+from typing import Any, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.classes.calendar_event_class import CalendarEvent
+from nvim_diary_template.classes.plugin_options import PluginOptions
+from nvim_diary_template.plugin import DiaryTemplatePlugin
+from nvim_diary_template.tests.mocks.mock_nvim import MockNvim
+
+EVENT_COUNT = 200
+DIARY_DATE = "2019-11-10"
+REPEATS = 10
+
+
+class StubGoogleCal:
+    """StubGoogleCal
+
+    Return a fixed set of events, as they come from Google.
+    """
+
+    def __init__(self, events: List[CalendarEvent]) -> None:
+        self.events: List[CalendarEvent] = events
+
+    def get_events_for_date(self, _: date) -> List[CalendarEvent]:
+        return self.events
+
+
+def make_google_events() -> List[CalendarEvent]:
+    """make_google_events
+
+    Make a day of events, five minutes apart.
+    """
+
+    events: List[CalendarEvent] = []
+
+    for number in range(EVENT_COUNT):
+        minutes: int = number * 5
+        start: str = f"{DIARY_DATE}T{minutes // 60:02}:{minutes % 60:02}:00Z"
+        end: str = f"{DIARY_DATE}T{minutes // 60:02}:{minutes % 60 + 4:02}:00Z"
+        events.append(CalendarEvent(name=f"Event {number}", start=start, end=end))
+
+    return events
+
+
+def make_buffer() -> List[str]:
+    """make_buffer
+
+    Make a diary, with half of the events already in the schedule.
+    """
+
+    lines: List[str] = [f"# Diary for {DIARY_DATE}", "", "## Schedule", ""]
+
+    for number in range(0, EVENT_COUNT, 2):
+        minutes: int = number * 5
+        lines.append(
+            f"- {minutes // 60:02}:{minutes % 60:02} - "
+            f"{minutes // 60:02}:{minutes % 60 + 4:02}: Event {number}"
+        )
+
+    lines.append("")
+    return lines
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the fastest time taken to get the calendar.
+    """
+
+    nvim: Any = MockNvim()
+    nvim.current.buffer.name = f"/wiki/diary/{DIARY_DATE}.md"
+
+    plugin: DiaryTemplatePlugin = DiaryTemplatePlugin(nvim)
+    plugin._gcal_service = StubGoogleCal(make_google_events())  # type: ignore
+
+    # Run the command inline, so the whole of it is timed.
+    plugin.options = PluginOptions()
+    plugin.options.async_commands = False
+
+    times: List[float] = []
+
+    for _ in range(REPEATS):
+        nvim.current.buffer.lines = make_buffer()
+
+        start_time: float = time.perf_counter()
+        plugin.grab_from_calendar()
+        times.append(time.perf_counter() - start_time)
+
+    print(f"DiaryGetCalendar for {EVENT_COUNT} events: {min(times) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,104 @@
+"""benchmark_issue_commands
+
+Measure how long the issue commands that find their place in the buffer take
+on a large diary, without the time that NeoVim itself would take.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_issue_commands.py
+"""
+import sys
+import time
+from os import path
+from typing import Any, Callable, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.helpers.issue_helpers import (
+    insert_edit_tag,
+    insert_new_comment,
+    toggle_issue_completion,
+)
+from nvim_diary_template.tests.mocks.mock_nvim import MockNvim
+from nvim_diary_template.utils.parse_markdown import parse_markdown_file_for_issues
+
+LINE_COUNT = 20000
+REPEATS = 20
+
+
+def make_diary(line_count: int) -> List[str]:
+    """make_diary
+
+    Make a diary with an issues section of at least the given number of lines,
+    followed by a short schedule.
+    """
+
+    lines: List[str] = ["# 2019-11-10", "", "## Issues", ""]
+    issue_number: int = 0
+
+    while len(lines) < line_count:
+        if issue_number % 20 == 0:
+            lines.extend((f"### Group {issue_number // 20}", ""))
+
+        issue_number += 1
+        lines.extend(
+            (
+                f"#### [ ] Issue {{{issue_number}}}: +label:work",
+                f"##### Title: Issue number {issue_number}",
+                "",
+            )
+        )
+
+        for comment in range(3):
+            lines.append(f"##### Comment {{{comment}}} - 2019-01-01 12:00:")
+            lines.extend(f"Line {line} of comment {comment}." for line in range(4))
+            lines.append("")
+
+    lines.extend(("## Schedule", "", "- 09:00 - 10:00: Event", ""))
+    return lines
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the fastest time taken for each command, with the cursor in the
+    middle of the issues section.
+    """
+
+    diary: List[str] = make_diary(LINE_COUNT)
+    nvim: Any = MockNvim()
+
+    commands: List[Callable[[], Any]] = [
+        lambda: insert_edit_tag(nvim, "issue"),
+        lambda: insert_edit_tag(nvim, "comment"),
+        lambda: insert_new_comment(nvim),
+        lambda: toggle_issue_completion(nvim),
+        lambda: parse_markdown_file_for_issues(nvim),
+    ]
+    names: List[str] = [
+        "DiaryInsertIssueEditTag",
+        "DiaryInsertCommentEditTag",
+        "DiaryInsertComment",
+        "DiaryToggleIssue",
+        "parse issues",
+    ]
+
+    print(f"Diary of {len(diary)} lines")
+
+    for name, command in zip(names, commands):
+        times: List[float] = []
+
+        for _ in range(REPEATS):
+            nvim.current.buffer.lines = list(diary)
+            nvim.current.window.cursor = (len(diary) // 2, 0)
+
+            start_time: float = time.perf_counter()
+            command()
+            times.append(time.perf_counter() - start_time)
+
+        print(f"{name:>26}: {min(times) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
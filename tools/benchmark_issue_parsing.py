@@ -0,0 +1,81 @@
+"""benchmark_issue_parsing
+
+Measure how quickly the issues section of a diary is parsed, in lines per
+second, over a large generated issues section.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_issue_parsing.py
+"""
+import sys
+import time
+from os import path
+from typing import List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.utils.parse_markdown import parse_buffer_issues
+
+LINE_COUNT = 50000
+COMMENTS_PER_ISSUE = 3
+LINES_PER_COMMENT = 4
+REPEATS = 5
+
+
+def make_issue_lines(line_count: int) -> List[str]:
+    """make_issue_lines
+
+    Make an issues section with at least the given number of lines, split
+    into sub-groups of issues with a few comments each.
+    """
+
+    lines: List[str] = []
+    issue_number: int = 0
+
+    while len(lines) < line_count:
+        if issue_number % 20 == 0:
+            lines.extend((f"### Group {issue_number // 20}", ""))
+
+        issue_number += 1
+        complete: str = "X" if issue_number % 4 == 0 else " "
+        lines.extend(
+            (
+                f"#### [{complete}] Issue {{{issue_number}}}: +label:work +edit",
+                f"##### Title: Issue number {issue_number}",
+                "",
+            )
+        )
+
+        for comment in range(COMMENTS_PER_ISSUE):
+            lines.append(f"##### Comment {{{comment}}} - 2019-01-01 12:00: +new")
+            lines.extend(
+                f"Line {line} of comment {comment} on issue {issue_number}."
+                for line in range(LINES_PER_COMMENT)
+            )
+            lines.append("")
+
+    return lines
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the fastest parse time, and the lines parsed per second.
+    """
+
+    lines: List[str] = make_issue_lines(LINE_COUNT)
+    times: List[float] = []
+
+    for _ in range(REPEATS):
+        start_time: float = time.perf_counter()
+        parse_buffer_issues(lines)
+        times.append(time.perf_counter() - start_time)
+
+    best_time: float = min(times)
+    print(f"Parsed {len(lines)} lines in {best_time * 1000:.1f}ms")
+    print(f"{len(lines) / best_time:,.0f} lines per second")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,83 @@
+"""benchmark_make_diary
+
+Measure how long a new diary takes to make, when getting the issues and the
+events each take a fixed time, along with the number of buffer writes.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_make_diary.py
+"""
+import sys
+import time
+from datetime import date
+from os import path
+from typing import Any, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.classes.calendar_event_class import CalendarEvent
+from nvim_diary_template.classes.github_issue_class import GitHubIssue
+from nvim_diary_template.classes.plugin_options import PluginOptions
+from nvim_diary_template.tests.mocks.mock_nvim import MockNvim
+from nvim_diary_template.utils.make_markdown_file import make_diary
+
+ISSUES_DELAY = 0.2
+EVENTS_DELAY = 0.3
+
+
+class StubGithub:
+    """StubGithub
+
+    Return no issues, after the time it would take to get them.
+    """
+
+    active: bool = True
+
+    @property
+    def active_issues(self) -> List[GitHubIssue]:
+        time.sleep(ISSUES_DELAY)
+        return []
+
+
+class StubGoogleCal:
+    """StubGoogleCal
+
+    Return no events, after the time it would take to get them.
+    """
+
+    active: bool = True
+
+    @property
+    def active_events(self) -> List[CalendarEvent]:
+        time.sleep(EVENTS_DELAY)
+        return []
+
+    def get_events_for_date(self, _: date) -> List[CalendarEvent]:
+        time.sleep(EVENTS_DELAY)
+        return []
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the time taken to make the diary, and how many writes it needed.
+    """
+
+    nvim: Any = MockNvim()
+    nvim.current.buffer.name = f"/wiki/diary/{date.today().isoformat()}.md"
+    options: PluginOptions = PluginOptions()
+
+    start_time: float = time.perf_counter()
+    make_diary(nvim, options, StubGoogleCal(), StubGithub())  # type: ignore
+    total_time: float = time.perf_counter() - start_time
+
+    print(
+        f"Issues take {ISSUES_DELAY * 1000:.0f}ms, events {EVENTS_DELAY * 1000:.0f}ms"
+    )
+    print(f"Made the diary in {total_time * 1000:.0f}ms")
+    print(f"Buffer writes: {nvim.api.set_count}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,96 @@
+"""benchmark_section_writes
+
+Measure how many lines are sent to NeoVim when the issues section of a large
+diary is sorted again after a single issue is completed, along with the time
+taken to work out the lines to send.
+
+Run from the root of the repo with:
+
+    python tools/benchmark_section_writes.py
+"""
+import sys
+import time
+from os import path
+from typing import Any, List
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "rplugin", "python3"))
+
+# pylint: disable=wrong-import-position
+from nvim_diary_template.classes.github_issue_class import (
+    GitHubIssue,
+    GitHubIssueComment,
+)
+from nvim_diary_template.classes.plugin_options import PluginOptions
+from nvim_diary_template.tests.mocks.mock_nvim import MockNvim
+from nvim_diary_template.utils.constants import ISSUE_HEADING, SCHEDULE_HEADING
+from nvim_diary_template.utils.make_issues import (
+    format_issues,
+    set_issues_from_issues_list,
+)
+
+SECTION_LINES = 2000
+REPEATS = 5
+
+
+def make_issues() -> List[GitHubIssue]:
+    """make_issues
+
+    Make enough issues to fill an issues section of about the given size.
+    Each issue takes ten lines, with its title and two comments.
+    """
+
+    return [
+        GitHubIssue(
+            number=number,
+            title=f"Issue {number}",
+            complete=False,
+            labels=["work"],
+            all_comments=[
+                GitHubIssueComment(
+                    number=comment,
+                    body=[f"Comment {comment} on issue {number}."],
+                    tags=[],
+                    updated_at="2019-01-01 12:00",
+                )
+                for comment in range(2)
+            ],
+            metadata=[],
+        )
+        for number in range(SECTION_LINES // 10)
+    ]
+
+
+def run_benchmark() -> None:
+    """run_benchmark
+
+    Print the lines sent and the time taken to set the sorted issues, once one
+    issue in the middle of the section has been completed.
+    """
+
+    options: PluginOptions = PluginOptions()
+    nvim: Any = MockNvim()
+    times: List[float] = []
+
+    for _ in range(REPEATS):
+        issues: List[GitHubIssue] = make_issues()
+        section: List[str] = format_issues(options, issues, True)
+        nvim.current.buffer.lines = (
+            ["# 2019-11-10", "", ISSUE_HEADING, ""] + section + [SCHEDULE_HEADING, ""]
+        )
+        nvim.api.atomic_calls = []
+
+        issues[len(issues) // 2].complete = True
+
+        start_time: float = time.perf_counter()
+        set_issues_from_issues_list(nvim, options, issues, True)
+        times.append(time.perf_counter() - start_time)
+
+    lines_sent: int = sum(len(call[1][4]) for call in nvim.api.atomic_calls[0])
+
+    print(f"Issues section of {len(section)} lines")
+    print(f"Lines sent: {lines_sent}, in {len(nvim.api.atomic_calls[0])} hunks")
+    print(f"Time to set the issues: {min(times) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()